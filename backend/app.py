@@ -1,19 +1,395 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import sympy
 from sympy import real_root
-from exceptions import ValidationError
+from exceptions import ComputationTimeout, PoolClosed, ValidationError
 from validator import LinearSystemValidator
 from equations_solver.solver_factory import SolverFactory
+from equations_solver.batch_solver import BatchSolver
+from equations_solver.factorization_cache import factorization_cache
+from equations_solver.parallel_elimination import request_cores
+from equations_solver.solvers.lu_decomposition_solver import LUDecompositionSolver
+from root_finder.finder import Finder
 from root_finder.finder_factory import FinderFactory
-from decimal import MAX_EMAX, MIN_EMIN, Decimal, getcontext
+from root_finder.expression_cache import expression_cache
+from equations_solver.result import Result
+from profiling import Profile, profile_phase
+from utils import decimal_context
+from worker_pool import get_pool, pool_size, shutdown_pool, warm_up
+from decimal import Decimal, localcontext
+import itertools
+import multiprocessing
+import queue
 import signal
 import os
+import threading
+import traceback
 
 app = Flask(__name__)
 CORS(app)
 
 
+def request_context(data):
+    """Decimal context with the request's precision, to run the request in"""
+    precision = LinearSystemValidator.validate_precision(data.get("precision", 6))
+    return localcontext(decimal_context(precision))
+
+
+def real_cbrt(x):
+    """Real cube root, so cbrt of a negative number isn't complex"""
+    return real_root(x, 3)
+
+
+def init_worker(cbrt):
+    """Start a worker process with the same sympy setup as the server"""
+    sympy.cbrt = cbrt
+    warm_up()
+
+
+def run_job(job, data, *args):
+    """Run a request's job on a worker process, or in this thread without a pool"""
+    # the request may ask for a shorter deadline than the pool's REQUEST_TIMEOUT
+    timeout = data.get("timeout")
+    if timeout is not None:
+        try:
+            timeout = float(timeout)
+        except (ValueError, TypeError):
+            raise ValidationError("Timeout must be a positive number of seconds")
+        if not timeout > 0:
+            raise ValidationError("Timeout must be a positive number of seconds")
+
+    pool = get_pool(initializer=init_worker, initargs=(sympy.cbrt,))
+    if pool is None:
+        return job(data, *args)
+    return pool.run(job, data, *args, timeout=timeout)
+
+
+def timeout_response(e):
+    """Response for a request that didn't finish before its deadline"""
+    print(f"\n Timeout: {str(e)}\n")
+    return jsonify(Result(message=str(e), execution_time=e.timeout).to_dict()), 504
+
+
+def unavailable_response(e):
+    """Response for a request that came in while the server is stopping"""
+    print(f"\n Unavailable: {str(e)}\n")
+    return jsonify({"error": str(e)}), 503
+
+
+def create_solver(data, steps_mode=None, step_sink=None, factorizations=None):
+    """Validate a linear system request and create the solver for it"""
+
+    # Extract data
+    method = data.get("method")
+    precision = data.get("precision", 6)
+    parameters = data.get("parameters", {})
+    numeric_backend = data.get("numeric_backend")
+    if steps_mode is None:
+        steps_mode = data.get("steps")
+
+    print(f"method: {method}")
+    print(f"precision: {precision}")
+    print(f"params: {parameters}")
+    print(f"numeric backend: {numeric_backend}")
+    print(f"steps: {steps_mode}")
+
+    # where the time of the request goes, added to its result
+    profile = (
+        Profile()
+        if LinearSystemValidator.validate_profile(data.get("profile"))
+        else None
+    )
+
+    # the factors of A stored by an earlier request are used instead of A, only
+    # the server process has them (see solve_factorized)
+    if data.get("factorization_id") is not None:
+        with profile_phase(profile, "parse"):
+            solver = create_factorized_solver(
+                data, factorizations, steps_mode, step_sink
+            )
+        solver.profile = profile
+        return solver
+
+    # Validate required fields
+    if not method:
+        raise ValidationError("Missing required field: method")
+
+    A = data.get("A")
+    b = data.get("b")
+
+    print(f"A: {A}")
+    print(f"b: {b}")
+
+    if not all([A, b]):
+        raise ValidationError(
+            "Missing required fields: A and b are required for linear system methods"
+        )
+
+    # Validate system, A is either a dense matrix or the nonzeros of a sparse
+    # one ({"format": "coo" or "csr", "rows": [...], "cols": [...], "values": [...]})
+    with profile_phase(profile, "parse"):
+        if isinstance(A, dict):
+            A_matrix, b_vector = LinearSystemValidator.validate_sparse_system(A, b)
+        else:
+            A = [[+Decimal(x) for x in y] for y in A]
+            b = LinearSystemValidator.parse_constants(b)
+            A_matrix, b_vector = LinearSystemValidator.validate_system(A, b)
+    precision_value = LinearSystemValidator.validate_precision(precision)
+    steps_mode = LinearSystemValidator.validate_steps_mode(steps_mode)
+
+    solver = SolverFactory.create_solver(
+        method,
+        A_matrix,
+        b_vector,
+        precision_value,
+        parameters,
+        numeric_backend,
+        steps_mode,
+        step_sink,
+    )
+
+    # the condition estimate, residual and growth factor of the direct methods
+    solver.diagnostics = LinearSystemValidator.validate_diagnostics(
+        data.get("diagnostics")
+    )
+    solver.profile = profile
+
+    return solver
+
+
+def create_factorized_solver(data, factorizations, steps_mode, step_sink):
+    """Create the solver for a request that references a stored factorization"""
+    factorization_id = str(data.get("factorization_id"))
+    if factorizations is None:
+        raise ValidationError(
+            "factorization_id is only supported by /api/solve-equations"
+        )
+
+    if data.get("A") is not None:
+        raise ValidationError("Give either A or a factorization_id, not both")
+
+    method = data.get("method") or "lu-decomposition"
+    if method != "lu-decomposition":
+        raise ValidationError(
+            f"A factorization_id can only be used with lu-decomposition. Found: '{method}'"
+        )
+
+    factorization = factorizations.get(factorization_id)
+    if factorization is None:
+        raise ValidationError(
+            f"Unknown factorization_id: '{factorization_id}' (it may have been evicted), send A to factorize it again"
+        )
+
+    # the request can't change what the factors were computed with
+    precision = LinearSystemValidator.validate_precision(
+        data.get("precision", factorization.precision)
+    )
+    numeric_backend = str(
+        data.get("numeric_backend", factorization.numeric_backend)
+    ).lower()
+    format = str(
+        data.get("parameters", {}).get("format", factorization.format)
+    ).lower()
+    if (precision, numeric_backend, format) != (
+        factorization.precision,
+        factorization.numeric_backend,
+        factorization.format,
+    ):
+        raise ValidationError(
+            f"The factorization was made with precision {factorization.precision}, the {factorization.numeric_backend} backend and the {factorization.format} format"
+        )
+
+    # the residual and growth factor need A itself, only its factors are stored
+    if LinearSystemValidator.validate_diagnostics(data.get("diagnostics")):
+        raise ValidationError(
+            "Diagnostics need A, send A instead of the factorization_id to get them (its stored factorization is still reused)"
+        )
+
+    b_vector = LinearSystemValidator.validate_constants(data.get("b"), factorization.n)
+
+    return LUDecompositionSolver(
+        None,
+        b_vector,
+        precision,
+        format,
+        numeric_backend=numeric_backend,
+        steps_mode=LinearSystemValidator.validate_steps_mode(steps_mode),
+        step_sink=step_sink,
+        factorization=factorization,
+    )
+
+
+def factorization_defaults(data):
+    """Default the precision and backend of a request to its stored factorization's"""
+    factorization = factorization_cache.peek(str(data.get("factorization_id")))
+    if factorization is None:
+        return data
+
+    # the request runs in a context with the factorization's precision
+    return {
+        "precision": factorization.precision,
+        "numeric_backend": factorization.numeric_backend,
+        **data,
+    }
+
+
+def put_record(records, closed, record):
+    """Put a streamed record on the queue, waiting while the client is slow"""
+    while not closed.is_set():
+        try:
+            records.put(record, timeout=0.1)
+            return
+        except queue.Full:
+            pass
+    # stops the solver, since nobody is reading its steps anymore
+    raise RuntimeError("Stream was closed by the client")
+
+
+def stream_job(data, records, closed, factorizations=None):
+    """Solve a streamed request, putting every step on the queue as it is made,
+    and return its response (and the factorization of A for LU decompositions)"""
+    index = itertools.count()
+
+    def step_sink(step):
+        if solver.steps_mode == "summary":
+            step_dict = step.to_summary_dict()
+        else:
+            step_dict = step.to_dict()
+        put_record(
+            records, closed, {"type": "step", "index": next(index), "step": step_dict}
+        )
+
+    with request_context(data):
+        solver = create_solver(data, step_sink=step_sink, factorizations=factorizations)
+
+        result = solver.solve_profiled()
+        factorization = None
+        if isinstance(solver, LUDecompositionSolver):
+            factorization = solver.factorization
+        return result.to_dict("none"), factorization
+
+
+def stream_solution(data, stream_format):
+    """Solve on a worker and stream every step as soon as it is made"""
+    if stream_format is True:
+        stream_format = "ndjson"
+
+    if stream_format not in ("ndjson", "sse"):
+        raise ValidationError(
+            f"Stream must be 'ndjson' or 'sse'. Found: '{stream_format}'"
+        )
+
+    # validation errors are raised here, before anything is streamed
+    create_solver(data, factorizations=factorization_cache)
+
+    # bounded, so a slow client makes the solver wait instead of piling up steps,
+    # the steps of a worker come through a queue it can reach, only the
+    # substitution with a stored factorization is left to this server's thread
+    pool = get_pool(initializer=init_worker, initargs=(sympy.cbrt,))
+    stored = data.get("factorization_id") is not None
+    if pool is None or stored:
+        records, closed = queue.Queue(maxsize=64), threading.Event()
+    else:
+        records, closed = pool.channel(maxsize=64)
+
+    def put(record):
+        put_record(records, closed, record)
+
+    def run():
+        try:
+            if stored:
+                response, _ = stream_job(data, records, closed, factorization_cache)
+                response["factorization_id"] = str(data["factorization_id"])
+            else:
+                # under the pool's deadline, like the requests that aren't streamed
+                response, factorization = run_job(stream_job, data, records, closed)
+                store_factorization(factorization, response)
+            put({"type": "result", **response})
+            put(None)
+        except (ValidationError, ComputationTimeout, PoolClosed) as e:
+            put({"type": "error", "error": str(e)})
+            put(None)
+        except RuntimeError:
+            if not closed.is_set():
+                raise
+        except Exception as e:
+            print(f"\n Exception occurred: {str(e)}")
+            traceback.print_exc()
+            put({"type": "error", "error": f"Internal server error: {str(e)}"})
+            put(None)
+
+    def generate():
+        threading.Thread(target=run, daemon=True).start()
+        try:
+            while (record := records.get()) is not None:
+                line = app.json.dumps(record)
+                if stream_format == "sse":
+                    yield f"event: {record['type']}\ndata: {line}\n\n"
+                else:
+                    yield line + "\n"
+        finally:
+            closed.set()
+
+    mimetype = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return Response(generate(), mimetype=mimetype)
+
+
+def solve_job(data):
+    """Solve a linear system request and return its response"""
+    with request_context(data):
+        solver = create_solver(data)
+
+        result = solver.solve_profiled()
+        return result.to_dict(solver.steps_mode)
+
+
+def factorize_job(data):
+    """Solve a LU decomposition request, returning the factorization of A too"""
+    with request_context(data):
+        solver = create_solver(data)
+
+        result = solver.solve_profiled()
+        return result.to_dict(solver.steps_mode), solver.factorization
+
+
+def store_factorization(factorization, response):
+    """Store the factorization of A and give its id in the response"""
+    # the id is only given out when it can be used
+    if factorization is not None and factorization_cache.put(factorization):
+        response["factorization_id"] = factorization.factorization_id
+
+
+def solve_factorized(data):
+    """Solve a LU decomposition request, reusing the stored factorization of A
+    when the request references it by its factorization_id, or sends an A that
+    was factorized before without asking for the steps of its factorization"""
+    with request_context(data):
+        if data.get("factorization_id") is not None:
+            solver = create_solver(data, factorizations=factorization_cache)
+
+        # the factorization is looked up by the digest of A, the steps of the
+        # factorization aren't stored, so full steps always factorize A again
+        elif LinearSystemValidator.validate_steps_mode(data.get("steps")) != "full":
+            solver = create_solver(data)
+            solver.factorization = factorization_cache.get(solver.factorization_id)
+
+        else:
+            solver = None
+
+        # only the substitution is left, that's cheap enough to do right here
+        if solver is not None and solver.factorization is not None:
+            result = solver.solve_profiled()
+            response = result.to_dict(solver.steps_mode)
+            response["factorization_id"] = solver.factorization_id
+            return response
+
+    # the factorization (with its steps) is made on a worker, and stored here so
+    # any worker's factorization can be used by the next requests
+    response, factorization = run_job(factorize_job, data)
+    store_factorization(factorization, response)
+    return response
+
+
 @app.route("/api/solve-equations", methods=["POST"])
 def solve_equations():
     """Main endpoint to solve linear system or nonlinear equation"""
@@ -25,66 +401,150 @@ def solve_equations():
         print("Received request:")
         print(f"Data: {data}")
 
-        # Extract data
-        method = data.get("method")
-        precision = data.get("precision", 6)
-        parameters = data.get("parameters", {})
+        data = factorization_defaults(data)
 
-        print(f"method: {method}")
-        print(f"precision: {precision}")
-        print(f"params: {parameters}")
+        with request_context(data):
+            # stream the steps as they are made instead of building the whole
+            # response
+            stream_format = data.get("stream")
+            if stream_format:
+                print("=" * 50 + "\n")
+                return stream_solution(data, stream_format)
 
-        # set precision for Decimal operations
-        getcontext().prec = precision
+        # Create and run solver, LU decompositions go through the store of
+        # factorizations (the same A is often solved for many b)
+        if data.get("method") == "lu-decomposition" or data.get("factorization_id"):
+            response = solve_factorized(data)
+        else:
+            response = run_job(solve_job, data)
 
-        # Validate required fields
-        if not method:
-            return jsonify({"error": "Missing required field: method"}), 400
+        print("=" * 50 + "\n")
+        return jsonify(response), 200
 
-        A = data.get("A")
-        b = data.get("b")
+    except ComputationTimeout as e:
+        return timeout_response(e)
+    except PoolClosed as e:
+        return unavailable_response(e)
+    except ValidationError as e:
+        print(f"\n Validation Error: {str(e)}\n")
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"\n Exception occurred: {str(e)}")
+        print("Full traceback:")
+        traceback.print_exc()
+        print("\n")
+        return jsonify({"error": f"Internal server error: {str(e)}"}), 500
 
-        print(f"A: {A}")
-        print(f"b: {b}")
 
-        if not all([A, b]):
-            return jsonify(
-                {
-                    "error": "Missing required fields: A and b are required for linear system methods"
-                }
-            ), 400
+def solve_batch_job(data):
+    """Solve the jobs of a batch request and return its response"""
+    jobs = data.get("jobs")
+    if not isinstance(jobs, list) or not jobs:
+        raise ValidationError("Missing required field: jobs (a list of systems)")
 
-        A = [[+Decimal(x) for x in y] for y in A]
-        b = [+Decimal(x) for x in b]
+    defaults = {"steps": "none"}
+    defaults.update({key: value for key, value in data.items() if key != "jobs"})
 
-        # Validate system
-        A_matrix, b_vector = LinearSystemValidator.validate_system(A, b)
-        precision_value = LinearSystemValidator.validate_precision(precision)
+    results = [None] * len(jobs)
 
-        # Create and run solver
-        solver = SolverFactory.create_solver(
-            method, A_matrix, b_vector, precision_value, parameters
-        )
+    # jobs that can be solved together, by batch key
+    batches = {}
+
+    for index, job in enumerate(jobs):
+        if not isinstance(job, dict):
+            results[index] = {"error": "Each job must be an object"}
+            continue
+
+        job = {**defaults, **job}
+        try:
+            with request_context(job):
+                solver = create_solver(job)
+
+                key = BatchSolver.batch_key(solver)
+                if key is not None:
+                    batches.setdefault(key, []).append((index, job, solver))
+                    continue
+
+                result = solver.solve_profiled()
+                results[index] = result.to_dict(solver.steps_mode)
+        except ValidationError as e:
+            results[index] = {"error": str(e)}
+        except Exception as e:
+            traceback.print_exc()
+            results[index] = {"error": f"Internal server error: {str(e)}"}
+
+    for batch in batches.values():
+        # the jobs in a batch have the same precision
+        with request_context(batch[0][1]):
+            batch_results = BatchSolver([solver for _, _, solver in batch]).solve()
+            for (index, _, _), result in zip(batch, batch_results):
+                results[index] = result.to_dict("none")
+
+    return {"results": results}
+
+
+@app.route("/api/solve-equations/batch", methods=["POST"])
+def solve_equations_batch():
+    """Solve many linear systems in one request, results are in the jobs' order"""
+    # every job is a body of /api/solve-equations, the other fields of the batch
+    # body (like precision) are defaults for all the jobs, steps default to none
+    try:
+        data = request.get_json()
+
+        # Debug logging
+        print("\n" + "=" * 50)
+        print("Received batch request:")
+
+        response = run_job(solve_batch_job, data)
 
-        result = solver.solve()
         print("=" * 50 + "\n")
-        return jsonify(result.to_dict()), 200
+        return jsonify(response), 200
 
+    except ComputationTimeout as e:
+        return timeout_response(e)
+    except PoolClosed as e:
+        return unavailable_response(e)
     except ValidationError as e:
         print(f"\n Validation Error: {str(e)}\n")
         return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"\n Exception occurred: {str(e)}")
-        import traceback
-
         print("Full traceback:")
         traceback.print_exc()
         print("\n")
         return jsonify({"error": f"Internal server error: {str(e)}"}), 500
 
 
-@app.route("/api/find-root", methods=["POST"])
-def find_root():
+def replay_job(data):
+    """Rebuild the requested range of steps and return the response"""
+    try:
+        start = int(data.get("start", 0))
+        stop = int(data.get("stop", start + 50))
+    except (ValueError, TypeError):
+        raise ValidationError("Step range must be integers")
+
+    if start < 0 or stop < start:
+        raise ValidationError("Step range must satisfy 0 <= start <= stop")
+
+    with request_context(data):
+        solver = create_solver(data, steps_mode="full")
+
+        result = solver.solve()
+        steps = result.steps or []
+        return {
+            "message": result.message,
+            "total_steps": len(steps),
+            "start": start,
+            "steps": [step.to_dict() for step in steps[start:stop]],
+        }
+
+
+@app.route("/api/replay-steps", methods=["POST"])
+def replay_steps():
+    """Rebuild a range of the solution steps without returning the whole step log"""
+    # takes the same body as /api/solve-equations plus the "start" and "stop" of
+    # the range, only the matrices of the steps in the range get rebuilt from the
+    # recorded row operations
     try:
         data = request.get_json()
 
@@ -93,53 +553,191 @@ def find_root():
         print("Received request:")
         print(f"Data: {data}")
 
-        # Extract data
-        function = data.get("function")
-        method = data.get("method")
-        absolute_relative_error = data.get("absolute_relative_error", "0.00001")
-        number_of_iterations = data.get("number_of_iterations", 50)
-        precision = data.get("precision", 6)
-        parameters = data.get("parameters", {})
+        response = run_job(replay_job, data)
+
+        print("=" * 50 + "\n")
+        return jsonify(response), 200
+
+    except ComputationTimeout as e:
+        return timeout_response(e)
+    except PoolClosed as e:
+        return unavailable_response(e)
+    except ValidationError as e:
+        print(f"\n Validation Error: {str(e)}\n")
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"\n Exception occurred: {str(e)}")
+        print("Full traceback:")
+        traceback.print_exc()
+        print("\n")
+        return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+
 
-        print(f"method: {method}")
-        print(f"precision: {precision}")
-        print(f"params: {parameters}")
+def finder_arguments(data):
+    """Validate a root finding request, except for its starting point parameters"""
 
-        # set precision for Decimal operations
-        getcontext().prec = precision
+    # Extract data
+    function = data.get("function")
+    method = data.get("method")
+    absolute_relative_error = data.get("absolute_relative_error", "0.00001")
+    number_of_iterations = data.get("number_of_iterations", 50)
+    precision = data.get("precision", 6)
+    parameters = data.get("parameters", {})
+    numeric_backend = data.get("numeric_backend")
+    steps_mode = data.get("steps")
 
-        # Validate required fields
-        if not method:
-            return jsonify({"error": "Missing required field: method"}), 400
+    print(f"method: {method}")
+    print(f"precision: {precision}")
+    print(f"params: {parameters}")
 
-        if not all([function]):
-            return jsonify(
-                {"error": "Missing required fields: function for root finding methods"}
-            ), 400
+    # Validate required fields
+    if not method:
+        raise ValidationError("Missing required field: method")
 
-        precision_value = LinearSystemValidator.validate_precision(precision)
+    if not all([function]):
+        raise ValidationError(
+            "Missing required fields: function for root finding methods"
+        )
 
-        # Create and run finder
+    precision_value = LinearSystemValidator.validate_precision(precision)
+    numeric_backend = LinearSystemValidator.validate_numeric_backend(
+        numeric_backend, precision_value
+    )
+
+    # root finders don't keep a step log, so every steps mode gives the same
+    # response, it is still validated to accept the same options as above
+    LinearSystemValidator.validate_steps_mode(steps_mode)
+
+    return {
+        "function": function,
+        "method": method,
+        "absolute_relative_error": Decimal(absolute_relative_error),
+        "number_of_iterations": number_of_iterations,
+        "precision": precision_value,
+        "numeric_backend": numeric_backend,
+    }
+
+
+def find_root_job(data):
+    """Find the root of a root finding request and return its response"""
+    arguments = finder_arguments(data)
+    profile = (
+        Profile()
+        if LinearSystemValidator.validate_profile(data.get("profile"))
+        else None
+    )
+
+    with localcontext(decimal_context(arguments["precision"])):
         finder = FinderFactory.create_finder(
-            function=function,
-            method=method,
-            absolute_relative_error=Decimal(absolute_relative_error),
-            number_of_iterations=number_of_iterations,
-            precision=precision_value,
-            parameters=parameters,
+            parameters=data.get("parameters", {}), profile=profile, **arguments
         )
+        finder.profile = profile
 
         result = finder.find()
+        return result.to_dict()
+
+
+@app.route("/api/find-root", methods=["POST"])
+def find_root():
+    try:
+        data = request.get_json()
+
+        # Debug logging
+        print("\n" + "=" * 50)
+        print("Received request:")
+        print(f"Data: {data}")
+
+        # Create and run finder
+        response = run_job(find_root_job, data)
+
         print("=" * 50 + "\n")
-        return jsonify(result.to_dict()), 200
+        return jsonify(response), 200
 
+    except ComputationTimeout as e:
+        return timeout_response(e)
+    except PoolClosed as e:
+        return unavailable_response(e)
     except ValidationError as e:
         print(f"\n Validation Error: {str(e)}\n")
         return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"\n Exception occurred: {str(e)}")
-        import traceback
+        print("Full traceback:")
+        traceback.print_exc()
+        print("\n")
+        return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+
+
+def find_root_batch_job(data):
+    """Find the roots from all the starting points of a batch request"""
+    parameters_list = data.get("parameters")
+    if not isinstance(parameters_list, list) or not parameters_list:
+        raise ValidationError(
+            "Missing required field: parameters (a list of starting points)"
+        )
+
+    arguments = finder_arguments(data)
+
+    with localcontext(decimal_context(arguments["precision"])):
+        finders = FinderFactory.create_finders(
+            parameters_list=parameters_list,
+            profile=LinearSystemValidator.validate_profile(data.get("profile")),
+            **arguments,
+        )
+
+        lanes = [
+            lane
+            for lane, finder in enumerate(finders)
+            if isinstance(finder, Finder)
+        ]
+        results = finders[:]
+        for lane, result in zip(
+            lanes, Finder.find_batch([finders[lane] for lane in lanes])
+        ):
+            results[lane] = result
+
+        response = []
+        for result in results:
+            if isinstance(result, ValidationError):
+                response.append({"error": str(result)})
+            elif isinstance(result, Exception):
+                response.append(
+                    {"error": f"Internal server error: {str(result)}"}
+                )
+            else:
+                response.append(result.to_dict())
+
+    return {"results": response}
+
+
+@app.route("/api/find-root/batch", methods=["POST"])
+def find_root_batch():
+    """Find the roots of one function from many starting points at once"""
+    # same body as /api/find-root, except that "parameters" is a list with the
+    # guess(es) or bracket of each starting point, all the searches advance in
+    # lock-step and there is one result (or error) per starting point, in order
+    try:
+        data = request.get_json()
 
+        # Debug logging
+        print("\n" + "=" * 50)
+        print("Received batch request:")
+        print(f"Data: {data}")
+
+        response = run_job(find_root_batch_job, data)
+
+        print("=" * 50 + "\n")
+        return jsonify(response), 200
+
+    except ComputationTimeout as e:
+        return timeout_response(e)
+    except PoolClosed as e:
+        return unavailable_response(e)
+    except ValidationError as e:
+        print(f"\n Validation Error: {str(e)}\n")
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"\n Exception occurred: {str(e)}")
         print("Full traceback:")
         traceback.print_exc()
         print("\n")
@@ -149,6 +747,24 @@ def find_root():
 @app.route("/api/methods", methods=["GET"])
 def get_methods():
     """Get list of available methods and their parameters"""
+    # the arithmetic of every method but iterative refinement, given in the
+    # request like the precision
+    numeric_backend = {
+        "name": "numeric_backend",
+        "type": "select",
+        "options": ["decimal", "float64"],
+        "required": False,
+        "description": "Arithmetic of the computation, float64 only carries 15 significant digits (defaults to float64 when precision is 15 or less, decimal otherwise)",
+    }
+    # the worker processes of the decimal eliminations, parse_workers limits
+    # them to the cores of the server divided between the request workers
+    parallel_workers = {
+        "name": "parallel_workers",
+        "type": "integer",
+        "default": 1,
+        "required": False,
+        "description": f"Number of worker processes sharing the rows of the decimal elimination (the doolittle format for LU decomposition), at most the number of cores of the server divided between the requests run at once by the worker processes ({request_cores(pool_size())})",
+    }
     methods = {
         "gauss-elimination": {
             "name": "Gauss Elimination",
@@ -159,7 +775,9 @@ def get_methods():
                     "type": "boolean",
                     "default": False,
                     "required": False,
-                }
+                },
+                parallel_workers,
+                numeric_backend,
             ],
         },
         "gauss-jordan-elimination": {
@@ -171,7 +789,9 @@ def get_methods():
                     "type": "boolean",
                     "default": False,
                     "required": False,
-                }
+                },
+                parallel_workers,
+                numeric_backend,
             ],
         },
         "lu-decomposition": {
@@ -184,7 +804,16 @@ def get_methods():
                     "options": ["doolittle", "crout", "cholesky"],
                     "default": "doolittle",
                     "required": True,
-                }
+                },
+                {
+                    "name": "block_size",
+                    "type": "integer",
+                    "default": 64,
+                    "required": False,
+                    "description": "Number of columns factorized together by the blocked float64 factorization, used for larger systems solved without steps",
+                },
+                parallel_workers,
+                numeric_backend,
             ],
         },
         "jacobi-iteration": {
@@ -209,6 +838,7 @@ def get_methods():
                     "default": 1e-6,
                     "required": True,
                 },
+                numeric_backend,
             ],
         },
         "gauss-seidel-iteration": {
@@ -233,6 +863,90 @@ def get_methods():
                     "default": 1e-6,
                     "required": True,
                 },
+                numeric_backend,
+            ],
+        },
+        "sor-iteration": {
+            "name": "Successive Over-Relaxation (SOR)",
+            "type": "linear",
+            "parameters": [
+                {
+                    "name": "initial_guess",
+                    "type": "array",
+                    "required": False,
+                    "description": "Initial guess for solution (defaults to zeros)",
+                },
+                {
+                    "name": "omega",
+                    "type": "float",
+                    "required": False,
+                    "description": "Relaxation factor between 0 and 2 (estimated from the Jacobi spectral radius if not given)",
+                },
+                {
+                    "name": "number_of_iterations",
+                    "type": "integer",
+                    "default": 100,
+                    "required": True,
+                },
+                {
+                    "name": "absolute_relative_error",
+                    "type": "float",
+                    "default": 1e-6,
+                    "required": True,
+                },
+                numeric_backend,
+            ],
+        },
+        "conjugate-gradient": {
+            "name": "Conjugate Gradient",
+            "type": "linear",
+            "parameters": [
+                {
+                    "name": "initial_guess",
+                    "type": "array",
+                    "required": False,
+                    "description": "Initial guess for solution (defaults to zeros)",
+                },
+                {
+                    "name": "preconditioner",
+                    "type": "string",
+                    "default": "none",
+                    "required": False,
+                    "options": ["none", "jacobi", "incomplete-cholesky"],
+                    "description": "For symmetric positive definite systems only",
+                },
+                {
+                    "name": "number_of_iterations",
+                    "type": "integer",
+                    "default": 100,
+                    "required": True,
+                },
+                {
+                    "name": "absolute_relative_error",
+                    "type": "float",
+                    "default": 1e-6,
+                    "required": True,
+                },
+                numeric_backend,
+            ],
+        },
+        "iterative-refinement": {
+            "name": "Mixed-Precision Iterative Refinement",
+            "type": "linear",
+            "parameters": [
+                {
+                    "name": "number_of_iterations",
+                    "type": "integer",
+                    "default": 20,
+                    "required": False,
+                    "description": "Maximum number of refinements",
+                },
+                {
+                    "name": "absolute_relative_error",
+                    "type": "float",
+                    "required": False,
+                    "description": "Relative size of the correction to stop at (defaults to 10^-precision)",
+                },
             ],
         },
         "bisection": {
@@ -271,11 +985,59 @@ def get_methods():
                     "required": False,
                     "description": "Maximum number of iterations",
                 },
+                numeric_backend,
             ],
         },
         "false-position": {
             "name": "False Position Method",
             "type": "nonlinear",
+            "parameters": [
+                {
+                    "name": "function",
+                    "type": "string",
+                    "required": True,
+                    "description": "Function expression (e.g., 'x**2 - 2' or 'x**3 - x - 1')",
+                },
+                {
+                    "name": "xl",
+                    "type": "float",
+                    "required": True,
+                    "description": "Lower bound of interval",
+                },
+                {
+                    "name": "xu",
+                    "type": "float",
+                    "required": True,
+                    "description": "Upper bound of interval",
+                },
+                {
+                    "name": "variant",
+                    "type": "select",
+                    "options": ["classic", "illinois", "anderson-bjorck"],
+                    "default": "classic",
+                    "required": False,
+                    "description": "Scale down the function value at an end kept twice in a row (Illinois: by 1/2, Anderson-Bjorck: by 1 - f(new)/f(replaced)) so that end moves too",
+                },
+                {
+                    "name": "absolute_relative_error",
+                    "type": "float",
+                    "default": 1e-6,
+                    "required": False,
+                    "description": "Convergence tolerance",
+                },
+                {
+                    "name": "max_iterations",
+                    "type": "integer",
+                    "default": 100,
+                    "required": False,
+                    "description": "Maximum number of iterations",
+                },
+                numeric_backend,
+            ],
+        },
+        "brent": {
+            "name": "Brent's Method",
+            "type": "nonlinear",
             "parameters": [
                 {
                     "name": "function",
@@ -309,6 +1071,88 @@ def get_methods():
                     "required": False,
                     "description": "Maximum number of iterations",
                 },
+                numeric_backend,
+            ],
+        },
+        "all-roots": {
+            "name": "All Roots in an Interval",
+            "type": "nonlinear",
+            "parameters": [
+                {
+                    "name": "function",
+                    "type": "string",
+                    "required": True,
+                    "description": "Function expression (e.g., 'sin(x)' or 'x**3 - x')",
+                },
+                {
+                    "name": "xl",
+                    "type": "float",
+                    "required": True,
+                    "description": "Lower bound of interval",
+                },
+                {
+                    "name": "xu",
+                    "type": "float",
+                    "required": True,
+                    "description": "Upper bound of interval",
+                },
+                {
+                    "name": "samples",
+                    "type": "integer",
+                    "default": 100,
+                    "required": False,
+                    "description": "Number of intervals the function is first sampled on, refined where roots may hide between two samples",
+                },
+                {
+                    "name": "bracket_method",
+                    "type": "select",
+                    "options": ["brent", "bisection", "false-position"],
+                    "default": "brent",
+                    "required": False,
+                    "description": "Method solving every sign change found",
+                },
+                {
+                    "name": "absolute_relative_error",
+                    "type": "float",
+                    "default": 1e-6,
+                    "required": False,
+                    "description": "Convergence tolerance",
+                },
+                {
+                    "name": "max_iterations",
+                    "type": "integer",
+                    "default": 100,
+                    "required": False,
+                    "description": "Maximum number of iterations for every root",
+                },
+                numeric_backend,
+            ],
+        },
+        "polynomial-roots": {
+            "name": "All Real Roots of a Polynomial",
+            "type": "nonlinear",
+            "parameters": [
+                {
+                    "name": "function",
+                    "type": "string",
+                    "required": True,
+                    "description": "Polynomial expression (e.g., 'x**3 - x - 1' or '(x - 1)**2*(x + 2)')",
+                },
+                {
+                    "name": "absolute_relative_error",
+                    "type": "float",
+                    "default": 1e-6,
+                    "required": False,
+                    "description": "Convergence tolerance",
+                },
+                {
+                    "name": "max_iterations",
+                    "type": "integer",
+                    "default": 100,
+                    "required": False,
+                    "description": "Maximum number of Newton-Raphson iterations polishing the roots",
+                },
+                numeric_backend,
             ],
         },
         "secant": {
@@ -347,6 +1191,7 @@ def get_methods():
                     "required": False,
                     "description": "Maximum number of iterations",
                 },
+                numeric_backend,
             ],
         },
         "fixed-point": {
@@ -365,6 +1210,14 @@ def get_methods():
                     "required": True,
                     "description": "Initial guess for the root",
                 },
+                {
+                    "name": "acceleration",
+                    "type": "select",
+                    "options": ["none", "aitken", "steffensen"],
+                    "default": "none",
+                    "required": False,
+                    "description": "Aitken's delta-squared extrapolation of the iterates, or Steffensen's method (quadratic convergence, two evaluations per iteration)",
+                },
                 {
                     "name": "absolute_relative_error",
                     "type": "float",
@@ -379,6 +1232,7 @@ def get_methods():
                     "required": False,
                     "description": "Maximum number of iterations",
                 },
+                numeric_backend,
             ],
         },
         "newton-raphson": {
@@ -418,12 +1272,76 @@ def get_methods():
                     "required": False,
                     "description": "Indicates the multiplicity of the root",
                 },
+                numeric_backend,
             ],
         },
     }
     return jsonify(methods), 200
 
 
+def expression_cache_stats_job():
+    """Counters of this process' expression cache"""
+    return expression_cache.stats()
+
+
+def clear_expression_cache_job():
+    """Empty this process' expression cache"""
+    expression_cache.clear()
+    return expression_cache.stats()
+
+
+def combined_cache_stats(job):
+    """Run a cache job on every worker and add up their counters"""
+    # every worker process has a cache of its own
+    pool = get_pool(initializer=init_worker, initargs=(sympy.cbrt,))
+    if pool is None:
+        return job()
+
+    workers = pool.run_everywhere(job)
+    stats = dict(workers[0])
+    for key in ("size", "hits", "misses", "evictions", "expirations"):
+        stats[key] = sum(worker[key] for worker in workers)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    stats["workers"] = len(workers)
+    return stats
+
+
+@app.route("/api/expression-cache", methods=["GET"])
+def expression_cache_stats():
+    """Hit/miss counters of the parsed expression cache"""
+    try:
+        return jsonify(combined_cache_stats(expression_cache_stats_job)), 200
+    except ComputationTimeout as e:
+        return timeout_response(e)
+    except PoolClosed as e:
+        return unavailable_response(e)
+
+
+@app.route("/api/expression-cache", methods=["DELETE"])
+def clear_expression_cache():
+    """Empty the parsed expression cache and reset its counters"""
+    try:
+        return jsonify(combined_cache_stats(clear_expression_cache_job)), 200
+    except ComputationTimeout as e:
+        return timeout_response(e)
+    except PoolClosed as e:
+        return unavailable_response(e)
+
+
+@app.route("/api/factorizations", methods=["GET"])
+def factorization_cache_stats():
+    """Size and hit/miss counters of the stored LU factorizations"""
+    return jsonify(factorization_cache.stats()), 200
+
+
+@app.route("/api/factorizations", methods=["DELETE"])
+def clear_factorization_cache():
+    """Drop all the stored LU factorizations and reset their counters"""
+    factorization_cache.clear()
+    return jsonify(factorization_cache.stats()), 200
+
+
 @app.route("/api/health", methods=["GET"])
 def health_check():
     """Health check endpoint"""
@@ -435,15 +1353,19 @@ def health_check():
 @app.route("/shutdown", methods=["POST"])
 def shutdown():
     """Gracefully stop the Flask server."""
+    shutdown_pool()
     os.kill(os.getpid(), signal.SIGTERM)
     return jsonify({"status": "shutting down"})
 
 
 if __name__ == "__main__":
-    getcontext().rounding = "ROUND_HALF_UP"
-    getcontext().Emax = MAX_EMAX
-    getcontext().Emin = MIN_EMIN
+    # the server is bundled into an executable, where the worker processes
+    # start by running it again
+    multiprocessing.freeze_support()
 
-    sympy.cbrt = lambda x: real_root(x, 3)
+    # every request runs in its own Decimal context (see request_context), so
+    # the server can use as many threads as it likes, the solving itself runs
+    # on the worker processes (see run_job)
+    sympy.cbrt = real_cbrt
 
     app.run(host="0.0.0.0", port=5000)
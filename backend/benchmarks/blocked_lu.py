@@ -0,0 +1,145 @@
+# how the LU decompositions scale with the size of the system: the float64
+# backend factorized a block of columns at a time (the trailing updates are
+# BLAS matrix products) against one column at a time (what the solvers still do
+# for systems up to the block size, or when the steps are recorded), and the
+# Decimal backend's vectorized loops against the scalar loops they replaced
+#
+# run from the backend directory:
+#   python -m benchmarks.blocked_lu [block size]
+import sys
+import time
+from decimal import Decimal, localcontext
+
+import numpy as np
+from benchmarks.common import random_system, to_decimal
+from equations_solver.solvers.lu_decomposition_solver import (
+    BLOCK_SIZE,
+    LUDecompositionSolver,
+)
+from utils import decimal_context
+
+FORMATS = ["doolittle", "crout", "cholesky"]
+FLOAT64_SIZES = [64, 128, 256, 512, 1024, 2048]
+DECIMAL_SIZES = [16, 32, 64]
+PRECISION = 20
+
+
+def measure(A, b, format, numeric_backend, block_size=None) -> float:
+    solver = LUDecompositionSolver(
+        A, b, PRECISION, format, block_size, numeric_backend, "none"
+    )
+    start_time = time.perf_counter()
+    with localcontext(decimal_context(PRECISION)):
+        result = solver.solve()
+    elapsed = time.perf_counter() - start_time
+    assert result.solution is not None, result.message
+    return elapsed
+
+
+# the Decimal factorizations as they were written before being vectorized,
+# followed by the same substitution as the solvers
+def doolittle_loops(solver: LUDecompositionSolver):
+    A, n = solver.A, solver.n
+    L = np.full((n, n), +Decimal(0))
+    P = np.full((n, n), +Decimal(0))
+    for i in range(n):
+        L[i, i] = P[i, i] = +Decimal(1)
+    U = A.copy()
+    for k in range(n - 1):
+        max_idx = int(k + np.argmax(np.abs(U[k:, k])))
+        L[[k, max_idx], :k] = L[[max_idx, k], :k]
+        U[[k, max_idx]] = U[[max_idx, k]]
+        P[[k, max_idx]] = P[[max_idx, k]]
+        for i in range(k + 1, n):
+            factor = U[i, k] / U[k, k]
+            L[i, k] = factor
+            for j in range(k + 1, n):
+                U[i, j] -= factor * U[k, j]
+            U[i, k] = +Decimal(0)
+    return solver._substitute_doolittle(L, U, P, solver.b)
+
+
+def crout_loops(solver: LUDecompositionSolver):
+    A, n = solver.A, solver.n
+    L = np.full((n, n), +Decimal(0))
+    U = np.full((n, n), +Decimal(0))
+    for j in range(n):
+        U[j, j] = +Decimal(1)
+        for i in range(j, n):
+            dot_product = +Decimal(0)
+            for k in range(j):
+                dot_product = dot_product + L[i, k] * U[k, j]
+            L[i, j] = A[i, j] - dot_product
+        for i in range(j + 1, n):
+            dot_product = +Decimal(0)
+            for k in range(j):
+                dot_product = dot_product + L[j, k] * U[k, i]
+            U[j, i] = (A[j, i] - dot_product) / L[j, j]
+    return solver._substitute_crout(L, U, solver.b)
+
+
+def cholesky_loops(solver: LUDecompositionSolver):
+    A, n = solver.A, solver.n
+    solver.is_symmetric(A)
+    L = np.full((n, n), +Decimal(0))
+    for i in range(n):
+        for j in range(i + 1):
+            total = +Decimal(0)
+            for k in range(j):
+                total = total + L[i, k] * L[j, k]
+            if i == j:
+                L[i, j] = (A[i, i] - total).sqrt()
+            else:
+                L[i, j] = (A[i, j] - total) / L[j, j]
+    return solver._substitute_cholesky(L, solver.b)
+
+
+LOOPS = {"doolittle": doolittle_loops, "crout": crout_loops, "cholesky": cholesky_loops}
+
+
+def main():
+    block_size = int(sys.argv[1]) if len(sys.argv) > 1 else BLOCK_SIZE
+
+    print(f"float64, block size {block_size}")
+    print(
+        f"{'format':<11}{'n':>6}{'by column (s)':>15}{'blocked (s)':>13}"
+        f"{'speedup':>9}{'GFLOP/s':>9}"
+    )
+    for format in FORMATS:
+        for n in FLOAT64_SIZES:
+            A, b = random_system(n, symmetric=format == "cholesky")
+            # a block as large as the system is the column at a time path
+            by_column = measure(A, b, format, "float64", n)
+            blocked = measure(A, b, format, "float64", block_size)
+            flops = (n**3 / 3 if format == "cholesky" else 2 * n**3 / 3) / blocked
+            print(
+                f"{format:<11}{n:>6}{by_column:>15.4f}{blocked:>13.4f}"
+                f"{by_column / blocked:>8.1f}x{flops / 1e9:>9.2f}"
+            )
+
+    print(f"\ndecimal, precision {PRECISION}")
+    print(
+        f"{'format':<11}{'n':>6}{'loops (s)':>15}{'vectorized (s)':>16}{'speedup':>9}"
+    )
+    for format in FORMATS:
+        for n in DECIMAL_SIZES:
+            A, b = random_system(n, symmetric=format == "cholesky")
+            with localcontext(decimal_context(PRECISION)):
+                A, b = to_decimal(A), to_decimal(b)
+
+                solver = LUDecompositionSolver(
+                    A, b, PRECISION, format, None, "decimal", "none"
+                )
+                start_time = time.perf_counter()
+                LOOPS[format](solver)
+                loops = time.perf_counter() - start_time
+
+            vectorized = measure(A, b, format, "decimal")
+            print(
+                f"{format:<11}{n:>6}{loops:>15.4f}{vectorized:>16.4f}"
+                f"{loops / vectorized:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
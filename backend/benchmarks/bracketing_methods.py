@@ -0,0 +1,92 @@
+# compares the number of function evaluations the bracketing methods take to
+# converge (the two at the ends of the bracket included) on functions where the
+# classic false position keeps one end fixed, the roots are checked against
+# each other
+#
+# run from the backend directory:
+#   python -m benchmarks.bracketing_methods [precision]
+import sys
+import time
+from decimal import Decimal, localcontext
+
+from root_finder.finder_factory import FinderFactory
+from utils import decimal_context
+
+TOLERANCE = Decimal("1e-15")
+MAXIMUM_ITERATIONS = 1000
+
+# f(x) and the bracket
+FUNCTIONS = [
+    ("x**3 - 2", "0", "2"),
+    ("exp(x) - 2", "0", "3"),
+    ("x**10 - 1", "0", "1.3"),
+    ("cos(x) - x", "0", "1"),
+    ("log(x) + x", "0.1", "1"),
+    ("(x - 1)**3", "0", "3"),
+]
+
+# the method, and its variant
+METHODS = [
+    ("bisection", None),
+    ("false-position", "classic"),
+    ("false-position", "illinois"),
+    ("false-position", "anderson-bjorck"),
+    ("brent", None),
+]
+
+
+def measure(
+    function: str, lower_bound: str, upper_bound: str, method, variant, precision
+):
+    start_time = time.perf_counter()
+    with localcontext(decimal_context(precision)):
+        finder = FinderFactory.create_finder(
+            function,
+            method,
+            TOLERANCE,
+            MAXIMUM_ITERATIONS,
+            precision,
+            {
+                "lower_bound": lower_bound,
+                "upper_bound": upper_bound,
+                "variant": variant,
+            },
+        )
+        result = finder.find()
+    elapsed = time.perf_counter() - start_time
+    converged = "converged" in result.message
+    evaluations = result.number_of_function_evaluations if converged else None
+    return evaluations, elapsed, result.root
+
+
+def main():
+    precision = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+
+    print(f"evaluations to converge, tolerance {TOLERANCE}, precision {precision}")
+    print(
+        f"{'f(x)':<14}{'bracket':<12}"
+        + "".join(f"{variant or method:>17}" for method, variant in METHODS)
+        + f"{'brent time (s)':>16}"
+    )
+    for function, lower_bound, upper_bound in FUNCTIONS:
+        counts, roots, elapsed = [], [], 0.0
+        for method, variant in METHODS:
+            evaluations, elapsed, root = measure(
+                function, lower_bound, upper_bound, method, variant, precision
+            )
+            counts.append("-" if evaluations is None else str(evaluations))
+            if evaluations is not None:
+                roots.append(root)
+
+        # the methods that converged found the same root
+        assert all(abs(root - roots[-1]) < 1e-10 for root in roots), roots
+
+        print(
+            f"{function:<14}{f'[{lower_bound}, {upper_bound}]':<12}"
+            + "".join(f"{count:>17}" for count in counts)
+            + f"{elapsed:>16.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
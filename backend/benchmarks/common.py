@@ -0,0 +1,32 @@
+# the systems the benchmarks solve, shared so every benchmark builds them the
+# same way, they are seeded with their size so every run solves the same ones
+from decimal import Decimal
+
+import numpy as np
+
+
+# random float64 system with entries in [-1, 1], diagonally dominant (so the
+# iterative methods converge and crout doesn't need to pivot) unless asked not
+# to be, and symmetric positive definite when asked (for cholesky)
+def random_system(n: int, dominant: bool = True, symmetric: bool = False):
+    rng = np.random.default_rng(n)
+    A = rng.uniform(-1, 1, (n, n))
+    if symmetric:
+        A = A @ A.T
+    if dominant:
+        A = A + np.eye(n) * n
+    return A, rng.uniform(-1, 1, n)
+
+
+# the Decimal array of a float64 array (of any shape), rounded to the precision
+# of the current context
+def to_decimal(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values)
+    decimals = np.array([+Decimal(str(x)) for x in values.flat], dtype=Decimal)
+    return decimals.reshape(values.shape)
+
+
+# random_system with Decimal entries
+def random_decimal_system(n: int, dominant: bool = True, symmetric: bool = False):
+    A, b = random_system(n, dominant, symmetric)
+    return to_decimal(A), to_decimal(b)
@@ -0,0 +1,121 @@
+# checks that responses don't change when many requests with different
+# precisions are served at the same time, each request runs in its own Decimal
+# context so neither the other requests nor the serving thread's context
+# should leak into its result
+#
+# run from the backend directory (exits with 1 if any response differs):
+#   python -m benchmarks.concurrency_stress
+import io
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from decimal import ROUND_DOWN, Context, DefaultContext, setcontext
+
+from app import app
+
+THREADS = 16
+ROUNDS = 20
+PRECISIONS = [4, 12, 20, 35]
+
+A = [["4", "-1", "1"], ["-1", "4.25", "2.75"], ["1", "2.75", "3.5"]]
+b = ["4", "6", "7.25"]
+LINEAR_METHODS = [
+    ("gauss-elimination", {"scaling": True}),
+    ("gauss-jordan-elimination", {}),
+    ("lu-decomposition", {"format": "crout"}),
+    ("lu-decomposition", {"format": "cholesky"}),
+    ("jacobi-iteration", {"number_of_iterations": 25}),
+    ("gauss-seidel-iteration", {"number_of_iterations": 25}),
+]
+ROOT_METHODS = [
+    ("bisection", "x**3 - x - 1", {"lower_bound": 1, "upper_bound": 2}),
+    ("false-position", "x**3 - x - 1", {"lower_bound": 1, "upper_bound": 2}),
+    ("secant", "e^x - 3x", {"first_guess": 0, "second_guess": 1}),
+    ("fixed-point", "cos(x)", {"guess": 1}),
+    ("newton-raphson", "x^3 - 2x - 5", {"guess": 2}),
+]
+
+
+def build_requests():
+    requests = []
+    for precision in PRECISIONS:
+        for method, parameters in LINEAR_METHODS:
+            body = {
+                "method": method,
+                "A": A,
+                "b": b,
+                "precision": precision,
+                "parameters": parameters,
+            }
+            requests.append(("/api/solve-equations", body))
+        for method, function, parameters in ROOT_METHODS:
+            body = {
+                "method": method,
+                "function": function,
+                "precision": precision,
+                "parameters": parameters,
+            }
+            requests.append(("/api/find-root", body))
+    return requests
+
+
+def send(path, body, context):
+    setcontext(context)
+
+    response = app.test_client().post(path, json=body).get_json()
+    response.pop("execution_time", None)
+    return response
+
+
+def main():
+    requests = build_requests()
+
+    # the handlers log every request, which would bury the report
+    with redirect_stdout(io.StringIO()):
+        # the first LU decomposition of every system stores its factorization,
+        # the ones after it (all of them below) only do the substitution
+        for path, body in requests:
+            send(path, body, DefaultContext.copy())
+        expected = [send(path, body, DefaultContext.copy()) for path, body in requests]
+
+        jobs = list(range(len(requests))) * ROUNDS
+        random.shuffle(jobs)
+
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            # each request starts from a context it should never see, as if
+            # something else running on the same thread had changed it
+            responses = list(
+                executor.map(
+                    lambda i: send(
+                        *requests[i],
+                        Context(prec=random.randint(2, 50), rounding=ROUND_DOWN),
+                    ),
+                    jobs,
+                )
+            )
+        elapsed = time.perf_counter() - start_time
+
+    mismatches = [
+        (requests[i], response)
+        for i, response in zip(jobs, responses)
+        if response != expected[i]
+    ]
+
+    print(
+        f"{len(jobs)} requests on {THREADS} threads in {elapsed:.2f} s, "
+        f"{len(mismatches)} responses differ from the sequential run"
+    )
+    for (path, body), response in mismatches[:5]:
+        print(
+            f"  {path} {body['method']} precision={body['precision']}: "
+            f"{str(response)[:200]}"
+        )
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# compares the number of function evaluations the fixed point iterations take
+# to converge with every acceleration on standard g(x) (slow and fast
+# contractions), the roots are checked against each other
+#
+# run from the backend directory:
+#   python -m benchmarks.fixed_point_acceleration [precision]
+import sys
+import time
+from decimal import Decimal, localcontext
+
+from root_finder.expression_cache import expression_cache
+from root_finder.finders.fixed_point_finder import ACCELERATIONS, FixedPointFinder
+from utils import decimal_context
+
+TOLERANCE = Decimal("1e-15")
+MAXIMUM_ITERATIONS = 2000
+
+# g(x), the starting point, and what the fixed point is
+FUNCTIONS = [
+    ("cos(x)", "1", "Dottie number"),
+    ("exp(-x)", "0.5", "omega constant"),
+    ("1 + 1/x", "1", "golden ratio"),
+    ("(x + 2) ** (1/3)", "1", "x^3 - x - 2"),
+    ("x - 0.1*(x**2 - 2)", "1", "sqrt(2)"),
+    ("x - 0.01*(x**3 - x - 1)", "1", "plastic number"),
+    ("(x**2 + 1)/3", "0", "(3 - sqrt(5))/2"),
+]
+
+
+# the function evaluations a search makes, one point at a time
+class CountingFunction:
+    def __init__(self, function):
+        self.function = function
+        self.evaluations = 0
+
+    def __call__(self, x: Decimal) -> Decimal:
+        self.evaluations += 1
+        return self.function(x)
+
+
+def measure(function: str, guess: str, acceleration: str, precision: int):
+    counter = CountingFunction(
+        expression_cache.get(function).evaluator(precision, "decimal")
+    )
+    finder = FixedPointFinder(
+        counter, TOLERANCE, MAXIMUM_ITERATIONS, precision, Decimal(guess), acceleration
+    )
+    start_time = time.perf_counter()
+    with localcontext(decimal_context(precision)):
+        result = finder.find()
+    elapsed = time.perf_counter() - start_time
+    converged = "converged" in result.message
+    return counter.evaluations if converged else None, elapsed, result.root
+
+
+# x**2 from 0.5 goes to 0 quadratically, the values below the last digit of
+# the precision are 0 (not an underflow that never converges), and the root
+# has no more correct significant figures than the precision
+def check_zero_fixed_point():
+    for precision in (6, 25):
+        for numeric_backend in ("decimal", "float64"):
+            if numeric_backend == "float64" and precision > 15:
+                continue
+            function = expression_cache.get("x**2").evaluator(
+                precision, numeric_backend
+            )
+            for acceleration in ACCELERATIONS:
+                finder = FixedPointFinder(
+                    function,
+                    Decimal("1e-5"),
+                    50,
+                    precision,
+                    Decimal("0.5"),
+                    acceleration,
+                )
+                with localcontext(decimal_context(precision)):
+                    result = finder.find()
+                assert "converged" in result.message, result.message
+                assert result.root == 0, result.root
+                assert result.number_of_correct_significant_figures <= precision, (
+                    result.number_of_correct_significant_figures
+                )
+
+
+def main():
+    precision = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+
+    check_zero_fixed_point()
+
+    print(f"evaluations to converge, tolerance {TOLERANCE}, precision {precision}")
+    print(
+        f"{'g(x)':<26}{'fixed point':<18}"
+        + "".join(f"{acceleration:>12}" for acceleration in ACCELERATIONS)
+        + f"{'time (s)':>30}"
+    )
+    for function, guess, name in FUNCTIONS:
+        counts, times, roots = [], [], []
+        for acceleration in ACCELERATIONS:
+            evaluations, elapsed, root = measure(
+                function, guess, acceleration, precision
+            )
+            counts.append("-" if evaluations is None else str(evaluations))
+            times.append(elapsed)
+            roots.append(root)
+
+        # the accelerated roots are the same fixed point
+        assert all(abs(root - roots[-1]) < 1e-10 for root in roots), roots
+
+        print(
+            f"{function:<26}{name:<18}"
+            + "".join(f"{count:>12}" for count in counts)
+            + "".join(f"{elapsed:>10.4f}" for elapsed in times)
+        )
+
+
+if __name__ == "__main__":
+    main()
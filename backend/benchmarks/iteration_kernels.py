@@ -0,0 +1,104 @@
+# compares the vectorized Jacobi and Gauss-Seidel iterations with the element by
+# element loops they replaced, for both numeric backends
+#
+# run from the backend directory:
+#   python -m benchmarks.iteration_kernels
+import time
+from decimal import localcontext
+
+import numpy as np
+from benchmarks.common import random_decimal_system
+from equations_solver.solver_factory import SolverFactory
+from utils import decimal_context
+
+METHODS = ["jacobi-iteration", "gauss-seidel-iteration"]
+SIZES = [10, 100, 1000]
+# the most digits the float64 backend can be asked for
+PRECISION = 15
+
+# iterations per size, fewer for the larger systems so the Decimal loops finish
+# in a few seconds
+ITERATIONS = {10: 50, 100: 10, 1000: 2}
+
+
+# the iterations as they were written before being vectorized
+def jacobi_loop(A: np.ndarray, b: np.ndarray, x: np.ndarray) -> np.ndarray:
+    n = len(b)
+    x_new = x.copy()
+    for i in range(n):
+        x_new[i] = b[i]
+        for j in range(n):
+            if j != i:
+                x_new[i] -= A[i, j] * x[j]
+        x_new[i] /= A[i, i]
+    return x_new
+
+
+def gauss_seidel_loop(A: np.ndarray, b: np.ndarray, x: np.ndarray) -> np.ndarray:
+    n = len(b)
+    x_new = x.copy()
+    for i in range(n):
+        x_new[i] = b[i]
+        for j in range(n):
+            if j != i:
+                x_new[i] -= A[i, j] * x_new[j]
+        x_new[i] /= A[i, i]
+    return x_new
+
+
+LOOPS = {"jacobi-iteration": jacobi_loop, "gauss-seidel-iteration": gauss_seidel_loop}
+
+
+def measure(method, A, b, numeric_backend, iterations):
+    solver = SolverFactory.create_solver(
+        method,
+        A,
+        b,
+        PRECISION,
+        {"number_of_iterations": iterations, "absolute_relative_error": 0},
+        numeric_backend,
+        "none",
+    )
+
+    start_time = time.perf_counter()
+    vectorized = solver.solve().solution
+    vectorized_time = time.perf_counter() - start_time
+
+    # the same number of iterations with the old loops, including the error that
+    # used to be computed twice per iteration
+    start_time = time.perf_counter()
+    x = solver.x0
+    for _ in range(iterations):
+        x_new = LOOPS[method](solver.A, solver.b, x)
+        solver.calculate_absolute_relative_error(x_new, x)
+        solver.calculate_absolute_relative_error(x_new, x)
+        x = x_new
+    loop_time = time.perf_counter() - start_time
+
+    difference = float(np.max(np.abs(vectorized - x)))
+    return loop_time, vectorized_time, difference
+
+
+def main():
+    with localcontext(decimal_context(PRECISION)):
+        print(
+            f"{'method':<24}{'backend':<9}{'n':>6}{'iterations':>12}"
+            f"{'loops (s)':>12}{'vectorized (s)':>16}{'speedup':>9}{'max diff':>11}"
+        )
+        for method in METHODS:
+            for numeric_backend in ("decimal", "float64"):
+                for n in SIZES:
+                    A, b = random_decimal_system(n)
+                    iterations = ITERATIONS[n]
+                    loop_time, vectorized_time, difference = measure(
+                        method, A, b, numeric_backend, iterations
+                    )
+                    print(
+                        f"{method:<24}{numeric_backend:<9}{n:>6}{iterations:>12}"
+                        f"{loop_time:>12.4f}{vectorized_time:>16.4f}"
+                        f"{loop_time / vectorized_time:>8.1f}x{difference:>11.1e}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
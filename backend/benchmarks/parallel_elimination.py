@@ -0,0 +1,91 @@
+# how the Decimal elimination scales with the number of worker processes the
+# rows below (or above) every pivot are split between, 1 worker is the serial
+# solver, the solutions of every run are checked against it digit for digit
+#
+# run from the backend directory:
+#   python -m benchmarks.parallel_elimination [n ...]
+import os
+import sys
+import time
+from decimal import localcontext
+
+from benchmarks.common import random_system, to_decimal
+from equations_solver.solvers.gauss_elimination_solver import GaussEliminationSolver
+from equations_solver.solvers.gauss_jordan_elimination_solver import (
+    GaussJordanEliminationSolver,
+)
+from equations_solver.solvers.lu_decomposition_solver import LUDecompositionSolver
+from utils import decimal_context
+
+SIZES = [100, 200, 400]
+# the solvers take at most one worker per core
+WORKERS = [workers for workers in (1, 2, 4, 8) if workers <= (os.cpu_count() or 1)]
+PRECISION = 30
+
+METHODS = {
+    "gauss": lambda A, b, workers: GaussEliminationSolver(
+        A, b, PRECISION, False, "decimal", "none", None, workers
+    ),
+    "gauss-jordan": lambda A, b, workers: GaussJordanEliminationSolver(
+        A, b, PRECISION, False, "decimal", "none", None, workers
+    ),
+    "doolittle": lambda A, b, workers: LUDecompositionSolver(
+        A,
+        b,
+        PRECISION,
+        "doolittle",
+        numeric_backend="decimal",
+        steps_mode="none",
+        parallel_workers=workers,
+    ),
+}
+
+
+# not diagonally dominant, so the elimination has to pivot
+def random_decimal_system(n: int):
+    A, b = random_system(n, dominant=False)
+    with localcontext(decimal_context(PRECISION)):
+        return to_decimal(A), to_decimal(b)
+
+
+def measure(A, b, method, workers):
+    solver = METHODS[method](A, b, workers)
+    start_time = time.perf_counter()
+    with localcontext(decimal_context(PRECISION)):
+        result = solver.solve()
+    elapsed = time.perf_counter() - start_time
+    assert result.solution is not None, result.message
+    return elapsed, result.solution
+
+
+def main():
+    sizes = [int(n) for n in sys.argv[1:]] or SIZES
+
+    # start the worker processes before timing anything
+    A, b = random_decimal_system(2 * max(WORKERS) * 8)
+    measure(A, b, "gauss", max(WORKERS))
+
+    print(f"decimal, precision {PRECISION}")
+    print(
+        f"{'method':<14}{'n':>6}"
+        + "".join(f"{f'{workers} (s)':>10}" for workers in WORKERS)
+        + "".join(f"{f'x{workers}':>8}" for workers in WORKERS[1:])
+    )
+    for method in METHODS:
+        for n in sizes:
+            A, b = random_decimal_system(n)
+            serial, expected = measure(A, b, method, 1)
+            times = [serial]
+            for workers in WORKERS[1:]:
+                elapsed, solution = measure(A, b, method, workers)
+                assert list(solution) == list(expected), (method, n, workers)
+                times.append(elapsed)
+            print(
+                f"{method:<14}{n:>6}"
+                + "".join(f"{elapsed:>10.3f}" for elapsed in times)
+                + "".join(f"{serial / elapsed:>7.2f}x" for elapsed in times[1:])
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# compares the time Newton-Raphson takes on polynomials when f and f' are
+# evaluated by the compiled mpmath evaluators and by the Horner evaluators (a
+# single pass for both), and the time the polynomial-roots method takes to find
+# all the real roots, the roots are checked against each other, and the roots
+# of polynomials with known real roots against the known ones
+#
+# run from the backend directory:
+#   python -m benchmarks.polynomial_evaluation [precision]
+import math
+import sys
+import time
+from decimal import Decimal, localcontext
+
+import numpy as np
+from sympy import chebyshevt, expand, legendre, symbols
+
+from root_finder.evaluator import (
+    FunctionEvaluator,
+    HornerPolynomial,
+    PolynomialEvaluator,
+)
+from root_finder.expression_cache import expression_cache
+from root_finder.finder_factory import FinderFactory
+from root_finder.finders.newton_raphson_finder import NewtonRaphsonFinder
+from root_finder.finders.polynomial_roots_finder import PolynomialRootsFinder
+from utils import decimal_context
+
+TOLERANCE = Decimal("1e-25")
+MAXIMUM_ITERATIONS = 100
+REPEATS = 20
+
+# the polynomial and the starting point of Newton-Raphson
+POLYNOMIALS = [
+    ("x**3 - x - 1", "1.5"),
+    ("x**5 - 3*x**4 + x - 7", "3"),
+    ("(x - 1)*(x - 2)*(x - 3)*(x - 4)*(x - 5)*(x - 6)*(x - 7)*(x - 8)", "8.5"),
+    ("x**20 - 2", "1.2"),
+]
+
+# the polynomials with known roots are checked at this precision and tolerance,
+# up to this degree
+CHECK_PRECISION = 30
+CHECK_TOLERANCE = Decimal("1e-12")
+CHECK_DEGREE = 15
+
+
+# (polynomial, its real roots sorted) of every degree: the products of (x - k)
+# for k = 1..n (whose expanded coefficients make the roots ill-conditioned), and
+# the Chebyshev and Legendre polynomials (close roots near -1 and 1)
+def known_roots():
+    x = symbols("x")
+    for degree in range(2, CHECK_DEGREE + 1):
+        yield (
+            "*".join(f"(x - {k})" for k in range(1, degree + 1)),
+            list(range(1, degree + 1)),
+        )
+        yield (
+            str(expand(chebyshevt(degree, x))),
+            sorted(
+                math.cos((2 * k - 1) * math.pi / (2 * degree))
+                for k in range(1, degree + 1)
+            ),
+        )
+        yield (
+            str(expand(legendre(degree, x))),
+            sorted(np.polynomial.legendre.leggauss(degree)[0]),
+        )
+
+
+# every real root is found once, the polynomial-roots method used to merge
+# well-separated simple roots into one multiple root
+def check_roots():
+    for polynomial, expected in known_roots():
+        with localcontext(decimal_context(CHECK_PRECISION)):
+            roots = (
+                FinderFactory.create_finder(
+                    polynomial,
+                    "polynomial-roots",
+                    CHECK_TOLERANCE,
+                    MAXIMUM_ITERATIONS,
+                    CHECK_PRECISION,
+                    {},
+                )
+                .find()
+                .roots
+            )
+        assert len(roots) == len(expected), (polynomial, roots)
+        for root, known in zip(roots, expected):
+            assert abs(float(root) - known) < 1e-9 * max(1, abs(known)), (
+                polynomial,
+                roots,
+            )
+
+
+def newton(function, derivative, guess: str, precision: int):
+    finder = NewtonRaphsonFinder(
+        function, TOLERANCE, MAXIMUM_ITERATIONS, precision, derivative, Decimal(guess)
+    )
+    start_time = time.perf_counter()
+    with localcontext(decimal_context(precision)):
+        for _ in range(REPEATS):
+            result = finder.find()
+    return (time.perf_counter() - start_time) / REPEATS, result.root
+
+
+def measure(polynomial: str, guess: str, precision: int):
+    cached = expression_cache.get(polynomial)
+
+    compiled = newton(
+        FunctionEvaluator(cached.expr, precision),
+        FunctionEvaluator(cached.derivative(1), precision),
+        guess,
+        precision,
+    )
+    # built directly, the cache only uses Horner's rule for expanded polynomials
+    polynomial = HornerPolynomial(cached.polynomial(), precision)
+    horner = newton(
+        PolynomialEvaluator(polynomial),
+        PolynomialEvaluator(polynomial, order=1),
+        guess,
+        precision,
+    )
+
+    finder = PolynomialRootsFinder(
+        cached.evaluator(precision),
+        TOLERANCE,
+        MAXIMUM_ITERATIONS,
+        precision,
+        cached.evaluator(precision, order=1),
+        cached.decimal_coefficients(precision),
+    )
+    start_time = time.perf_counter()
+    with localcontext(decimal_context(precision)):
+        for _ in range(REPEATS):
+            roots = finder.find().roots
+    elapsed = (time.perf_counter() - start_time) / REPEATS
+
+    # Newton-Raphson's root is one of all the roots
+    assert abs(compiled[1] - horner[1]) < 1e-20, (compiled[1], horner[1])
+    assert any(abs(root - horner[1]) < 1e-20 for root in roots), roots
+
+    return compiled[0], horner[0], elapsed, len(roots)
+
+
+def main():
+    precision = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    check_roots()
+    print(
+        f"all the roots of the products of (x - k), Chebyshev and Legendre "
+        f"polynomials up to degree {CHECK_DEGREE} found"
+    )
+
+    print(f"seconds per search, tolerance {TOLERANCE}, precision {precision}")
+    print(
+        f"{'polynomial':<70}{'compiled':>12}{'horner':>12}{'speedup':>9}"
+        f"{'all roots':>12}{'roots':>7}"
+    )
+    for polynomial, guess in POLYNOMIALS:
+        compiled, horner, all_roots, count = measure(polynomial, guess, precision)
+        print(
+            f"{polynomial:<70}{compiled:>12.6f}{horner:>12.6f}"
+            f"{compiled / horner:>8.1f}x{all_roots:>12.6f}{count:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
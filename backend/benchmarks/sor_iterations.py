@@ -0,0 +1,120 @@
+# compares the number of iterations Gauss-Seidel and SOR (with the estimated
+# omega, and with the best omega found by a search) take to converge on a suite
+# of systems that Gauss-Seidel is slow on
+#
+# run from the backend directory:
+#   python -m benchmarks.sor_iterations
+import time
+from decimal import Decimal, localcontext
+
+import numpy as np
+from benchmarks.common import to_decimal
+from equations_solver.solver_factory import SolverFactory
+from equations_solver.sparse_matrix import CSRMatrix
+from utils import decimal_context
+
+PRECISION = 15
+TOLERANCE = 1e-8
+MAXIMUM_ITERATIONS = 3000
+OMEGAS = np.round(np.arange(1.0, 2.0, 0.04), 2)
+
+
+# tridiagonal [-1, diagonal, -1], nearly singular when the diagonal is close to 2
+def poisson_1d(n: int, diagonal: float = 2.0) -> CSRMatrix:
+    rows, columns, values = [], [], []
+    for i in range(n):
+        for j, value in ((i - 1, -1.0), (i, diagonal), (i + 1, -1.0)):
+            if 0 <= j < n:
+                rows.append(i)
+                columns.append(j)
+                values.append(value)
+    return coo(rows, columns, values, n)
+
+
+# 5-point Laplacian on an m x m grid
+def poisson_2d(m: int) -> CSRMatrix:
+    rows, columns, values = [], [], []
+    for i in range(m):
+        for j in range(m):
+            k = i * m + j
+            rows.append(k)
+            columns.append(k)
+            values.append(4.0)
+            for di, dj in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                if 0 <= i + di < m and 0 <= j + dj < m:
+                    rows.append(k)
+                    columns.append((i + di) * m + j + dj)
+                    values.append(-1.0)
+    return coo(rows, columns, values, m * m)
+
+
+# dense random system that is only just diagonally dominant
+def random_dominant(n: int) -> np.ndarray:
+    rng = np.random.default_rng(n)
+    A = rng.uniform(0, 1, (n, n))
+    np.fill_diagonal(A, 0)
+    np.fill_diagonal(A, A.sum(axis=1) * 1.01)
+    return to_decimal(A)
+
+
+def coo(rows, columns, values, n) -> CSRMatrix:
+    return CSRMatrix.from_coo(
+        np.array(rows),
+        np.array(columns),
+        np.array([+Decimal(str(x)) for x in values], dtype=Decimal),
+        n,
+    )
+
+
+SYSTEMS = [
+    ("1-D Poisson, n = 50", lambda: poisson_1d(50)),
+    ("1-D Poisson, n = 200", lambda: poisson_1d(200)),
+    ("1-D nearly singular, n = 100", lambda: poisson_1d(100, 2.001)),
+    ("2-D Poisson, 20 x 20", lambda: poisson_2d(20)),
+    ("2-D Poisson, 30 x 30", lambda: poisson_2d(30)),
+    ("random dense, n = 100", lambda: random_dominant(100)),
+]
+
+
+def iterations(method, A, b, omega=None):
+    parameters = {
+        "number_of_iterations": MAXIMUM_ITERATIONS,
+        "absolute_relative_error": TOLERANCE,
+    }
+    if omega is not None:
+        parameters["omega"] = omega
+    solver = SolverFactory.create_solver(
+        method, A, b, PRECISION, parameters, "float64", "none"
+    )
+    result = solver.solve()
+    return result.number_of_iterations, solver.omega
+
+
+def main():
+    with localcontext(decimal_context(PRECISION)):
+        print(
+            f"{'system':<30}{'gauss-seidel':>13}{'sor':>7}{'omega':>8}"
+            f"{'best sor':>10}{'best omega':>12}{'time (s)':>10}"
+        )
+        for name, build in SYSTEMS:
+            A = build()
+            b = np.full(A.shape[0], +Decimal(1), dtype=Decimal)
+
+            start_time = time.perf_counter()
+            gauss_seidel, _ = iterations("gauss-seidel-iteration", A, b)
+            sor, omega = iterations("sor-iteration", A, b)
+            elapsed = time.perf_counter() - start_time
+
+            best, best_omega = min(
+                (iterations("sor-iteration", A, b, float(w))[0], w) for w in OMEGAS
+            )
+            print(
+                f"{name:<30}{gauss_seidel:>13}{sor:>7}{omega:>8.4f}"
+                f"{best:>10}{best_omega:>12.2f}{elapsed:>10.2f}"
+            )
+
+        print(f"(the iterations are capped at {MAXIMUM_ITERATIONS})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# compares the time it takes to solve (and serialise) a system with each steps mode
+#
+# run from the backend directory:
+#   python -m benchmarks.steps_mode
+import time
+from decimal import localcontext
+
+from benchmarks.common import random_decimal_system
+from equations_solver.solver_factory import SolverFactory
+from utils import decimal_context
+
+ITERATION_PARAMETERS = {"number_of_iterations": 50, "absolute_relative_error": 0}
+METHODS = [
+    # method, parameters, numeric backends
+    ("gauss-elimination", {}, ("decimal", "float64")),
+    ("gauss-jordan-elimination", {}, ("decimal", "float64")),
+    ("lu-decomposition", {"format": "doolittle"}, ("decimal", "float64")),
+    ("jacobi-iteration", ITERATION_PARAMETERS, ("decimal", "float64")),
+    ("gauss-seidel-iteration", ITERATION_PARAMETERS, ("decimal", "float64")),
+]
+SIZES = [10, 40]
+# the most digits the float64 backend can be asked for
+PRECISION = 15
+
+
+def measure(method, A, b, parameters, numeric_backend, steps_mode) -> float:
+    start_time = time.perf_counter()
+    solver = SolverFactory.create_solver(
+        method, A, b, PRECISION, parameters, numeric_backend, steps_mode
+    )
+    solver.solve().to_dict(steps_mode)
+    return time.perf_counter() - start_time
+
+
+def main():
+    with localcontext(decimal_context(PRECISION)):
+        print(
+            f"{'method':<26}{'backend':<9}{'n':>4}"
+            f"{'full (s)':>11}{'summary (s)':>13}{'none (s)':>11}{'speedup':>9}"
+        )
+        for method, parameters, numeric_backends in METHODS:
+            for numeric_backend in numeric_backends:
+                for n in SIZES:
+                    A, b = random_decimal_system(n)
+                    times = {
+                        steps_mode: measure(
+                            method, A, b, parameters, numeric_backend, steps_mode
+                        )
+                        for steps_mode in ("full", "summary", "none")
+                    }
+                    print(
+                        f"{method:<26}{numeric_backend:<9}{n:>4}"
+                        f"{times['full']:>11.4f}{times['summary']:>13.4f}"
+                        f"{times['none']:>11.4f}{times['full'] / times['none']:>8.1f}x"
+                    )
+
+
+if __name__ == "__main__":
+    main()
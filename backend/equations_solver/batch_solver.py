@@ -0,0 +1,153 @@
+import time
+from typing import Hashable, List, Optional
+
+import numpy as np
+from equations_solver.result import Result
+from equations_solver.solver import Solver
+from equations_solver.solvers.gauss_elimination_solver import GaussEliminationSolver
+from equations_solver.solvers.lu_decomposition_solver import LUDecompositionSolver
+
+
+# solves many systems of the same size with the same method at once for the
+# float64 backend, the systems are stacked into 3-D arrays and every step of the
+# elimination (pivoting, eliminating a column) is applied to all of them in a
+# single NumPy operation, with the same elementwise operations as the single
+# solvers, and the substitutions use their kernels, giving the same results as
+# solving them one by one with GaussEliminationSolver or the doolittle
+# LUDecompositionSolver
+class BatchSolver:
+    solvers: List[Solver]
+    A: np.ndarray  # (systems, n, n)
+    b: np.ndarray  # (systems, n)
+
+    def __init__(self, solvers: List[Solver]):
+        self.solvers = solvers
+        self.A = np.stack([solver.A for solver in solvers]).astype(np.float64)
+        self.b = np.stack([solver.b for solver in solvers]).astype(np.float64)
+
+    # solvers with the same key can be solved together, None if the solver has
+    # to be run on its own (Decimal backend, steps, diagnostics or a profile
+    # requested, several b, other methods)
+    @staticmethod
+    def batch_key(solver: Solver) -> Optional[Hashable]:
+        if (
+            solver.numeric_backend != "float64"
+            or solver.record_steps
+            or solver.diagnostics
+            or solver.profile is not None
+            or solver.b.ndim != 1
+        ):
+            return None
+
+        if type(solver) is GaussEliminationSolver:
+            method = ("gauss-elimination", bool(solver.scaling))
+        elif type(solver) is LUDecompositionSolver and solver.format == "doolittle":
+            method = ("lu-decomposition", "doolittle")
+        else:
+            return None
+
+        # the precision is part of the key since the results are rounded to it
+        return method, solver.n, solver.precision
+
+    def solve(self) -> List[Result]:
+        start_time = time.time()
+
+        lu = isinstance(self.solvers[0], LUDecompositionSolver)
+        scaling = not lu and bool(self.solvers[0].scaling)
+
+        A = self.A.copy()
+        b = self.b.copy()
+        systems, n = b.shape
+        lanes = np.arange(systems)
+
+        # systems that turned out not to have a unique solution, they are still
+        # carried along (with a dummy pivot) but their values are never used
+        singular = np.zeros(systems, dtype=bool)
+
+        P = np.broadcast_to(np.eye(n), A.shape).copy()
+        L = np.broadcast_to(np.eye(n), A.shape).copy()
+
+        if scaling:
+            scaling_factors = np.max(np.abs(A), axis=2)
+
+        with np.errstate(all="ignore"):
+            for k in range(n - 1):
+                if scaling:
+                    ratios = np.abs(A[:, k:, k]) / scaling_factors[:, k:]
+                else:
+                    ratios = np.abs(A[:, k:, k])
+                pivot_rows = k + np.argmax(ratios, axis=1)
+
+                # swap row k with the pivot row of each system
+                for array in (A, b, P) + ((scaling_factors,) if scaling else ()):
+                    row_k = array[lanes, k].copy()
+                    array[lanes, k] = array[lanes, pivot_rows]
+                    array[lanes, pivot_rows] = row_k
+                L_row_k = L[lanes, k, :k].copy()
+                L[lanes, k, :k] = L[lanes, pivot_rows, :k]
+                L[lanes, pivot_rows, :k] = L_row_k
+
+                pivots = A[:, k, k]
+                singular |= np.abs(pivots) < 1e-12
+                pivots = np.where(singular, 1.0, pivots)
+
+                # rows that are already (almost) zero in column k are left as is
+                column = A[:, k + 1 :, k]
+                eliminate = np.abs(column) >= 1e-12
+                factors = np.where(eliminate, column / pivots[:, None], 0.0)
+
+                A[:, k + 1 :, k + 1 :] -= factors[:, :, None] * A[:, k, None, k + 1 :]
+                A[:, k + 1 :, k] = np.where(eliminate, 0.0, column)
+                b[:, k + 1 :] -= factors * b[:, k, None]
+                L[:, k + 1 :, k] = factors
+
+            singular |= np.abs(A[:, n - 1, n - 1]) < 1e-12
+
+            # the substitutions are the O(n^2) part, they are run system by
+            # system with the kernels of the single solvers, whose dot products
+            # don't sum in the same order as a batched einsum would
+            if lu:
+                # like the doolittle solver, y comes from Ly = Pb instead of
+                # the b that was eliminated along with A
+                b = np.einsum("sij,sj->si", P, self.b)
+            x = np.zeros_like(b)
+            for lane in np.flatnonzero(~singular):
+                y = b[lane]
+                if lu:
+                    y = Solver.forward_substitution_float64(L[lane], y)
+                x[lane] = Solver.back_substitution_float64(A[lane], y)
+
+        # the time of the whole batch is shared between its systems
+        execution_time = (time.time() - start_time) / systems
+
+        results = []
+        for lane in range(systems):
+            if singular[lane]:
+                results.append(
+                    Result(
+                        message="System doesn't have a unique solution.",
+                        execution_time=execution_time,
+                    )
+                )
+                continue
+
+            if lu:
+                result = Result(
+                    solution=x[lane],
+                    steps=[],
+                    execution_time=execution_time,
+                    message="Solution found using doolittle LU decomposition.",
+                )
+                result.L = L[lane]
+                result.U = A[lane]
+                result.P = P[lane]
+            else:
+                result = Result(
+                    solution=x[lane],
+                    steps=[],
+                    execution_time=execution_time,
+                    message="Solution found using Gauss Elimination.",
+                )
+            results.append(result)
+
+        return results
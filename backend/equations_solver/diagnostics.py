@@ -0,0 +1,127 @@
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+# how accurate a solution of a direct method is, from the factors P A = L U the
+# method computed, every one costs O(n^2) next to the O(n^3) factorization:
+#   condition_number: ||A||_1 ||A^-1||_1, with ||A^-1||_1 estimated by Hager's
+#   method (with Higham's refinements) from a few solves with the factors
+#   residual_norm: ||b - Ax||_inf, computed in the solver's arithmetic (the
+#   largest over all the columns of B) and given as a float like the others
+#   growth_factor: max |U| / max |A|, how much the elimination made the entries
+#   grow (large values mean the rounding errors may have grown with them), with
+#   the U of doolittle (the one holding the pivots), which is the U of crout
+#   and cholesky with its rows scaled by the diagonal of their L
+class Diagnostics:
+    condition_number: Optional[float]  # None when the estimate overflows
+    residual_norm: float
+    growth_factor: Optional[float]  # None when A is zero
+
+    def __init__(
+        self,
+        condition_number: Optional[float],
+        residual_norm: float,
+        growth_factor: Optional[float],
+    ):
+        self.condition_number = condition_number
+        self.residual_norm = residual_norm
+        self.growth_factor = growth_factor
+
+    # the diagnostics of the solution x of Ax = b, P is None without pivoting
+    @classmethod
+    def of(
+        cls,
+        A: np.ndarray,
+        b: np.ndarray,
+        x: np.ndarray,
+        L: np.ndarray,
+        U: np.ndarray,
+        P: Optional[np.ndarray] = None,
+    ) -> "Diagnostics":
+        L = L.astype(np.float64)
+        U = U.astype(np.float64)
+        P = None if P is None else P.astype(np.float64)
+
+        A_norm = float(np.max(np.sum(np.abs(A), axis=0)))
+        inverse_norm = estimate_inverse_norm(L, U, P)
+        condition_number = float(A_norm * inverse_norm)
+        if not np.isfinite(condition_number):
+            condition_number = None
+
+        A_max = float(np.max(np.abs(A)))
+        pivots_U = np.diag(L)[:, None] * U
+        growth_factor = float(np.max(np.abs(pivots_U))) / A_max if A_max else None
+
+        residual_norm = float(np.max(np.abs(b - A @ x)))
+
+        return cls(condition_number, residual_norm, growth_factor)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "condition_number": self.condition_number,
+            "residual_norm": self.residual_norm,
+            "growth_factor": self.growth_factor,
+        }
+
+
+# x with A x = y (or A^T x = y) in float64, for P A = L U
+def solve_factors(
+    L: np.ndarray,
+    U: np.ndarray,
+    P: Optional[np.ndarray],
+    y: np.ndarray,
+    transpose: bool = False,
+) -> np.ndarray:
+    n = len(y)
+
+    if not transpose:
+        # L z = P y, U x = z
+        z = y.copy() if P is None else P @ y
+        for i in range(n):
+            z[i] = (z[i] - L[i, :i] @ z[:i]) / L[i, i]
+        for i in range(n - 1, -1, -1):
+            z[i] = (z[i] - U[i, i + 1 :] @ z[i + 1 :]) / U[i, i]
+        return z
+
+    # A^T = U^T L^T P: U^T w = y, L^T v = w, x = P^T v
+    z = y.copy()
+    for i in range(n):
+        z[i] = (z[i] - U[:i, i] @ z[:i]) / U[i, i]
+    for i in range(n - 1, -1, -1):
+        z[i] = (z[i] - L[i + 1 :, i] @ z[i + 1 :]) / L[i, i]
+    return z if P is None else P.T @ z
+
+
+# Hager's estimate of ||A^-1||_1 (the largest column sum of A^-1) from solves
+# with A and A^T, it climbs the convex function ||A^-1 x||_1 over the unit ball
+# of the 1-norm, at most 5 solve pairs, and takes Higham's alternating sign
+# vector into account for the matrices where the climb stops too early
+def estimate_inverse_norm(
+    L: np.ndarray, U: np.ndarray, P: Optional[np.ndarray]
+) -> float:
+    n = len(L)
+
+    with np.errstate(all="ignore"):
+        x = np.full(n, 1 / n)
+        estimate = 0.0
+
+        for iteration in range(5):
+            y = solve_factors(L, U, P, x)
+            norm = float(np.sum(np.abs(y)))
+            if iteration > 0 and norm <= estimate:
+                break
+            estimate = norm
+
+            signs = np.where(y >= 0, 1.0, -1.0)
+            z = solve_factors(L, U, P, signs, transpose=True)
+            j = int(np.argmax(np.abs(z)))
+            if iteration > 0 and abs(z[j]) <= z @ x:
+                break
+
+            x = np.zeros(n)
+            x[j] = 1.0
+
+        alternating = np.array([(-1) ** i * (1 + i / max(n - 1, 1)) for i in range(n)])
+        y = solve_factors(L, U, P, alternating)
+        return max(estimate, 2 * float(np.sum(np.abs(y))) / (3 * n))
@@ -0,0 +1,146 @@
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+# the LU decomposition of a coefficient matrix, everything needed to solve it
+# for another b with only the forward and back substitution
+class Factorization:
+    factorization_id: str
+    format: str  # "doolittle", "crout" or "cholesky"
+    numeric_backend: str
+    precision: int
+    L: np.ndarray
+    U: np.ndarray
+    P: Optional[np.ndarray]  # only doolittle pivots
+    nbytes: int
+
+    def __init__(
+        self,
+        factorization_id: str,
+        format: str,
+        numeric_backend: str,
+        precision: int,
+        L: np.ndarray,
+        U: np.ndarray,
+        P: Optional[np.ndarray] = None,
+    ):
+        self.factorization_id = factorization_id
+        self.format = format
+        self.numeric_backend = numeric_backend
+        self.precision = precision
+        self.L = L
+        self.U = U
+        self.P = P
+        self.nbytes = sum(
+            self.array_nbytes(matrix) for matrix in (L, U, P) if matrix is not None
+        )
+
+    @property
+    def n(self) -> int:
+        return len(self.L)
+
+    # Decimal matrices are arrays of pointers, the Decimals themselves take most
+    # of the memory
+    @staticmethod
+    def array_nbytes(matrix: np.ndarray) -> int:
+        if matrix.dtype != object:
+            return matrix.nbytes
+        return matrix.nbytes + sum(sys.getsizeof(value) for value in matrix.flat)
+
+    # the id of the factorization of A, a digest of its values and of everything
+    # else that changes the factors (the same A rounded to another precision
+    # has other factors)
+    @staticmethod
+    def key(A: np.ndarray, format: str, precision: int, numeric_backend: str) -> str:
+        digest = hashlib.sha256(
+            f"{format}|{numeric_backend}|{precision}|{A.shape}|".encode()
+        )
+        if A.dtype == object:
+            digest.update("|".join(map(str, A.flat)).encode())
+        else:
+            digest.update(np.ascontiguousarray(A, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+
+# thread safe LRU store of factorizations keyed by their id, the least recently
+# used ones are evicted once they take more than `max_bytes` of memory
+class FactorizationCache:
+    max_bytes: int
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, Factorization] = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, factorization_id: str) -> Optional[Factorization]:
+        with self._lock:
+            factorization = self._entries.get(factorization_id)
+            if factorization is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(factorization_id)
+            self.hits += 1
+            return factorization
+
+    # like get, without counting the lookup or making the entry more recent
+    def peek(self, factorization_id: str) -> Optional[Factorization]:
+        with self._lock:
+            return self._entries.get(factorization_id)
+
+    # store a factorization, False if it doesn't fit in the whole budget
+    def put(self, factorization: Factorization) -> bool:
+        with self._lock:
+            if factorization.nbytes > self.max_bytes:
+                return False
+
+            previous = self._entries.pop(factorization.factorization_id, None)
+            if previous is not None:
+                self.nbytes -= previous.nbytes
+
+            self._entries[factorization.factorization_id] = factorization
+            self.nbytes += factorization.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+                self.evictions += 1
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# kept by the server process (the worker processes only compute factorizations),
+# so a factorization_id can be used whichever worker made it, the budget is set
+# with the FACTORIZATION_CACHE_BYTES environment variable
+factorization_cache = FactorizationCache(
+    max_bytes=int(os.environ.get("FACTORIZATION_CACHE_BYTES", 64 * 1024 * 1024))
+)
@@ -0,0 +1,147 @@
+from bisect import bisect_right
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# records the operations applied to a matrix instead of copying it after every
+# operation, a full copy (keyframe) is only kept about every `keyframe_interval`
+# operations and any other version of the matrix is rebuilt lazily by replaying
+# the operations recorded after the closest keyframe
+class MatrixHistory:
+    keyframe_interval: int
+    keyframes: Dict[int, np.ndarray]
+    operations: List[Tuple[Any, ...]]
+
+    def __init__(self, matrix: np.ndarray, keyframe_interval: int = 256):
+        self.keyframe_interval = keyframe_interval
+        self.keyframes = {0: matrix.copy()}
+        self.operations = []
+
+        # the versions that have a keyframe, in increasing order
+        self._keyframe_versions = [0]
+
+        # the last rebuilt version, so replaying versions in order is cheap
+        self._cursor_version = 0
+        self._cursor_matrix = matrix.copy()
+
+    # the number of operations recorded so far, which is also the latest version
+    @property
+    def version(self) -> int:
+        return len(self.operations)
+
+    # swap rows r1 and r2, limited to the columns before `stop` if given
+    def swap(
+        self, *blocks: np.ndarray, r1: int, r2: int, stop: Optional[int] = None
+    ) -> "MatrixSnapshot":
+        return self._record(("swap", r1, r2, stop), blocks)
+
+    # subtract multiplier times the source row from the target row, making the
+    # element in the source column of the target row exactly zero, only the
+    # columns after the source column are updated (like the solvers do, the
+    # ones before it are left as they are)
+    def add(
+        self, *blocks: np.ndarray, target: int, source: int, multiplier
+    ) -> "MatrixSnapshot":
+        return self._record(("add", target, source, multiplier), blocks)
+
+    # divide the row by the divisor
+    def scale(self, *blocks: np.ndarray, row: int, divisor) -> "MatrixSnapshot":
+        return self._record(("scale", row, divisor), blocks)
+
+    # set a single element
+    def set(
+        self, *blocks: np.ndarray, row: int, column: int, value
+    ) -> "MatrixSnapshot":
+        return self._record(("set", row, column, value), blocks)
+
+    # whether recording `operations` more operations, the last one with blocks,
+    # takes a keyframe, so the blocks only have to be built when they're kept
+    def keyframe_due(self, operations: int = 1) -> bool:
+        return (
+            self.version + operations - self._keyframe_versions[-1]
+            >= self.keyframe_interval
+        )
+
+    # the blocks are the current state of the matrix (after the operation was
+    # applied), they are only copied when a keyframe is due, operations recorded
+    # without blocks (like the ones applied as part of a batch) never get one
+    def _record(self, operation: Tuple[Any, ...], blocks) -> "MatrixSnapshot":
+        self.operations.append(operation)
+
+        version = self.version
+        if blocks and version - self._keyframe_versions[-1] >= self.keyframe_interval:
+            self.keyframes[version] = (
+                np.column_stack(blocks) if len(blocks) > 1 else blocks[0].copy()
+            )
+            self._keyframe_versions.append(version)
+
+        return MatrixSnapshot(self, version)
+
+    # reference to the current version, without copying anything
+    def latest(self) -> "MatrixSnapshot":
+        return MatrixSnapshot(self, self.version)
+
+    @staticmethod
+    def apply(matrix: np.ndarray, operation: Tuple[Any, ...]):
+        operation_type = operation[0]
+
+        if operation_type == "swap":
+            _, r1, r2, stop = operation
+            columns = slice(None) if stop is None else slice(None, stop)
+            matrix[[r1, r2], columns] = matrix[[r2, r1], columns]
+
+        elif operation_type == "add":
+            _, target, source, multiplier = operation
+            matrix[target, source + 1 :] = (
+                matrix[target, source + 1 :] - multiplier * matrix[source, source + 1 :]
+            )
+            matrix[target, source] = +Decimal(0) if matrix.dtype == object else 0.0
+
+        elif operation_type == "scale":
+            _, row, divisor = operation
+            matrix[row] = matrix[row] / divisor
+
+        elif operation_type == "set":
+            _, row, column, value = operation
+            matrix[row, column] = value
+
+    # rebuild the matrix as it was after `version` operations
+    def snapshot(self, version: int) -> np.ndarray:
+        start = self._keyframe_versions[
+            bisect_right(self._keyframe_versions, version) - 1
+        ]
+
+        if start <= self._cursor_version <= version:
+            start = self._cursor_version
+            matrix = self._cursor_matrix
+        else:
+            matrix = self.keyframes[start].copy()
+
+        for operation in self.operations[start:version]:
+            self.apply(matrix, operation)
+
+        self._cursor_version = version
+        self._cursor_matrix = matrix
+
+        return matrix.copy()
+
+
+# lazy reference to a version of a matrix in a history, it is turned into an
+# array only when something (like a step's to_dict) asks for it
+class MatrixSnapshot:
+    history: MatrixHistory
+    version: int
+
+    def __init__(self, history: MatrixHistory, version: int):
+        self.history = history
+        self.version = version
+
+    # the version before this one, i.e. the matrix before the operation
+    def previous(self) -> "MatrixSnapshot":
+        return MatrixSnapshot(self.history, self.version - 1)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        matrix = self.history.snapshot(self.version)
+        return matrix if dtype is None else matrix.astype(dtype)
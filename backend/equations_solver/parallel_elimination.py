@@ -0,0 +1,254 @@
+import multiprocessing
+import os
+import threading
+from decimal import Decimal, getcontext, setcontext
+from typing import List, Optional
+
+import numpy as np
+import worker_pool
+from exceptions import ValidationError
+
+# the rows are dealt to the workers in blocks of this many consecutive rows, one
+# block per worker in turn, so every worker keeps some of the rows below the
+# pivot until the last few pivots
+ROW_BLOCK = 8
+
+
+# the cores the elimination of one request can use, the requests run at once by
+# the workers of the pool (every one with elimination workers of its own) share
+# the cores of the server, so each gets an equal part of them, at least one
+def request_cores(pool_workers: int) -> int:
+    return max(1, (os.cpu_count() or 1) // max(pool_workers, 1))
+
+
+# the number of worker processes asked for with the parallel_workers parameter,
+# 1 (the default) eliminates in the solver's own process, at most one per core
+# the request can use
+def parse_workers(workers) -> int:
+    if workers is None:
+        return 1
+    try:
+        count = int(str(workers))
+    except ValueError:
+        count = 0
+    if count < 1:
+        raise ValidationError(
+            f"Parallel workers must be a positive integer. Found: '{workers}'"
+        )
+    cores = request_cores(worker_pool.pool_workers or 1)
+    if count > cores:
+        raise ValidationError(
+            f"Parallel workers can't be more than the number of cores of the server for a request ({cores}). Found: '{workers}'"
+        )
+    return count
+
+
+# the loop run by every worker process, it keeps its rows of the matrix between
+# commands so only the pivot row, the factors and a column go through the pipe
+def serve(connection):
+    M = None
+    position = None  # the local index of every row of the matrix, -1 if not ours
+
+    while True:
+        try:
+            command, *args = connection.recv()
+        except EOFError:
+            return
+
+        if command == "load":
+            context, rows, M, n = args
+            setcontext(context)
+            position = np.full(n, -1)
+            position[rows] = np.arange(len(rows))
+
+        elif command == "row":
+            connection.send(M[position[args[0]]])
+
+        elif command == "set_row":
+            i, values = args
+            M[position[i]] = values
+
+        elif command == "swap":
+            r1, r2 = args
+            M[position[[r1, r2]]] = M[position[[r2, r1]]]
+
+        elif command == "column":
+            connection.send(M[:, args[0]])
+
+        # subtract the pivot row scaled by M[i, k] / M[k, k] from our target
+        # rows, the same operations as EliminationSolver.eliminate_row, and send
+        # back the factors and the next column (for the next pivot search)
+        elif command == "eliminate":
+            k, pivot_row, targets = args
+            local = position[targets]
+            local = local[local >= 0]
+
+            factors = M[local, k] / pivot_row[k]
+            M[local, k + 1 :] -= np.outer(factors, pivot_row[k + 1 :])
+            M[local, k] = +Decimal(0)
+
+            column = M[:, k + 1] if k + 1 < M.shape[1] else None
+            connection.send((factors, column))
+
+        elif command == "gather":
+            connection.send(M)
+
+        elif command == "unload":
+            M = position = None
+
+
+# the worker processes, started on first use and kept for the next systems, a
+# system holds all of them (or the ones it needs) until it's eliminated
+class EliminationPool:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections: List = []
+        self.processes: List = []
+
+    # start workers until there are at least `workers` running ones
+    def ensure(self, workers: int):
+        if not all(process.is_alive() for process in self.processes):
+            self.reset()
+
+        # spawn instead of fork, like the request workers
+        context = multiprocessing.get_context("spawn")
+        while len(self.connections) < workers:
+            parent, child = context.Pipe()
+            process = context.Process(target=serve, args=(child,), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    # stop every worker, after an elimination that didn't finish their pipes
+    # can still hold replies nobody will read
+    def reset(self):
+        for process in self.processes:
+            process.terminate()
+        self.connections = []
+        self.processes = []
+
+
+_pool: Optional[EliminationPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_elimination_pool() -> EliminationPool:
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = EliminationPool()
+        return _pool
+
+
+# a Decimal matrix (the augmented [A | b] or U) whose rows are spread over
+# worker processes, every worker eliminates its own rows below (or above) the
+# pivot, so the elimination of a column is split between the workers while
+# every value is computed with the same operations, in the same decimal
+# context, as in the serial solvers
+#
+# used as a context manager, the workers are released on exit
+class ParallelElimination:
+    n: int
+    workers: int
+
+    def __init__(self, M: np.ndarray, workers: int):
+        self.n = len(M)
+        self.workers = min(workers, -(-self.n // ROW_BLOCK))
+        self.pool = get_elimination_pool()
+        self.owner = (np.arange(self.n) // ROW_BLOCK) % self.workers
+
+        # the column the next pivot is searched in, kept up to date by the
+        # operations instead of asking the workers for it
+        self._column_index = 0
+        self._column = M[:, 0].copy()
+
+        self.pool.lock.acquire()
+        try:
+            self.pool.ensure(self.workers)
+            self.connections = self.pool.connections[: self.workers]
+
+            context = getcontext().copy()
+            for worker, connection in enumerate(self.connections):
+                rows = np.flatnonzero(self.owner == worker)
+                connection.send(("load", context, rows, M[rows], self.n))
+        except BaseException:
+            self.pool.lock.release()
+            raise
+
+    def __enter__(self) -> "ParallelElimination":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                for connection in self.connections:
+                    connection.send(("unload",))
+            else:
+                self.pool.reset()
+        finally:
+            self.pool.lock.release()
+
+    def _connection(self, i: int):
+        return self.connections[self.owner[i]]
+
+    # column k, the values of every row
+    def column(self, k: int) -> np.ndarray:
+        if self._column_index != k:
+            for connection in self.connections:
+                connection.send(("column", k))
+            self._column = self._merge(
+                [connection.recv() for connection in self.connections]
+            )
+            self._column_index = k
+        return self._column
+
+    def row(self, i: int) -> np.ndarray:
+        connection = self._connection(i)
+        connection.send(("row", i))
+        return connection.recv()
+
+    def set_row(self, i: int, values: np.ndarray):
+        self._connection(i).send(("set_row", i, values))
+        self._column[i] = values[self._column_index]
+
+    def swap(self, r1: int, r2: int):
+        if self.owner[r1] == self.owner[r2]:
+            self._connection(r1).send(("swap", r1, r2))
+        else:
+            row1, row2 = self.row(r1), self.row(r2)
+            self._connection(r1).send(("set_row", r1, row2))
+            self._connection(r2).send(("set_row", r2, row1))
+        self._column[[r1, r2]] = self._column[[r2, r1]]
+
+    # eliminate column k from the given rows using row k, returns the factor
+    # of every row (in the same order)
+    def eliminate(self, k: int, rows: np.ndarray) -> np.ndarray:
+        pivot_row = self.row(k)
+        for connection in self.connections:
+            connection.send(("eliminate", k, pivot_row, rows))
+        replies = [connection.recv() for connection in self.connections]
+
+        factors = np.empty(len(rows), dtype=object)
+        owners = self.owner[rows]
+        for worker, (worker_factors, _) in enumerate(replies):
+            factors[owners == worker] = worker_factors
+
+        if k + 1 < len(pivot_row):
+            self._column = self._merge([column for _, column in replies])
+            self._column_index = k + 1
+        return factors
+
+    # the whole matrix as it is now
+    def gather(self) -> np.ndarray:
+        for connection in self.connections:
+            connection.send(("gather",))
+        return self._merge([connection.recv() for connection in self.connections])
+
+    # put the rows sent back by every worker in their places
+    def _merge(self, parts: List[np.ndarray]) -> np.ndarray:
+        merged = np.empty((self.n, *parts[0].shape[1:]), dtype=object)
+        for worker, part in enumerate(parts):
+            merged[self.owner == worker] = part
+        return merged
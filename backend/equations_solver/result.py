@@ -1,7 +1,10 @@
+import time
 from typing import Any, Dict, List, Optional
 
 import numpy as np
+from equations_solver.diagnostics import Diagnostics
 from equations_solver.step import Step
+from profiling import Profile
 from utils import remove_trailing_zeros
 
 
@@ -14,6 +17,8 @@ class Result:
     L: Optional[np.ndarray]
     U: Optional[np.ndarray]
     P: Optional[np.ndarray]
+    diagnostics: Optional[Diagnostics]
+    profile: Optional[Profile]
 
     def __init__(
         self,
@@ -36,7 +41,17 @@ class Result:
         self.U = None
         self.P = None
 
-    def to_dict(self) -> Dict[str, Any]:
+        # optional accuracy diagnostics of the direct methods
+        self.diagnostics = None
+
+        # where the time went, when the solution was profiled
+        self.profile = None
+
+    # steps is how the steps are serialised: "full", "summary" (only the
+    # operations, without matrices) or "none" (left out)
+    def to_dict(self, steps: str = "full") -> Dict[str, Any]:
+        start = time.perf_counter_ns()
+
         result = {
             "message": self.message,
             "execution_time": round(self.execution_time, 12),
@@ -47,8 +62,10 @@ class Result:
                 self.solution
             ).tolist()
 
-        if self.steps is not None:
+        if self.steps is not None and steps == "full":
             result["steps"] = [step.to_dict() for step in self.steps]
+        elif self.steps is not None and steps == "summary":
+            result["steps"] = [step.to_summary_dict() for step in self.steps]
 
         if self.iterations_steps is not None:
             result["iterations_steps"] = self.iterations_steps
@@ -65,4 +82,11 @@ class Result:
         if self.P is not None:
             result["P"] = np.vectorize(remove_trailing_zeros)(self.P).tolist()
 
+        if self.diagnostics is not None:
+            result["diagnostics"] = self.diagnostics.to_dict()
+
+        if self.profile is not None:
+            self.profile.add_phase("serialize", time.perf_counter_ns() - start)
+            result["profile"] = self.profile.to_dict()
+
         return result
@@ -1,27 +1,184 @@
 from abc import ABC, abstractmethod
-from typing import List
+from decimal import Decimal
+from typing import Callable, List, Optional, Union
 
 import numpy as np
+from equations_solver.diagnostics import Diagnostics
 from equations_solver.result import Result
+from equations_solver.sparse_matrix import CSRMatrix
 from equations_solver.step import Step
+from profiling import Profile
 
 
 # base class for all solvers
 class Solver(ABC):
     A: np.ndarray
-    b: np.ndarray
+    b: np.ndarray  # (n,), or (n, k) to solve for k right-hand sides at once
     n: int
     precision: int
+    numeric_backend: str  # "decimal" or "float64"
+    steps_mode: str  # "none", "summary" or "full"
     steps: List[Step]
+    step_sink: Optional[Callable[[Step], None]]  # receives the steps if given
+    diagnostics: bool  # whether the direct methods add diagnostics to the result
+    profile: Optional[Profile]  # kept when the solution is profiled
 
-    def __init__(self, A: np.ndarray, b: np.ndarray, precision: int):
-        self.A = A.copy()
-        self.b = b.copy()
+    def __init__(
+        self,
+        A: np.ndarray,
+        b: np.ndarray,
+        precision: int,
+        numeric_backend: str = "decimal",
+        steps_mode: str = "full",
+        step_sink: Optional[Callable[[Step], None]] = None,
+    ):
+        self.numeric_backend = numeric_backend
+        self.steps_mode = steps_mode
+        self.step_sink = step_sink
+        # A is None when the solver only needs its stored factors
+        if numeric_backend == "float64":
+            self.A = None if A is None else A.astype(np.float64)
+            self.b = b.astype(np.float64)
+        else:
+            self.A = None if A is None else A.copy()
+            self.b = b.copy()
         self.n = len(b)
         self.precision = precision
         self.steps = []
+        self.diagnostics = False
+        self.profile = None
+
+    # whether the solution steps should be recorded at all, when they are not,
+    # the solvers skip building the matrices the steps would need
+    @property
+    def record_steps(self) -> bool:
+        return self.steps_mode != "none"
+
+    # add a step to the solution, or hand it to the step sink as soon as it is
+    # made when the steps are streamed
+    def add_step(self, step: Step):
+        if self.step_sink is not None:
+            self.step_sink(step)
+        else:
+            self.steps.append(step)
+
+    # add the diagnostics of the solution to the result when they were asked
+    # for, from the factors P A = L U the method computed (P None without
+    # pivoting), they need A itself too
+    def diagnose(
+        self,
+        result: Result,
+        L: np.ndarray,
+        U: np.ndarray,
+        P: Optional[np.ndarray] = None,
+    ) -> Result:
+        if self.diagnostics and result.solution is not None and self.A is not None:
+            result.diagnostics = Diagnostics.of(
+                self.A, self.b, result.solution, L, U, P
+            )
+        return result
 
     # solve the system of linear equations
     @abstractmethod
     def solve(self) -> Result:
         pass
+
+    # solve the system, timing the solution and adding the profile to the
+    # result when it is profiled
+    def solve_profiled(self) -> Result:
+        if self.profile is None:
+            return self.solve()
+
+        with self.profile.phase("solve"):
+            result = self.solve()
+        result.profile = self.profile
+        return result
+
+    # the number of right-hand sides
+    @property
+    def columns(self) -> int:
+        return 1 if self.b.ndim == 1 else self.b.shape[1]
+
+    # count Decimal operations (multiplications, divisions, additions and
+    # subtractions) of the solution when it is profiled, the kernels count
+    # them from the sizes of the arrays they work on
+    def count_operations(self, operations: int):
+        if self.profile is not None and self.numeric_backend == "decimal":
+            self.profile.count("decimal_operations", int(operations))
+
+    # the operations of a triangular solve for every right-hand side, a
+    # multiplication and a subtraction for every value off the diagonal, and
+    # a division by every value on it (none with a unit diagonal)
+    def count_substitution(self, unit_diagonal: bool = False):
+        n = self.n
+        self.count_operations(self.columns * (n * n - (n if unit_diagonal else 0)))
+
+    # start timing the iterations of the solution when it is profiled
+    def start_iterations(self):
+        if self.profile is not None:
+            self.profile.start_iterations()
+
+    # end an iteration
+    def lap(self):
+        if self.profile is not None:
+            self.profile.lap()
+
+    @staticmethod
+    def allclose(
+        a: np.ndarray, b: np.ndarray, rtol=Decimal("1e-5"), atol=Decimal("1e-8")
+    ) -> bool:
+        if a.shape != b.shape:
+            return False
+
+        for x, y in zip(a.flat, b.flat):
+            diff = abs(x - y)
+            tol = atol + rtol * abs(y)
+            if diff > tol:
+                return False
+        return True
+
+    # whether A equals its transpose (up to the tolerances of allclose), which
+    # the methods for symmetric positive definite systems check first
+    @staticmethod
+    def is_symmetric(A: Union[np.ndarray, CSRMatrix]) -> bool:
+        if isinstance(A, CSRMatrix):
+            # the transpose has to store its values in the same positions
+            transpose = A.transpose()
+            if not (
+                np.array_equal(A.row_pointers, transpose.row_pointers)
+                and np.array_equal(A.column_indices, transpose.column_indices)
+            ):
+                return False
+            a, b = A.values, transpose.values
+        else:
+            a, b = A, A.T
+
+        if a.dtype == object:
+            return Solver.allclose(a, b)
+        return np.allclose(a, b, rtol=1e-5, atol=1e-8)
+
+    # vectorized forward substitution for the float64 backend: Ly = b
+    @staticmethod
+    def forward_substitution_float64(
+        L: np.ndarray, b: np.ndarray, unit_diagonal: bool = True
+    ) -> np.ndarray:
+        n = len(b)
+        y = np.zeros(b.shape)
+        for i in range(n):
+            y[i] = b[i] - L[i, :i] @ y[:i]
+            if not unit_diagonal:
+                y[i] /= L[i, i]
+        return y
+
+    # vectorized back substitution for the float64 backend: Ux = y
+    @staticmethod
+    def back_substitution_float64(
+        U: np.ndarray, y: np.ndarray, unit_diagonal: bool = False
+    ) -> np.ndarray:
+        n = len(y)
+        x = np.zeros(y.shape)
+        for i in range(n - 1, -1, -1):
+            x[i] = y[i] - U[i, i + 1 :] @ x[i + 1 :]
+            if not unit_diagonal:
+                x[i] /= U[i, i]
+        return x
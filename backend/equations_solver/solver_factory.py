@@ -1,8 +1,11 @@
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional, Union
 
 import numpy as np
 
 # Import all solver classes here
+from equations_solver.solvers.conjugate_gradient_solver import (
+    ConjugateGradientSolver,
+)
 from equations_solver.solvers.gauss_elimination_solver import GaussEliminationSolver
 from equations_solver.solvers.gauss_jordan_elimination_solver import (
     GaussJordanEliminationSolver,
@@ -10,36 +13,113 @@ from equations_solver.solvers.gauss_jordan_elimination_solver import (
 from equations_solver.solvers.gauss_seidel_iteration_solver import (
     GaussSeidelIterationSolver,
 )
+from equations_solver.solvers.iterative_refinement_solver import (
+    IterativeRefinementSolver,
+)
 from equations_solver.solvers.jacobi_iteration_solver import JacobiIterationSolver
 from equations_solver.solvers.lu_decomposition_solver import LUDecompositionSolver
+from equations_solver.solvers.sor_iteration_solver import SORIterationSolver
+from equations_solver.sparse_matrix import CSRMatrix
+from equations_solver.step import Step
 from exceptions import ValidationError
+from validator import LinearSystemValidator
+
+
+# the methods that can solve a sparse (CSR) system without making it dense
+SPARSE_METHODS = (
+    "jacobi-iteration",
+    "gauss-seidel-iteration",
+    "sor-iteration",
+    "conjugate-gradient",
+)
+
+# the methods that can solve for the columns of an n x k B together
+MULTIPLE_RHS_METHODS = (
+    "gauss-elimination",
+    "gauss-jordan-elimination",
+    "lu-decomposition",
+)
 
 
 class SolverFactory:
     @staticmethod
     def create_solver(
         method: str,
-        A: np.ndarray,
+        A: Union[np.ndarray, CSRMatrix],
         b: np.ndarray,
         precision: int,
         parameters: Dict[str, Any],
+        numeric_backend: Optional[str] = None,
+        steps_mode: str = "full",
+        step_sink: Optional[Callable[[Step], None]] = None,
     ):
+        if isinstance(A, CSRMatrix) and method not in SPARSE_METHODS:
+            raise ValidationError(
+                f"Sparse coefficient matrices can only be solved with {', '.join(SPARSE_METHODS)}. Found: '{method}'"
+            )
+
+        if b.ndim == 2 and method not in MULTIPLE_RHS_METHODS:
+            raise ValidationError(
+                f"Multiple right-hand sides can only be solved with {', '.join(MULTIPLE_RHS_METHODS)}. Found: '{method}'"
+            )
+
         if method == "gauss-elimination":
             scaling = parameters.get("scaling", False)
-            return GaussEliminationSolver(A, b, precision, scaling)
+            numeric_backend = LinearSystemValidator.validate_numeric_backend(
+                numeric_backend, precision
+            )
+            return GaussEliminationSolver(
+                A,
+                b,
+                precision,
+                scaling,
+                numeric_backend,
+                steps_mode,
+                step_sink,
+                parameters.get("parallel_workers"),
+            )
 
         elif method == "gauss-jordan-elimination":
             scaling = parameters.get("scaling", False)
-            return GaussJordanEliminationSolver(A, b, precision, scaling)
+            numeric_backend = LinearSystemValidator.validate_numeric_backend(
+                numeric_backend, precision
+            )
+            return GaussJordanEliminationSolver(
+                A,
+                b,
+                precision,
+                scaling,
+                numeric_backend,
+                steps_mode,
+                step_sink,
+                parameters.get("parallel_workers"),
+            )
 
         elif method == "lu-decomposition":
             format = parameters.get("format", "doolittle").lower()
-            return LUDecompositionSolver(A, b, precision, format)
+            block_size = parameters.get("block_size")
+            numeric_backend = LinearSystemValidator.validate_numeric_backend(
+                numeric_backend, precision
+            )
+            return LUDecompositionSolver(
+                A,
+                b,
+                precision,
+                format,
+                block_size,
+                numeric_backend,
+                steps_mode,
+                step_sink,
+                parallel_workers=parameters.get("parallel_workers"),
+            )
 
         elif method == "jacobi-iteration":
             initial_guess = parameters.get("initial_guess")
             number_of_iterations = parameters.get("number_of_iterations", 100)
             absolute_relative_error = parameters.get("absolute_relative_error", 1e-6)
+            numeric_backend = LinearSystemValidator.validate_numeric_backend(
+                numeric_backend, precision
+            )
             return JacobiIterationSolver(
                 A,
                 b,
@@ -47,12 +127,18 @@ class SolverFactory:
                 initial_guess,
                 number_of_iterations,
                 absolute_relative_error,
+                numeric_backend,
+                steps_mode,
+                step_sink,
             )
 
         elif method == "gauss-seidel-iteration":
             initial_guess = parameters.get("initial_guess")
             number_of_iterations = parameters.get("number_of_iterations", 100)
             absolute_relative_error = parameters.get("absolute_relative_error", 1e-6)
+            numeric_backend = LinearSystemValidator.validate_numeric_backend(
+                numeric_backend, precision
+            )
             return GaussSeidelIterationSolver(
                 A,
                 b,
@@ -60,6 +146,72 @@ class SolverFactory:
                 initial_guess,
                 number_of_iterations,
                 absolute_relative_error,
+                numeric_backend,
+                steps_mode,
+                step_sink,
+            )
+
+        elif method == "sor-iteration":
+            initial_guess = parameters.get("initial_guess")
+            number_of_iterations = parameters.get("number_of_iterations", 100)
+            absolute_relative_error = parameters.get("absolute_relative_error", 1e-6)
+            omega = parameters.get("omega")
+            numeric_backend = LinearSystemValidator.validate_numeric_backend(
+                numeric_backend, precision
+            )
+            return SORIterationSolver(
+                A,
+                b,
+                precision,
+                initial_guess,
+                number_of_iterations,
+                absolute_relative_error,
+                omega,
+                numeric_backend,
+                steps_mode,
+                step_sink,
+            )
+
+        elif method == "conjugate-gradient":
+            initial_guess = parameters.get("initial_guess")
+            number_of_iterations = parameters.get("number_of_iterations", 100)
+            absolute_relative_error = parameters.get("absolute_relative_error", 1e-6)
+            preconditioner = parameters.get("preconditioner")
+            numeric_backend = LinearSystemValidator.validate_numeric_backend(
+                numeric_backend, precision
+            )
+            return ConjugateGradientSolver(
+                A,
+                b,
+                precision,
+                initial_guess,
+                number_of_iterations,
+                absolute_relative_error,
+                preconditioner,
+                numeric_backend,
+                steps_mode,
+                step_sink,
+            )
+
+        elif method == "iterative-refinement":
+            number_of_iterations = parameters.get("number_of_iterations", 20)
+            absolute_relative_error = parameters.get("absolute_relative_error")
+            # the residuals are computed in Decimal, only the factors are float64
+            if (
+                numeric_backend is not None
+                and str(numeric_backend).lower() != "decimal"
+            ):
+                raise ValidationError(
+                    f"Iterative refinement computes its residuals with the decimal backend. Found: '{numeric_backend}'"
+                )
+            return IterativeRefinementSolver(
+                A,
+                b,
+                precision,
+                number_of_iterations,
+                absolute_relative_error,
+                steps_mode,
+                step_sink,
             )
 
         else:
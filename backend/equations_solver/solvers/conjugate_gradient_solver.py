@@ -0,0 +1,270 @@
+import time
+from decimal import Decimal
+from typing import Callable, Optional, Union
+
+import numpy as np
+from equations_solver.result import Result
+from equations_solver.solvers.iteration_solver import IterationSolver
+from equations_solver.sparse_matrix import CSRMatrix
+from equations_solver.step import Step
+from equations_solver.steps.iteration_step import IterationStep
+from exceptions import ValidationError
+
+PRECONDITIONERS = ("none", "jacobi", "incomplete-cholesky")
+
+
+# conjugate gradient for symmetric positive definite systems, every iteration
+# moves x along a search direction that is A-orthogonal to all the previous ones
+# (so in exact arithmetic it converges in at most n iterations), with M^-1
+# applied to the residuals when a preconditioner is used:
+#   jacobi: M = D, the diagonal of A
+#   incomplete-cholesky: M = L L^T, with L a Cholesky factor of A that keeps the
+#   nonzero pattern of A's lower triangle (IC(0))
+class ConjugateGradientSolver(IterationSolver):
+    preconditioner: str
+    residual: np.ndarray  # b - Ax
+    direction: np.ndarray
+    residual_dot: Decimal  # r^T M^-1 r
+    factor_lower: CSRMatrix  # L without its diagonal
+    factor_upper: CSRMatrix  # L^T without its diagonal
+    factor_diagonal: np.ndarray
+
+    def __init__(
+        self,
+        A: Union[np.ndarray, CSRMatrix],
+        b: np.ndarray,
+        precision,
+        initial_guess,
+        number_of_iterations,
+        absolute_relative_error,
+        preconditioner: Optional[str] = None,
+        numeric_backend: str = "decimal",
+        steps_mode: str = "full",
+        step_sink: Optional[Callable[[Step], None]] = None,
+    ):
+        super().__init__(
+            A,
+            b,
+            precision,
+            initial_guess,
+            number_of_iterations,
+            absolute_relative_error,
+            numeric_backend,
+            steps_mode,
+            step_sink,
+        )
+
+        self.preconditioner = str(preconditioner or "none").lower()
+        if self.preconditioner not in PRECONDITIONERS:
+            raise ValidationError(
+                f"Preconditioner must be one of {', '.join(PRECONDITIONERS)}. Found: '{preconditioner}'"
+            )
+
+    @property
+    def method_name(self) -> str:
+        if self.preconditioner == "none":
+            return "Conjugate Gradient"
+        return f"Preconditioned Conjugate Gradient ({self.preconditioner})"
+
+    # build the preconditioner, False if the incomplete Cholesky factorization
+    # breaks down (a pivot that isn't positive)
+    def prepare_preconditioner(self, A: Union[np.ndarray, CSRMatrix]) -> bool:
+        if self.preconditioner == "jacobi":
+            self.factor_diagonal = A.diagonal().copy()
+        elif self.preconditioner == "incomplete-cholesky":
+            return self.incomplete_cholesky(
+                A if self.sparse else CSRMatrix.from_dense(A)
+            )
+        return True
+
+    def incomplete_cholesky(self, A: CSRMatrix) -> bool:
+        n = self.n
+
+        # row i of L below the diagonal, {column: value}
+        rows = [{} for _ in range(n)]
+        diagonal = np.empty(n, dtype=A.dtype)
+
+        for i in range(n):
+            row = rows[i]
+            pivot = 0
+
+            # the columns of a row are in increasing order, so all the values of
+            # row i left of column j are known by the time L[i, j] is computed
+            start, stop = A.row_pointers[i], A.row_pointers[i + 1]
+            for j, value in zip(A.column_indices[start:stop], A.values[start:stop]):
+                if j < i:
+                    other = rows[j]
+                    for k, l_ik in row.items():
+                        if k in other:
+                            value = value - l_ik * other[k]
+                    row[j] = value / diagonal[j]
+                elif j == i:
+                    pivot = value
+
+            for l_ik in row.values():
+                pivot = pivot - l_ik * l_ik
+            if pivot <= 0:
+                return False
+            diagonal[i] = np.sqrt(pivot)
+
+        row_pointers = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(row) for row in rows], out=row_pointers[1:])
+        column_indices = np.array([j for row in rows for j in row], dtype=np.int64)
+        values = np.array([value for row in rows for value in row.values()])
+
+        self.factor_lower = CSRMatrix(
+            row_pointers, column_indices, values.astype(A.dtype), n
+        )
+        self.factor_upper = self.factor_lower.transpose()
+        self.factor_diagonal = diagonal
+        return True
+
+    # M^-1 r
+    def precondition(self, residual: np.ndarray) -> np.ndarray:
+        if self.preconditioner == "jacobi":
+            self.count_operations(self.n)
+            return residual / self.factor_diagonal
+        if self.preconditioner == "incomplete-cholesky":
+            # two triangular solves
+            self.count_operations(
+                2 * self.entries(self.factor_lower)
+                + 2 * self.entries(self.factor_upper)
+                + 4 * self.n
+            )
+            y = self.factor_lower.solve_triangular(self.factor_diagonal, residual)
+            return self.factor_upper.solve_triangular(
+                self.factor_diagonal, y, lower=False
+            )
+        return residual
+
+    # one step along the search direction, None when p^T A p isn't positive
+    # (A isn't positive definite)
+    def iterate(self, A: np.ndarray, b: np.ndarray, x: np.ndarray) -> np.ndarray:
+        Ap = A @ self.direction
+        curvature = self.direction @ Ap
+        if curvature <= 0:
+            return None
+
+        alpha = self.residual_dot / curvature
+        self.residual = self.residual - alpha * Ap
+
+        # A p, p^T A p, alpha, and the updates of the residual and x
+        self.count_operations(2 * self.entries(A) + 6 * self.n + 1)
+        return x + alpha * self.direction
+
+    # the next search direction, A-orthogonal to the previous ones
+    def update_direction(self):
+        z = self.precondition(self.residual)
+        residual_dot = self.residual @ z
+        beta = residual_dot / self.residual_dot
+        self.direction = z + beta * self.direction
+        self.residual_dot = residual_dot
+
+        # r^T z, beta and the new direction
+        self.count_operations(4 * self.n + 1)
+
+    def iteration_step(
+        self,
+        matrix: np.ndarray,
+        x_old: np.ndarray,
+        x_new: np.ndarray,
+        absolute_relative_error: Decimal,
+    ) -> IterationStep:
+        return IterationStep.conjugate_gradient(
+            matrix,
+            x_old,
+            x_new,
+            absolute_relative_error,
+            np.sqrt(self.residual @ self.residual),
+        )
+
+    def solve(self) -> Result:
+        start_time = time.time()
+
+        A = self.A
+        b = self.b
+        x = self.x0.copy()
+
+        # the same check the Cholesky decomposition does, a positive diagonal
+        # is needed for A to be positive definite, the rest shows up as a search
+        # direction with p^T A p <= 0
+        if not self.is_symmetric(A):
+            return Result(
+                message="Coefficients matrix is not symmetric.",
+                execution_time=time.time() - start_time,
+            )
+
+        if np.any(A.diagonal() <= 0):
+            return Result(
+                message="Coefficients matrix is not positive definite.",
+                execution_time=time.time() - start_time,
+            )
+
+        if not self.prepare_preconditioner(A):
+            return Result(
+                message="Incomplete Cholesky factorization broke down (a pivot isn't positive), try the jacobi preconditioner.",
+                execution_time=time.time() - start_time,
+            )
+
+        # the augmented matrix shown in the steps, left out for sparse systems
+        if self.record_steps and not self.sparse:
+            matrix = np.column_stack((A, b))
+        else:
+            matrix = None
+
+        self.residual = b - A @ x
+        self.direction = self.precondition(self.residual)
+        self.residual_dot = self.residual @ self.direction
+
+        number_of_iterations = 0
+        maximum_number_of_iterations = self.number_of_iterations
+
+        # the initial guess already solves the system
+        converged = not np.any(self.residual)
+
+        self.start_iterations()
+
+        while not converged and number_of_iterations < maximum_number_of_iterations:
+            x_new = self.iterate(A, b, x)
+            if x_new is None:
+                return Result(
+                    message="Coefficients matrix is not positive definite.",
+                    execution_time=time.time() - start_time,
+                )
+
+            number_of_iterations += 1
+
+            absolute_relative_error = self.calculate_absolute_relative_error(x_new, x)
+            self.count_operations(2 * self.n)
+
+            if self.record_steps:
+                self.add_step(
+                    self.iteration_step(matrix, x, x_new, absolute_relative_error)
+                )
+
+            x = x_new
+
+            # check convergence, an exact solution has no residual left to
+            # build the next direction from
+            converged = absolute_relative_error < self.absolute_relative_error or (
+                not np.any(self.residual)
+            )
+            if not converged:
+                self.update_direction()
+
+            self.lap()
+
+        execution_time = time.time() - start_time
+
+        if converged:
+            message = f"{self.method_name} method converged after {number_of_iterations} iterations (Absolute Relative Error: {self.absolute_relative_error})"
+        else:
+            message = f"{self.method_name} method did not converge within {maximum_number_of_iterations} iterations (Absolute Relative Error: {self.absolute_relative_error})"
+
+        return Result(
+            solution=x,
+            steps=self.steps,
+            number_of_iterations=number_of_iterations,
+            execution_time=execution_time,
+            message=message,
+        )
@@ -1,8 +1,12 @@
 from decimal import Decimal
-from typing import Tuple
+from typing import Callable, Optional, Tuple
 
 import numpy as np
+from equations_solver.matrix_history import MatrixHistory
+from equations_solver.parallel_elimination import ParallelElimination, parse_workers
+from equations_solver.result import Result
 from equations_solver.solver import Solver
+from equations_solver.step import Step
 from equations_solver.steps.row_operation_step import RowOperationStep
 from equations_solver.steps.substitution_step import SubstitutionStep
 
@@ -11,6 +15,12 @@ from equations_solver.steps.substitution_step import SubstitutionStep
 class EliminationSolver(Solver):
     scaling: bool  # whether to use scaling or not
     scaling_factors: np.ndarray  # scaling factors array
+    history: MatrixHistory  # history of the augmented matrix [A | b]
+    parallel_workers: int  # worker processes eliminating the Decimal rows
+    # the factors P A = L U the elimination computes, kept for the diagnostics
+    lower: np.ndarray  # L, the multipliers below the pivots
+    upper: np.ndarray  # U, every pivot row as it was when it became the pivot
+    permutation: np.ndarray  # the row of A every row came from
 
     def __init__(
         self,
@@ -18,14 +28,84 @@ class EliminationSolver(Solver):
         b: np.ndarray,
         precision,
         scaling,
+        numeric_backend: str = "decimal",
+        steps_mode: str = "full",
+        step_sink: Optional[Callable[[Step], None]] = None,
+        parallel_workers=None,
     ):
-        super().__init__(A, b, precision)
+        super().__init__(A, b, precision, numeric_backend, steps_mode, step_sink)
         self.scaling = scaling
+        self.parallel_workers = parse_workers(parallel_workers)
+
+    # the Decimal elimination is split between worker processes when asked for,
+    # float64 already updates all the rows at once with numpy
+    @property
+    def parallel(self) -> bool:
+        return self.parallel_workers > 1 and self.numeric_backend != "float64"
+
+    # the augmented matrix [A | b] spread over the worker processes
+    def start_parallel(self, A: np.ndarray, b: np.ndarray) -> ParallelElimination:
+        return ParallelElimination(np.column_stack([A, b]), self.parallel_workers)
+
+    # split the gathered augmented matrix back into A and b
+    def split(self, M: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return M[:, : self.n], M[:, self.n] if self.b.ndim == 1 else M[:, self.n :]
+
+    # the augmented matrix to record with the next operations, only gathered
+    # from the workers when the history keeps a keyframe of it
+    def parallel_blocks(
+        self, engine: ParallelElimination, operations: int = 1
+    ) -> Tuple[np.ndarray, ...]:
+        if self.history.keyframe_due(operations):
+            return (engine.gather(),)
+        return ()
+
+    # start keeping the factors of A when the diagnostics were asked for, they
+    # are float64 since the diagnostics are only estimates
+    def start_factors(self):
+        if self.diagnostics:
+            self.lower = np.eye(self.n)
+            self.upper = np.zeros((self.n, self.n))
+            self.permutation = np.arange(self.n)
+
+    # row k of U, the pivot row before it's used (or scaled by Gauss-Jordan)
+    def record_pivot_row(self, k: int, row: np.ndarray):
+        if self.diagnostics:
+            self.upper[k] = row[: self.n].astype(np.float64)
+
+    # the multipliers of the rows below the pivot row k, Gauss-Jordan also
+    # eliminates the rows above it, those aren't part of L
+    def record_multipliers(self, rows: np.ndarray, k: int, factors: np.ndarray):
+        if self.diagnostics:
+            below = rows > k
+            self.lower[rows[below], k] = factors[below].astype(np.float64)
+
+    # Gauss-Jordan's multipliers are of the pivot row after it's scaled by
+    # 1 / pivot, the ones in L are of the row before
+    def unscale_multipliers(self, k: int, pivot):
+        if self.diagnostics:
+            self.lower[k + 1 :, k] /= float(pivot)
+
+    def record_swap(self, k: int, pivot_index: int):
+        if self.diagnostics:
+            self.lower[[k, pivot_index], :k] = self.lower[[pivot_index, k], :k]
+            self.permutation[[k, pivot_index]] = self.permutation[[pivot_index, k]]
+
+    # add the diagnostics from the kept factors to the result
+    def diagnose_elimination(self, result: Result) -> Result:
+        if not self.diagnostics:
+            return result
+        return self.diagnose(
+            result, self.lower, self.upper, np.eye(self.n)[self.permutation]
+        )
+
+    # start recording the row operations applied to the augmented matrix [A | b]
+    def start_history(self, A: np.ndarray, b: np.ndarray):
+        if self.record_steps:
+            self.history = MatrixHistory(np.column_stack([A, b]))
 
     # eliminate the element in row i using the pivot row k
     def eliminate_row(self, A: np.ndarray, b: np.ndarray, i: int, k: int):
-        old_matrix = np.column_stack([A, b])
-
         factor = A[i, k] / A[k, k]
 
         # multiply pivot row by factor and subtract from current row
@@ -36,25 +116,96 @@ class EliminationSolver(Solver):
 
         b[i] -= factor * b[k]
 
-        new_matrix = np.column_stack([A, b])
+        # the factor, and a multiplication and a subtraction per value updated
+        self.count_operations(1 + 2 * (self.n - k - 1 + self.columns))
+
+        if self.diagnostics and i > k:
+            self.lower[i, k] = factor
+
+        if not self.record_steps:
+            return
+
+        new_matrix = self.history.add(A, b, target=i, source=k, multiplier=factor)
 
         # add elimination step
-        self.steps.append(RowOperationStep.add(old_matrix, new_matrix, i, k, -factor))
+        self.add_step(
+            RowOperationStep.add(new_matrix.previous(), new_matrix, i, k, -factor)
+        )
+
+    # eliminate the elements in all the given rows at once using the pivot row k,
+    # the float64 backend uses this instead of calling eliminate_row for each row
+    def eliminate_rows(self, A: np.ndarray, b: np.ndarray, rows: np.ndarray, k: int):
+        factors = A[rows, k] / A[k, k]
+
+        # subtract the scaled pivot row from all the rows in a single update
+        A[rows, k + 1 :] -= np.outer(factors, A[k, k + 1 :])
+        A[rows, k] = 0.0
+        b[rows] -= np.multiply.outer(factors, b[k])
+
+        self.record_multipliers(rows, k, factors)
+
+        if not self.record_steps:
+            return
+
+        # add an elimination step for each row, as if they were eliminated one by
+        # one, only the last one matches the current A and b
+        for index, (i, factor) in enumerate(zip(rows, factors)):
+            blocks = (A, b) if index == len(rows) - 1 else ()
+            new_matrix = self.history.add(
+                *blocks, target=int(i), source=k, multiplier=factor
+            )
+            self.add_step(
+                RowOperationStep.add(
+                    new_matrix.previous(), new_matrix, int(i), k, -factor
+                )
+            )
+
+    # eliminate_rows for the rows held by the worker processes, every row gets
+    # the same operations as with eliminate_row and the steps are recorded in
+    # the same order
+    def eliminate_rows_parallel(
+        self, engine: ParallelElimination, rows: np.ndarray, k: int
+    ):
+        factors = engine.eliminate(k, rows)
+
+        self.count_operations(len(rows) * (1 + 2 * (self.n - k - 1 + self.columns)))
+        self.record_multipliers(rows, k, factors)
+
+        if not self.record_steps or len(rows) == 0:
+            return
+
+        blocks = self.parallel_blocks(engine, len(rows))
+        for index, (i, factor) in enumerate(zip(rows, factors)):
+            last = index == len(rows) - 1
+            new_matrix = self.history.add(
+                *(blocks if last else ()), target=int(i), source=k, multiplier=factor
+            )
+            self.add_step(
+                RowOperationStep.add(
+                    new_matrix.previous(), new_matrix, int(i), k, -factor
+                )
+            )
 
     # back substitution to solve for x using the matrix A in row echelon form
     def back_substitution(self, A: np.ndarray, b: np.ndarray) -> np.ndarray:
-        x = np.full(self.n, +Decimal(0))
+        if self.numeric_backend == "float64":
+            x = self.back_substitution_float64(A, b)
+        else:
+            x = np.full(b.shape, +Decimal(0))
 
-        for i in range(self.n - 1, -1, -1):
-            x[i] = b[i]
-            for j in range(i + 1, self.n):
-                x[i] -= A[i, j] * x[j]
-            x[i] /= A[i, i]
+            for i in range(self.n - 1, -1, -1):
+                x[i] = b[i]
+                for j in range(i + 1, self.n):
+                    x[i] -= A[i, j] * x[j]
+                x[i] /= A[i, i]
 
-        matrix = np.column_stack([A, b])
+            self.count_substitution()
 
-        # add back substitution step
-        self.steps.append(SubstitutionStep.back(matrix, x))
+        if self.record_steps:
+            matrix = np.column_stack([A, b])
+
+            # add back substitution step
+            self.add_step(SubstitutionStep.back(matrix, x))
 
         return x
 
@@ -66,43 +217,73 @@ class EliminationSolver(Solver):
             s[i] = np.max(np.abs(A[i, :]))  # find the maximum absolute value in the row
         self.scaling_factors = s  # set the array of scaling factors
 
-    # find the pivot index using partial pivoting
-    def partial_pivot_index(self, A: np.ndarray, k: int) -> int:
-        return int(k + np.argmax(np.abs(A[k:, k])))
+    # find the pivot index using partial pivoting, column is A[:, k]
+    def partial_pivot_index(self, column: np.ndarray, k: int) -> int:
+        return int(k + np.argmax(np.abs(column[k:])))
 
-    # find the pivot index using scaled partial pivoting
-    def scaling_pivot_index(self, A: np.ndarray, k: int) -> int:
+    # find the pivot index using scaled partial pivoting, column is A[:, k]
+    def scaling_pivot_index(self, column: np.ndarray, k: int) -> int:
         ratios = (
-            np.abs(A[k:, k]) / self.scaling_factors[k:]
+            np.abs(column[k:]) / self.scaling_factors[k:]
         )  # calculate the ratio of the absolute value of the pivot element to the scaling factor for each row
         pivot_index = k + np.argmax(ratios)  # find the index of the maximum ratio
         return int(pivot_index)  # return the index of the pivot row
 
+    def pivot_index(self, column: np.ndarray, k: int) -> int:
+        # choose pivoting method
+        if self.scaling:
+            return self.scaling_pivot_index(column, k)
+        return self.partial_pivot_index(column, k)
+
     def pivot(
         self, A: np.ndarray, b: np.ndarray, k: int
     ) -> Tuple[np.ndarray, np.ndarray]:
-        # choose pivoting method
-        if self.scaling:
-            pivot_index = self.scaling_pivot_index(A, k)
-        else:
-            pivot_index = self.partial_pivot_index(A, k)
+        pivot_index = self.pivot_index(A[:, k], k)
 
         # if the pivot row is not the current row, swap them
         if pivot_index != k:
-            old_matrix = np.column_stack([A, b])
             A[[k, pivot_index]] = A[[pivot_index, k]]
             b[[k, pivot_index]] = b[[pivot_index, k]]
+            self.record_swap(k, int(pivot_index))
             if self.scaling:
                 self.scaling_factors[[k, pivot_index]] = self.scaling_factors[
                     [pivot_index, k]
                 ]
 
-            new_matrix = np.column_stack([A, b])
+            if self.record_steps:
+                new_matrix = self.history.swap(A, b, r1=k, r2=int(pivot_index))
 
-            # add row swap step
-            self.steps.append(
-                RowOperationStep.swap(old_matrix, new_matrix, k, int(pivot_index))
-            )
+                # add row swap step
+                self.add_step(
+                    RowOperationStep.swap(
+                        new_matrix.previous(), new_matrix, k, int(pivot_index)
+                    )
+                )
 
         # returning the updated A and b
         return A, b
+
+    # pivot for the rows held by the worker processes, returns column k after
+    # the swap
+    def pivot_parallel(self, engine: ParallelElimination, k: int) -> np.ndarray:
+        pivot_index = self.pivot_index(engine.column(k), k)
+
+        if pivot_index != k:
+            engine.swap(k, pivot_index)
+            self.record_swap(k, pivot_index)
+            if self.scaling:
+                self.scaling_factors[[k, pivot_index]] = self.scaling_factors[
+                    [pivot_index, k]
+                ]
+
+            if self.record_steps:
+                new_matrix = self.history.swap(
+                    *self.parallel_blocks(engine), r1=k, r2=pivot_index
+                )
+                self.add_step(
+                    RowOperationStep.swap(
+                        new_matrix.previous(), new_matrix, k, pivot_index
+                    )
+                )
+
+        return engine.column(k)
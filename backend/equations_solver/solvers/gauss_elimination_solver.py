@@ -1,17 +1,24 @@
 import time
 
+import numpy as np
 from equations_solver.result import Result
 from equations_solver.solvers.elimination_solver import EliminationSolver
 
 
 class GaussEliminationSolver(EliminationSolver):
     def solve(self) -> Result:
+        if self.parallel:
+            return self._solve_parallel()
+
         start_time = time.time()
 
         A = self.A.copy()
         b = self.b.copy()
         n = self.n
 
+        self.start_history(A, b)
+        self.start_factors()
+
         if self.scaling:
             self.calculating_scaling_values(A)
 
@@ -24,6 +31,13 @@ class GaussEliminationSolver(EliminationSolver):
                     execution_time=time.time() - start_time,
                 )
 
+            self.record_pivot_row(k, A[k])
+
+            if self.numeric_backend == "float64":
+                rows = k + 1 + np.flatnonzero(np.abs(A[k + 1 :, k]) >= 1e-12)
+                self.eliminate_rows(A, b, rows, k)
+                continue
+
             for i in range(k + 1, n):
                 if abs(A[i, k]) < 1e-12:
                     continue
@@ -36,14 +50,69 @@ class GaussEliminationSolver(EliminationSolver):
                 execution_time=time.time() - start_time,
             )
 
+        self.record_pivot_row(n - 1, A[n - 1])
+
+        # Back substitution using base methods
+        x = self.back_substitution(A, b)
+
+        execution_time = time.time() - start_time
+
+        result = Result(
+            solution=x,
+            steps=self.steps,
+            execution_time=execution_time,
+            message="Solution found using Gauss Elimination.",
+        )
+        return self.diagnose_elimination(result)
+
+    # the same elimination with the rows below every pivot split between worker
+    # processes
+    def _solve_parallel(self) -> Result:
+        start_time = time.time()
+
+        n = self.n
+
+        self.start_history(self.A, self.b)
+        self.start_factors()
+
+        if self.scaling:
+            self.calculating_scaling_values(self.A)
+
+        with self.start_parallel(self.A, self.b) as engine:
+            for k in range(n - 1):
+                column = self.pivot_parallel(engine, k)
+
+                if abs(column[k]) < 1e-12:
+                    return Result(
+                        message="System doesn't have a unique solution.",
+                        execution_time=time.time() - start_time,
+                    )
+
+                if self.diagnostics:
+                    self.record_pivot_row(k, engine.row(k))
+
+                rows = k + 1 + np.flatnonzero(np.abs(column[k + 1 :]) >= 1e-12)
+                self.eliminate_rows_parallel(engine, rows, k)
+
+            if abs(engine.column(n - 1)[n - 1]) < 1e-12:
+                return Result(
+                    message="System doesn't have a unique solution.",
+                    execution_time=time.time() - start_time,
+                )
+
+            A, b = self.split(engine.gather())
+
+        self.record_pivot_row(n - 1, A[n - 1])
+
         # Back substitution using base methods
         x = self.back_substitution(A, b)
 
         execution_time = time.time() - start_time
 
-        return Result(
+        result = Result(
             solution=x,
             steps=self.steps,
             execution_time=execution_time,
             message="Solution found using Gauss Elimination.",
         )
+        return self.diagnose_elimination(result)
@@ -1,5 +1,4 @@
 import time
-from decimal import Decimal
 
 import numpy as np
 from equations_solver.solvers.elimination_solver import EliminationSolver
@@ -9,12 +8,18 @@ from equations_solver.result import Result
 
 class GaussJordanEliminationSolver(EliminationSolver):
     def solve(self) -> Result:
+        if self.parallel:
+            return self._solve_parallel()
+
         start_time = time.time()
 
         A = self.A.copy()
         b = self.b.copy()
         n = self.n
 
+        self.start_history(A, b)
+        self.start_factors()
+
         if self.scaling:
             self.calculating_scaling_values(A)
 
@@ -29,24 +34,37 @@ class GaussJordanEliminationSolver(EliminationSolver):
                     execution_time=time.time() - start_time,
                 )
 
-            old_matrix = np.column_stack([A, b])
+            self.record_pivot_row(k, A[k])
 
             # scale row to make the pivot equal to 1
 
             pivot = A[k, k]
-            for j in range(n):
-                A[k, j] = A[k, j] / pivot
+            if self.numeric_backend == "float64":
+                A[k] /= pivot
+            else:
+                for j in range(n):
+                    A[k, j] = A[k, j] / pivot
             b[k] = b[k] / pivot
+            self.count_operations(n + self.columns)
 
-            new_matrix = np.column_stack([A, b])
+            if self.record_steps:
+                new_matrix = self.history.scale(A, b, row=k, divisor=pivot)
 
-            # add scaling step
+                # add scaling step
 
-            self.steps.append(
-                RowOperationStep.scale(old_matrix, new_matrix, k, +Decimal(1) / pivot)
-            )
+                self.add_step(
+                    RowOperationStep.scale(
+                        new_matrix.previous(), new_matrix, k, 1 / pivot
+                    )
+                )
 
             # eliminate all other rows
+            if self.numeric_backend == "float64":
+                rows = np.flatnonzero(np.abs(A[:, k]) >= 1e-12)
+                self.eliminate_rows(A, b, rows[rows != k], k)
+                self.unscale_multipliers(k, pivot)
+                continue
+
             for i in range(n):
                 if i != k:
                     if abs(A[i, k]) < 1e-12:
@@ -54,11 +72,71 @@ class GaussJordanEliminationSolver(EliminationSolver):
 
                     self.eliminate_row(A, b, i, k)
 
+            self.unscale_multipliers(k, pivot)
+
+        execution_time = time.time() - start_time
+
+        result = Result(
+            solution=b,
+            steps=self.steps,
+            execution_time=execution_time,
+            message="Solution found using Gauss-Jordan Elimination.",
+        )
+        return self.diagnose_elimination(result)
+
+    # the same elimination with the rows above and below every pivot split
+    # between worker processes
+    def _solve_parallel(self) -> Result:
+        start_time = time.time()
+
+        n = self.n
+
+        self.start_history(self.A, self.b)
+        self.start_factors()
+
+        if self.scaling:
+            self.calculating_scaling_values(self.A)
+
+        with self.start_parallel(self.A, self.b) as engine:
+            for k in range(n):
+                column = self.pivot_parallel(engine, k)
+
+                if abs(column[k]) < 1e-12:
+                    return Result(
+                        message="System doesn't have a unique solution.",
+                        execution_time=time.time() - start_time,
+                    )
+
+                # scale row to make the pivot equal to 1, b's values included
+                pivot = column[k]
+                row = engine.row(k)
+                self.record_pivot_row(k, row)
+                engine.set_row(k, row / pivot)
+                self.count_operations(len(row))
+
+                if self.record_steps:
+                    new_matrix = self.history.scale(
+                        *self.parallel_blocks(engine), row=k, divisor=pivot
+                    )
+                    self.add_step(
+                        RowOperationStep.scale(
+                            new_matrix.previous(), new_matrix, k, 1 / pivot
+                        )
+                    )
+
+                # eliminate all other rows
+                rows = np.flatnonzero(np.abs(column) >= 1e-12)
+                self.eliminate_rows_parallel(engine, rows[rows != k], k)
+                self.unscale_multipliers(k, pivot)
+
+            _, b = self.split(engine.gather())
+
         execution_time = time.time() - start_time
 
-        return Result(
+        result = Result(
             solution=b,
             steps=self.steps,
             execution_time=execution_time,
             message="Solution found using Gauss-Jordan Elimination.",
         )
+        return self.diagnose_elimination(result)
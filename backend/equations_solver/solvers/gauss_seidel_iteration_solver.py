@@ -1,38 +1,93 @@
+from decimal import Decimal
+
 import numpy as np
 from equations_solver.solvers.iteration_solver import IterationSolver
+from equations_solver.sparse_matrix import CSRMatrix
 from equations_solver.steps.iteration_step import IterationStep
 
 
 class GaussSeidelIterationSolver(IterationSolver):
+    diagonal: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    off_diagonal: CSRMatrix
+
+    # the weight of the new values against the old ones, Gauss-Seidel takes the
+    # new values as they are, SOR (a subclass) over-relaxes them
+    omega = 1
+
     @property
     def method_name(self) -> str:
         return "Gauss-Seidel Iteration"
 
+    def prepare(self, A: np.ndarray, b: np.ndarray):
+        self.diagonal = A.diagonal().copy()
+        if self.sparse:
+            self.off_diagonal = A.off_diagonal()
+            return
+
+        # A = L + D + U, with L and U strictly lower and upper triangular
+        self.lower = np.tril(A, -1)
+        self.upper = np.triu(A, 1)
+
+    # the operations of an iteration beyond the products with the parts of A,
+    # a subtraction and a division for every row, and three more to relax it
+    def row_operations(self) -> int:
+        return self.n * (2 if self.omega == 1 else 5)
+
     def iterate(self, A: np.ndarray, b: np.ndarray, x: np.ndarray) -> np.ndarray:
-        # copy current solution and we will update it in place, so we that we
-        # always use the most recent values
-        x_new = x.copy()
+        if self.sparse:
+            return self.iterate_sparse(b, x)
 
-        for i in range(self.n):
-            x_new[i] = b[i]
+        # the upper part, and the first i values of the lower part for row i
+        self.count_operations(
+            2 * self.entries(self.upper) + self.n * (self.n - 1) + self.row_operations()
+        )
 
-            for j in range(self.n):
-                if j != i:
-                    x_new[i] -= A[i, j] * x_new[j]
+        # the upper part only multiplies old x values, so it's done for all the
+        # rows at once, the lower part uses the values of this iteration as soon
+        # as they are computed: (L + D) x_new = b - U x
+        c = b - self.upper @ x
 
-            x_new[i] /= A[i, i]
+        omega = self.omega
+        keep = 1 - omega
 
-        # add iteration step
+        x_new = x.copy()
+        for i in range(self.n):
+            value = (c[i] - self.lower[i, :i] @ x_new[:i]) / self.diagonal[i]
+            x_new[i] = value if omega == 1 else keep * x[i] + omega * value
+
+        return x_new
+
+    # one sweep over the rows of a CSR matrix, updating x in place so every row
+    # uses the values of this iteration for the rows before it
+    def iterate_sparse(self, b: np.ndarray, x: np.ndarray) -> np.ndarray:
+        row_pointers = self.off_diagonal.row_pointers
+        column_indices = self.off_diagonal.column_indices
+        values = self.off_diagonal.values
 
-        matrix = np.column_stack((A, b))
+        omega = self.omega
+        keep = 1 - omega
 
-        self.steps.append(
-            IterationStep.gauss_seidel(
-                matrix,
-                x.copy(),
-                x_new.copy(),
-                self.calculate_absolute_relative_error(x_new, x),
-            )
+        self.count_operations(
+            2 * self.entries(self.off_diagonal) + self.row_operations()
         )
 
+        x_new = x.copy()
+        for i in range(self.n):
+            start, stop = row_pointers[i], row_pointers[i + 1]
+            value = (
+                b[i] - values[start:stop] @ x_new[column_indices[start:stop]]
+            ) / self.diagonal[i]
+            x_new[i] = value if omega == 1 else keep * x[i] + omega * value
+
         return x_new
+
+    def iteration_step(
+        self,
+        matrix: np.ndarray,
+        x_old: np.ndarray,
+        x_new: np.ndarray,
+        absolute_relative_error: Decimal,
+    ) -> IterationStep:
+        return IterationStep.gauss_seidel(matrix, x_old, x_new, absolute_relative_error)
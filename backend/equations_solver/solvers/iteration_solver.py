@@ -1,10 +1,14 @@
 import time
 from abc import abstractmethod
 from decimal import Decimal
+from typing import Callable, Optional
 
 import numpy as np
 from equations_solver.result import Result
 from equations_solver.solver import Solver
+from equations_solver.sparse_matrix import CSRMatrix
+from equations_solver.step import Step
+from equations_solver.steps.iteration_step import IterationStep
 from exceptions import ValidationError
 
 
@@ -22,8 +26,11 @@ class IterationSolver(Solver):
         initial_guess,
         number_of_iterations,
         absolute_relative_error,
+        numeric_backend: str = "decimal",
+        steps_mode: str = "full",
+        step_sink: Optional[Callable[[Step], None]] = None,
     ):
-        super().__init__(A, b, precision)
+        super().__init__(A, b, precision, numeric_backend, steps_mode, step_sink)
 
         self.number_of_iterations = number_of_iterations
         self.absolute_relative_error = Decimal(absolute_relative_error)
@@ -37,31 +44,38 @@ class IterationSolver(Solver):
         else:
             self.x0 = np.full(self.n, +Decimal(0))
 
+        if numeric_backend == "float64":
+            self.x0 = self.x0.astype(np.float64)
+
+    # whether A is a sparse (CSR) matrix, the iterations then only go over its
+    # nonzeros
+    @property
+    def sparse(self) -> bool:
+        return isinstance(self.A, CSRMatrix)
+
     # calculate absolute relative error for convergence checking
     @staticmethod
     def calculate_absolute_relative_error(
         x_new: np.ndarray, x_old: np.ndarray
     ) -> Decimal:
         # make sure we don't divide by zero
-        denominator = np.vectorize(lambda x: max(abs(x), Decimal("1e-10")))(
-            np.abs(x_new)
-        )
+        smallest = Decimal("1e-10") if x_new.dtype == object else 1e-10
+        denominator = np.maximum(np.abs(x_new), smallest)
         return np.max(np.abs(x_new - x_old) / denominator)
 
+    # the stored values of a part of A, a product with it takes a
+    # multiplication and an addition for every one of them
+    @staticmethod
+    def entries(M) -> int:
+        return M.nnz if isinstance(M, CSRMatrix) else M.size
+
     # check if the coefficients matrix is diagonally dominant
     def check_diagonal_dominance(self) -> bool:
-        # keep track if at least one row is strictly diagonally dominant
-        at_least_one_strict = False
-
-        for i in range(self.n):
-            row_sum = np.sum(np.abs(self.A[i, :])) - np.abs(self.A[i, i])
-            if np.abs(self.A[i, i]) < row_sum:
-                # the inequality is not satisfied for this row
-                return False
-            elif np.abs(self.A[i, i]) > row_sum:
-                # this row is strictly diagonally dominant
-                at_least_one_strict = True
-        return at_least_one_strict
+        diagonal = np.abs(self.A.diagonal())
+        row_sums = abs(self.A).sum(axis=1) - diagonal
+
+        # the inequality has to hold for every row, and strictly for at least one
+        return bool(np.all(diagonal >= row_sums) and np.any(diagonal > row_sums))
 
     # the user facing name of the method, to be implemented by subclasses
     @property
@@ -69,11 +83,28 @@ class IterationSolver(Solver):
     def method_name(self) -> str:
         pass
 
-    # perform a single iteration, to be implemented by subclasses
+    # split A into the parts the iterations use, called once before the first
+    # iteration so they aren't rebuilt every time
+    def prepare(self, A: np.ndarray, b: np.ndarray):
+        pass
+
+    # perform a single iteration, returning the new x (x itself is left as is),
+    # to be implemented by subclasses
     @abstractmethod
     def iterate(self, A: np.ndarray, b: np.ndarray, x: np.ndarray) -> np.ndarray:
         pass
 
+    # the step recorded for an iteration, to be implemented by subclasses
+    @abstractmethod
+    def iteration_step(
+        self,
+        matrix: np.ndarray,
+        x_old: np.ndarray,
+        x_new: np.ndarray,
+        absolute_relative_error: Decimal,
+    ) -> IterationStep:
+        pass
+
     def solve(self) -> Result:
         start_time = time.time()
 
@@ -85,10 +116,8 @@ class IterationSolver(Solver):
         # check if there is any zero diagonal element, since iterative
         # methods can't work in that case
 
-        zero_diagonals = []
-        for i in range(n):
-            if abs(A[i, i]) < 1e-12:
-                zero_diagonals.append(i + 1)
+        diagonal = A.diagonal()
+        zero_diagonals = [i + 1 for i in range(n) if abs(diagonal[i]) < 1e-12]
 
         if zero_diagonals:
             return Result(
@@ -105,15 +134,41 @@ class IterationSolver(Solver):
         number_of_iterations = 0
         maximum_number_of_iterations = self.number_of_iterations
 
+        self.prepare(A, b)
+
+        # the augmented matrix shown in the steps is the same in every iteration,
+        # it's left out of the steps of sparse systems, which can be too big
+        if self.record_steps and not self.sparse:
+            matrix = np.column_stack((A, b))
+        else:
+            matrix = None
+
+        self.start_iterations()
+
         # iterate until we reach maximum number of iterations specified
         for _ in range(maximum_number_of_iterations):
             # do an iteration
-            x_new = self.iterate(A, b, x)
+            with np.errstate(all="ignore"):
+                x_new = self.iterate(A, b, x)
 
             number_of_iterations += 1
 
-            # calculate absolute relative error
-            absolute_relative_error = self.calculate_absolute_relative_error(x_new, x)
+            # calculate absolute relative error, once for the convergence check
+            # and the step
+            with np.errstate(all="ignore"):
+                absolute_relative_error = self.calculate_absolute_relative_error(
+                    x_new, x
+                )
+
+            # a subtraction and a division for every value
+            self.count_operations(2 * n)
+
+            if self.record_steps:
+                self.add_step(
+                    self.iteration_step(matrix, x, x_new, absolute_relative_error)
+                )
+
+            self.lap()
 
             # check convergence
             if absolute_relative_error < self.absolute_relative_error:
@@ -128,7 +183,7 @@ class IterationSolver(Solver):
                     message=f"{warning_message} {self.method_name} method converged after {number_of_iterations} iterations (Absolute Relative Error: {self.absolute_relative_error})",
                 )
 
-            x = x_new.copy()
+            x = x_new
 
         execution_time = time.time() - start_time
 
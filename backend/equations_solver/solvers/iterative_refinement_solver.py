@@ -0,0 +1,188 @@
+import time
+from decimal import Decimal
+from typing import Callable, Optional
+
+import numpy as np
+from equations_solver.result import Result
+from equations_solver.solver import Solver
+from equations_solver.solvers.lu_decomposition_solver import LUDecompositionSolver
+from equations_solver.step import Step
+from equations_solver.steps.iteration_step import IterationStep
+
+
+# mixed precision iterative refinement: A is factorized once in float64 (the
+# O(n^3) part), then x is corrected with x += d, A d = b - Ax, where the
+# residual is computed in Decimal at the requested precision and d is solved
+# with the float64 factors (O(n^2) per refinement)
+#
+# every refinement divides the error by about cond(A) * 1e-16, until it gets
+# down to what the precision can hold, when it doesn't (A is too ill-conditioned
+# for the float64 factors) the system is solved with the Decimal doolittle LU
+# decomposition instead
+class IterativeRefinementSolver(Solver):
+    number_of_iterations: int  # the maximum number of refinements
+    absolute_relative_error: Decimal  # ||d|| / ||x|| to stop at
+
+    def __init__(
+        self,
+        A: np.ndarray,
+        b: np.ndarray,
+        precision,
+        number_of_iterations=20,
+        absolute_relative_error=None,
+        steps_mode: str = "full",
+        step_sink: Optional[Callable[[Step], None]] = None,
+    ):
+        super().__init__(A, b, precision, "decimal", steps_mode, step_sink)
+
+        self.number_of_iterations = number_of_iterations
+        if absolute_relative_error is None:
+            self.absolute_relative_error = Decimal(10) ** -precision
+        else:
+            self.absolute_relative_error = Decimal(absolute_relative_error)
+
+    # the doolittle factors of A in float64, None if A is singular (in float64)
+    def factorize(self):
+        A = self.A.astype(np.float64)
+        if not np.all(np.isfinite(A)):
+            return None
+
+        return LUDecompositionSolver.factorize_doolittle_blocked(A)
+
+    # the solution of A d = r with the float64 factors, as Decimals
+    def correction(self, factors, residual: np.ndarray) -> np.ndarray:
+        L, U, P = factors
+        y = self.forward_substitution_float64(L, P @ residual.astype(np.float64))
+        d = self.back_substitution_float64(U, y)
+        return np.array([+Decimal(value) for value in d], dtype=Decimal)
+
+    # ||d|| / ||x||, with the largest components
+    @staticmethod
+    def relative_correction(d: np.ndarray, x: np.ndarray) -> Decimal:
+        norm = np.max(np.abs(x))
+        if norm == 0:
+            return np.max(np.abs(d))
+        return np.max(np.abs(d)) / norm
+
+    def solve(self) -> Result:
+        start_time = time.time()
+
+        A = self.A
+        b = self.b
+
+        factors = self.factorize()
+        if factors is None:
+            return self.fall_back(start_time, 0, "A is singular in float64")
+
+        # the augmented matrix shown in the steps
+        matrix = np.column_stack((A, b)) if self.record_steps else None
+
+        # the float64 solution is the starting point
+        x = self.correction(factors, b)
+        residual = b - A @ x
+
+        number_of_iterations = 0
+        # the relative correction of the previous refinement, the float64
+        # solution itself is a correction of all of x
+        previous = Decimal(1)
+        contracted = False  # whether a refinement made x more accurate
+        converged = not np.any(residual)
+
+        self.start_iterations()
+
+        while not converged and number_of_iterations < self.number_of_iterations:
+            d = self.correction(factors, residual)
+            if not all(value.is_finite() for value in d):
+                break
+
+            x_new = x + d
+            residual = b - A @ x_new
+            number_of_iterations += 1
+
+            absolute_relative_error = self.relative_correction(d, x_new)
+
+            # x + d and its residual in Decimal, the correction is float64
+            self.count_operations(2 * A.size + 2 * self.n)
+
+            if self.record_steps:
+                self.add_step(
+                    IterationStep.iterative_refinement(
+                        matrix,
+                        x,
+                        x_new,
+                        absolute_relative_error,
+                        np.sqrt(residual @ residual),
+                    )
+                )
+
+            x = x_new
+            self.lap()
+
+            if absolute_relative_error < self.absolute_relative_error or not np.any(
+                residual
+            ):
+                converged = True
+
+            # the corrections stopped shrinking: once they have been shrinking,
+            # they are down to the rounding of the residuals and x is as
+            # accurate as the precision allows, if they never did, the float64
+            # factors are too far off for A
+            elif absolute_relative_error > previous / 2:
+                converged = contracted
+                break
+
+            contracted = True
+            previous = absolute_relative_error
+
+        if not converged:
+            if number_of_iterations < self.number_of_iterations:
+                reason = "the corrections didn't converge, A is too ill-conditioned for float64"
+            else:
+                reason = "the maximum number of refinements was reached"
+            return self.fall_back(start_time, number_of_iterations, reason)
+
+        execution_time = time.time() - start_time
+
+        result = Result(
+            solution=x,
+            steps=self.steps,
+            number_of_iterations=number_of_iterations,
+            execution_time=execution_time,
+            message=f"Iterative refinement converged after {number_of_iterations} refinements (Absolute Relative Error: {self.absolute_relative_error})",
+        )
+        return self.diagnose(result, *factors)
+
+    # solve the system with the Decimal doolittle LU decomposition, after the
+    # refinement steps made so far
+    def fall_back(
+        self, start_time: float, number_of_iterations: int, reason: str
+    ) -> Result:
+        lu = LUDecompositionSolver(
+            self.A,
+            self.b,
+            self.precision,
+            "doolittle",
+            None,
+            "decimal",
+            self.steps_mode,
+            self.step_sink,
+        )
+        lu.diagnostics = self.diagnostics
+        lu.profile = self.profile
+        result = lu.solve()
+        self.steps.extend(lu.steps)
+
+        execution_time = time.time() - start_time
+
+        if result.solution is None:
+            return Result(message=result.message, execution_time=execution_time)
+
+        fallback = Result(
+            solution=result.solution,
+            steps=self.steps,
+            number_of_iterations=number_of_iterations,
+            execution_time=execution_time,
+            message=f"Iterative refinement stopped after {number_of_iterations} refinements ({reason}), solved with Decimal doolittle LU decomposition instead.",
+        )
+        fallback.diagnostics = result.diagnostics
+        return fallback
@@ -1,39 +1,41 @@
 from decimal import Decimal
+from typing import Union
 
 import numpy as np
 from equations_solver.solvers.iteration_solver import IterationSolver
+from equations_solver.sparse_matrix import CSRMatrix
 from equations_solver.steps.iteration_step import IterationStep
 
 
 class JacobiIterationSolver(IterationSolver):
+    diagonal: np.ndarray
+    remainder: Union[np.ndarray, CSRMatrix]
+
     @property
     def method_name(self) -> str:
         return "Jacobi Iteration"
 
-    def iterate(self, A: np.ndarray, b: np.ndarray, x: np.ndarray) -> np.ndarray:
-        # the new x values, computed using only the old x values
-        x_new = np.full(self.n, +Decimal(0))
-
-        for i in range(self.n):
-            x_new[i] = b[i]
-
-            for j in range(self.n):
-                if j != i:
-                    x_new[i] -= A[i, j] * x[j]
-
-            x_new[i] /= A[i, i]
+    def prepare(self, A: np.ndarray, b: np.ndarray):
+        # A = D + R, where D is the diagonal of A
+        self.diagonal = A.diagonal().copy()
+        if self.sparse:
+            self.remainder = A.off_diagonal()
+        else:
+            self.remainder = A.copy()
+            np.fill_diagonal(self.remainder, 0)
 
-        matrix = np.column_stack((A, b))
-
-        # add iteration step
-
-        self.steps.append(
-            IterationStep.jacobi(
-                matrix,
-                x.copy(),
-                x_new.copy(),
-                self.calculate_absolute_relative_error(x_new, x),
-            )
-        )
-
-        return x_new
+    def iterate(self, A: np.ndarray, b: np.ndarray, x: np.ndarray) -> np.ndarray:
+        # the new x values, computed using only the old x values: D^-1 (b - Rx),
+        # dividing by the diagonal instead of multiplying by its inverse saves a
+        # rounding for the Decimal backend
+        self.count_operations(2 * self.entries(self.remainder) + 2 * self.n)
+        return (b - self.remainder @ x) / self.diagonal
+
+    def iteration_step(
+        self,
+        matrix: np.ndarray,
+        x_old: np.ndarray,
+        x_new: np.ndarray,
+        absolute_relative_error: Decimal,
+    ) -> IterationStep:
+        return IterationStep.jacobi(matrix, x_old, x_new, absolute_relative_error)
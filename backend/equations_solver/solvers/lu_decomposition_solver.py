@@ -1,9 +1,14 @@
 import time
 from decimal import Decimal
+from typing import Callable, Optional, Tuple
 
 import numpy as np
+from equations_solver.factorization_cache import Factorization
+from equations_solver.matrix_history import MatrixHistory
+from equations_solver.parallel_elimination import ParallelElimination, parse_workers
 from equations_solver.result import Result
 from equations_solver.solver import Solver
+from equations_solver.step import Step
 from equations_solver.steps.cholesky_decomposition_step import CholeskyDecompositionStep
 from equations_solver.steps.crout_decomposition_step import CroutDecompositionStep
 from equations_solver.steps.row_operation_step import RowOperationStep
@@ -12,30 +17,310 @@ from equations_solver.steps.substitution_step import SubstitutionStep
 from exceptions import ValidationError
 
 
+# the default number of columns factorized together by the blocked float64
+# decompositions, systems up to this size are factorized one column at a time
+BLOCK_SIZE = 64
+
+MESSAGES = {
+    "doolittle": "Solution found using doolittle LU decomposition.",
+    "crout": "Solution found using Crout LU Decomposition.",
+    "cholesky": "Solution found using Cholesky LU Decomposition.",
+}
+
+
 class LUDecompositionSolver(Solver):
+    # the factorization of A, either given (A was factorized by an earlier
+    # request, A itself can then be None) or the one made by solve
+    factorization: Optional[Factorization]
+
     def __init__(
         self,
-        A: np.ndarray,
+        A: Optional[np.ndarray],
         b: np.ndarray,
         precision,
         format,
+        block_size=None,
+        numeric_backend: str = "decimal",
+        steps_mode: str = "full",
+        step_sink: Optional[Callable[[Step], None]] = None,
+        factorization: Optional[Factorization] = None,
+        parallel_workers=None,
     ):
-        super().__init__(A, b, precision)
+        super().__init__(A, b, precision, numeric_backend, steps_mode, step_sink)
         self.format = format.lower()
+        self.factorization = factorization
+        self._factorization_id = None
+        self.parallel_workers = parse_workers(parallel_workers)
+
+        self.block_size = BLOCK_SIZE
+        if block_size is not None:
+            try:
+                self.block_size = int(str(block_size))
+            except ValueError:
+                self.block_size = 0
+            if self.block_size < 1:
+                raise ValidationError(
+                    f"Block size must be a positive integer. Found: '{block_size}'"
+                )
+
+    # digest of A, format, precision and backend, identifies the factorization
+    @property
+    def factorization_id(self) -> str:
+        if self.factorization is not None:
+            return self.factorization.factorization_id
+        if self._factorization_id is None:
+            self._factorization_id = Factorization.key(
+                self.A, self.format, self.precision, self.numeric_backend
+            )
+        return self._factorization_id
 
     def solve(self) -> Result:
+        float64 = self.numeric_backend == "float64"
+
+        if self.format not in MESSAGES:
+            raise ValidationError(f"Unknown LU Decomposition format: {self.format}")
+
+        # A is already factorized, only the substitution is left
+        if self.factorization is not None:
+            result = self._solve_factorized()
+
+        # large systems are factorized a block of columns at a time when there
+        # are no steps to record (the steps are operations on single rows)
+        elif float64 and not self.record_steps and self.n > self.block_size:
+            result = self._solve_blocked()
+
         # choose method based on format
-        if self.format == "doolittle":
-            return self._solve_doolittle()
+        elif self.format == "doolittle":
+            if float64:
+                result = self._solve_doolittle_float64()
+            elif self.parallel_workers > 1:
+                result = self._solve_doolittle_parallel()
+            else:
+                result = self._solve_doolittle()
 
         elif self.format == "crout":
-            return self._solve_crout()
+            if float64:
+                result = self._solve_crout_float64()
+            else:
+                result = self._solve_crout()
 
-        elif self.format == "cholesky":
-            return self._solve_cholesky()
+        else:
+            if float64:
+                result = self._solve_cholesky_float64()
+            else:
+                result = self._solve_cholesky()
+
+        if result.solution is not None and self.factorization is None:
+            self.factorization = Factorization(
+                self.factorization_id,
+                self.format,
+                self.numeric_backend,
+                self.precision,
+                result.L,
+                result.U,
+                result.P,
+            )
+        return self.diagnose(result, result.L, result.U, result.P)
 
+    def _solve_factorized(self) -> Result:
+        start_time = time.time()
+        b = self.b.copy()
+        L, U, P = self.factorization.L, self.factorization.U, self.factorization.P
+
+        if self.record_steps:
+            matrices = {"L": L, "U": U}
+            if P is not None:
+                matrices["P"] = P
+            self.add_step(ShowMatricesStep(matrices))
+
+        if self.numeric_backend == "float64":
+            x = self._substitute_float64(L, U, b if P is None else P @ b)
+        elif self.format == "doolittle":
+            x = self._substitute_doolittle(L, U, P, b)
+        elif self.format == "crout":
+            x = self._substitute_crout(L, U, b)
         else:
-            raise ValidationError(f"Unknown LU Decomposition format: {self.format}")
+            x = self._substitute_cholesky(L, b)
+
+        execution_time = time.time() - start_time
+
+        result = Result(
+            solution=x,
+            steps=self.steps,
+            execution_time=execution_time,
+            message=f"{MESSAGES[self.format][:-1]}, reusing the stored factorization of A.",
+        )
+        result.L = L
+        result.U = U
+        result.P = P
+
+        return result
+
+    def _solve_blocked(self) -> Result:
+        start_time = time.time()
+        A = self.A.copy()
+        b = self.b.copy()
+
+        if self.format == "cholesky":
+            if not self.is_symmetric(A):
+                return Result(
+                    message="Coefficients matrix is not symmetric.",
+                    execution_time=time.time() - start_time,
+                )
+            factors = self._factorize_cholesky_blocked(A)
+            failure = "Coefficients matrix is not positive definite."
+        elif self.format == "crout":
+            factors = self._factorize_crout_blocked(A)
+            failure = "System doesn't have a unique solution."
+        else:
+            factors = self.factorize_doolittle_blocked(A, self.block_size)
+            failure = "System doesn't have a unique solution."
+
+        if factors is None:
+            return Result(message=failure, execution_time=time.time() - start_time)
+
+        L, U, P = factors
+        x = self._substitute_float64(L, U, b if P is None else P @ b)
+
+        execution_time = time.time() - start_time
+
+        result = Result(
+            solution=x,
+            steps=self.steps,
+            execution_time=execution_time,
+            message=MESSAGES[self.format],
+        )
+        result.L = L
+        result.U = U
+        result.P = P
+
+        return result
+
+    # right-looking blocked LU with partial pivoting, U starts as a copy of A:
+    # the columns of a block (the panel) are eliminated one by one like in
+    # _solve_doolittle_float64 but only within the panel, then the block's rows
+    # of U right of the panel are solved from L11 U12 = A12, and the rest of the
+    # matrix gets all the panel's eliminations at once with a matrix product,
+    # which is where almost all the work goes, None if A is singular, used by
+    # the other solvers that need float64 factors of A too
+    @staticmethod
+    def factorize_doolittle_blocked(
+        U: np.ndarray, block_size: int = BLOCK_SIZE
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        n = U.shape[0]
+        L = np.eye(n)
+        P = np.eye(n)
+
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+
+            for k in range(start, stop):
+                # the swaps are applied to the whole rows
+                max_idx = int(k + np.argmax(np.abs(U[k:, k])))
+                if max_idx != k:
+                    L[[k, max_idx], :k] = L[[max_idx, k], :k]
+                    U[[k, max_idx]] = U[[max_idx, k]]
+                    P[[k, max_idx]] = P[[max_idx, k]]
+
+                if abs(U[k, k]) < 1e-12:
+                    return None
+
+                rows = k + 1 + np.flatnonzero(np.abs(U[k + 1 :, k]) >= 1e-12)
+                factors = U[rows, k] / U[k, k]
+                L[rows, k] = factors
+                U[rows, k + 1 : stop] -= np.outer(factors, U[k, k + 1 : stop])
+                U[rows, k] = 0.0
+
+            if stop == n:
+                break
+
+            # L11 has a unit diagonal
+            for i in range(start + 1, stop):
+                U[i, stop:] -= L[i, start:i] @ U[start:i, stop:]
+
+            U[stop:, stop:] -= L[stop:, start:stop] @ U[start:stop, stop:]
+
+        return L, U, P
+
+    # right-looking blocked crout, S starts as a copy of A and its trailing part
+    # is updated with the panel's columns of L and rows of U in a single product,
+    # within a panel the columns are computed from the panel's previous ones
+    def _factorize_crout_blocked(
+        self, S: np.ndarray
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, None]]:
+        n = self.n
+        L = np.zeros((n, n))
+        U = np.eye(n)
+
+        for start in range(0, n, self.block_size):
+            stop = min(start + self.block_size, n)
+
+            for j in range(start, stop):
+                L[j:, j] = S[j:, j] - L[j:, start:j] @ U[start:j, j]
+                if abs(L[j, j]) < 1e-12:
+                    return None
+
+                U[j, j + 1 : stop] = (
+                    S[j, j + 1 : stop] - L[j, start:j] @ U[start:j, j + 1 : stop]
+                ) / L[j, j]
+
+            if stop == n:
+                break
+
+            # L11 U12 = A12, the diagonal of L11 isn't 1
+            for i in range(start, stop):
+                U[i, stop:] = (S[i, stop:] - L[i, start:i] @ U[start:i, stop:]) / L[
+                    i, i
+                ]
+
+            S[stop:, stop:] -= L[stop:, start:stop] @ U[start:stop, stop:]
+
+        return L, U, None
+
+    # right-looking blocked cholesky, S starts as a copy of A and the lower
+    # triangle of its trailing part is updated with L21 L21^T, a block of columns
+    # per product, within a panel the columns are computed from the previous ones
+    def _factorize_cholesky_blocked(
+        self, S: np.ndarray
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, None]]:
+        n = self.n
+        L = np.zeros((n, n))
+
+        for start in range(0, n, self.block_size):
+            stop = min(start + self.block_size, n)
+
+            for j in range(start, stop):
+                column = S[j:, j] - L[j:, start:j] @ L[j, start:j]
+                if column[0] <= 0:
+                    return None
+
+                L[j, j] = np.sqrt(column[0])
+                L[j + 1 :, j] = column[1:] / L[j, j]
+
+            L21 = L[stop:, start:stop]
+            for first in range(stop, n, self.block_size):
+                last = min(first + self.block_size, n)
+                S[first:, first:last] -= (
+                    L21[first - stop :] @ L21[first - stop : last - stop].T
+                )
+
+        return L, L.T, None
+
+    # forward and back substitution with the float64 factors, b already permuted
+    def _substitute_float64(
+        self, L: np.ndarray, U: np.ndarray, b: np.ndarray
+    ) -> np.ndarray:
+        # doolittle's L and crout's U have a unit diagonal
+        y = self.forward_substitution_float64(
+            L, b, unit_diagonal=self.format == "doolittle"
+        )
+        x = self.back_substitution_float64(U, y, unit_diagonal=self.format == "crout")
+
+        if self.record_steps:
+            self.add_step(SubstitutionStep.forward(np.column_stack([L, b]), y))
+            self.add_step(SubstitutionStep.back(np.column_stack([U, y]), x))
+
+        return x
 
     def _solve_doolittle(self) -> Result:
         start_time = time.time()
@@ -63,18 +348,28 @@ class LUDecompositionSolver(Solver):
         # set U as copy of A
         U = A.copy()
 
+        # record the operations applied to U, L and P instead of copying them
+        if self.record_steps:
+            U_history = MatrixHistory(U)
+            L_history = MatrixHistory(L)
+            P_history = MatrixHistory(P)
+
         for k in range(n - 1):
-            max_idx = k + np.argmax(np.abs(U[k:, k]))
+            max_idx = int(k + np.argmax(np.abs(U[k:, k])))
             if max_idx != k:
-                old_matrix = U.copy()
                 L[[k, max_idx], :k] = L[[max_idx, k], :k]
                 U[[k, max_idx]] = U[[max_idx, k]]
                 P[[k, max_idx]] = P[[max_idx, k]]
-                new_matrix = U.copy()
-                self.steps.append(
-                    RowOperationStep.swap(old_matrix, new_matrix, k, int(max_idx))
-                )
-                self.steps.append(ShowMatricesStep({"L": L.copy(), "P": P.copy()}))
+                if self.record_steps:
+                    new_matrix = U_history.swap(U, r1=k, r2=max_idx)
+                    new_L = L_history.swap(L, r1=k, r2=max_idx, stop=k)
+                    new_P = P_history.swap(P, r1=k, r2=max_idx)
+                    self.add_step(
+                        RowOperationStep.swap(
+                            new_matrix.previous(), new_matrix, k, max_idx
+                        )
+                    )
+                    self.add_step(ShowMatricesStep({"L": new_L, "P": new_P}))
 
             if abs(U[k, k]) < 1e-12:
                 return Result(
@@ -82,31 +377,45 @@ class LUDecompositionSolver(Solver):
                     execution_time=time.time() - start_time,
                 )
 
-            for i in range(k + 1, n):
-                if abs(U[i, k]) < 1e-12:
-                    continue
+            rows = k + 1 + np.flatnonzero(np.abs(U[k + 1 :, k]) >= 1e-12)
+            if len(rows) == 0:
+                continue
 
-                old_matrix = U.copy()
+            factors = U[rows, k] / U[k, k]
 
-                factor = U[i, k] / U[k, k]
+            L[rows, k] = factors
+            self.count_operations(len(rows) * (1 + 2 * (n - k - 1)))
 
-                L[i, k] = factor
+            # multiply pivot row by the factors and subtract it from all the
+            # rows below at once (every value is rounded the same way as when
+            # the rows are updated one value at a time)
+            U[rows, k + 1 :] -= np.outer(factors, U[k, k + 1 :])
 
-                # multiply pivot row by factor and subtract from current row
-                for j in range(k + 1, self.n):
-                    U[i, j] -= factor * U[k, j]
+            U[rows, k] = +Decimal(0)
 
-                U[i, k] = +Decimal(0)
+            if not self.record_steps:
+                continue
 
-                new_matrix = U.copy()
+            # add the steps for each row, as if they were eliminated one by one,
+            # only the last one matches the current U and L
+            for index, (i, factor) in enumerate(zip(rows, factors)):
+                last = index == len(rows) - 1
+                new_matrix = U_history.add(
+                    *((U,) if last else ()), target=int(i), source=k, multiplier=factor
+                )
+                new_L = L_history.set(
+                    *((L,) if last else ()), row=int(i), column=k, value=factor
+                )
 
                 # add elimination step
-                self.steps.append(
-                    RowOperationStep.add(old_matrix, new_matrix, i, k, -factor)
+                self.add_step(
+                    RowOperationStep.add(
+                        new_matrix.previous(), new_matrix, int(i), k, -factor
+                    )
                 )
 
                 # show L matrix to see what changed
-                self.steps.append(ShowMatricesStep({"L": L.copy()}))
+                self.add_step(ShowMatricesStep({"L": new_L}))
 
         if abs(U[n - 1, n - 1]) < 1e-12:
             return Result(
@@ -116,26 +425,164 @@ class LUDecompositionSolver(Solver):
 
         # show the final L, U and P matrices
 
-        self.steps.append(ShowMatricesStep({"L": L, "U": U, "P": P}))
+        if self.record_steps:
+            self.add_step(ShowMatricesStep({"L": L, "U": U, "P": P}))
+
+        x = self._substitute_doolittle(L, U, P, b)
+
+        execution_time = time.time() - start_time
+
+        result = Result(
+            solution=x,
+            steps=self.steps,
+            execution_time=execution_time,
+            message=MESSAGES["doolittle"],
+        )
+        # Add L and U matrices to result
+        result.L = L
+        result.U = U
+        result.P = P
+
+        return result
+
+    # _solve_doolittle with the rows of U below every pivot split between worker
+    # processes, L and P are kept here
+    def _solve_doolittle_parallel(self) -> Result:
+        start_time = time.time()
+
+        b = self.b.copy()
+        n = self.n
+
+        P = np.array(
+            [
+                [+Decimal(1) if i == j else +Decimal(0) for j in range(n)]
+                for i in range(n)
+            ],
+            dtype=Decimal,
+        )
+        L = P.copy()
+
+        if self.record_steps:
+            U_history = MatrixHistory(self.A)
+            L_history = MatrixHistory(L)
+            P_history = MatrixHistory(P)
+
+        with ParallelElimination(self.A, self.parallel_workers) as engine:
+            # U as it is now, only gathered when the history keeps a copy of it
+            def blocks(operations: int = 1):
+                if U_history.keyframe_due(operations):
+                    return (engine.gather(),)
+                return ()
+
+            for k in range(n - 1):
+                column = engine.column(k)
+                max_idx = int(k + np.argmax(np.abs(column[k:])))
+                if max_idx != k:
+                    L[[k, max_idx], :k] = L[[max_idx, k], :k]
+                    engine.swap(k, max_idx)
+                    P[[k, max_idx]] = P[[max_idx, k]]
+                    if self.record_steps:
+                        new_matrix = U_history.swap(*blocks(), r1=k, r2=max_idx)
+                        new_L = L_history.swap(L, r1=k, r2=max_idx, stop=k)
+                        new_P = P_history.swap(P, r1=k, r2=max_idx)
+                        self.add_step(
+                            RowOperationStep.swap(
+                                new_matrix.previous(), new_matrix, k, max_idx
+                            )
+                        )
+                        self.add_step(ShowMatricesStep({"L": new_L, "P": new_P}))
+
+                if abs(column[k]) < 1e-12:
+                    return Result(
+                        message="System doesn't have a unique solution.",
+                        execution_time=time.time() - start_time,
+                    )
+
+                rows = k + 1 + np.flatnonzero(np.abs(column[k + 1 :]) >= 1e-12)
+                if len(rows) == 0:
+                    continue
+
+                factors = engine.eliminate(k, rows)
+
+                L[rows, k] = factors
+                self.count_operations(len(rows) * (1 + 2 * (n - k - 1)))
+
+                if not self.record_steps:
+                    continue
+
+                U_blocks = blocks(len(rows))
+                for index, (i, factor) in enumerate(zip(rows, factors)):
+                    last = index == len(rows) - 1
+                    new_matrix = U_history.add(
+                        *(U_blocks if last else ()),
+                        target=int(i),
+                        source=k,
+                        multiplier=factor,
+                    )
+                    new_L = L_history.set(
+                        *((L,) if last else ()), row=int(i), column=k, value=factor
+                    )
+                    self.add_step(
+                        RowOperationStep.add(
+                            new_matrix.previous(), new_matrix, int(i), k, -factor
+                        )
+                    )
+                    self.add_step(ShowMatricesStep({"L": new_L}))
+
+            U = engine.gather()
+
+        if abs(U[n - 1, n - 1]) < 1e-12:
+            return Result(
+                message="System doesn't have a unique solution.",
+                execution_time=time.time() - start_time,
+            )
+
+        if self.record_steps:
+            self.add_step(ShowMatricesStep({"L": L, "U": U, "P": P}))
+
+        x = self._substitute_doolittle(L, U, P, b)
+
+        execution_time = time.time() - start_time
+
+        result = Result(
+            solution=x,
+            steps=self.steps,
+            execution_time=execution_time,
+            message=MESSAGES["doolittle"],
+        )
+        result.L = L
+        result.U = U
+        result.P = P
+
+        return result
+
+    def _substitute_doolittle(
+        self, L: np.ndarray, U: np.ndarray, P: np.ndarray, b: np.ndarray
+    ) -> np.ndarray:
+        n = self.n
 
         # permutation
         b = P @ b
+        self.count_operations(self.columns * n * (2 * n - 1))
 
         # forward substitution: Ly = b
-        y = np.full(n, +Decimal(0))
+        y = np.full(b.shape, +Decimal(0))
 
         for i in range(n):
             y[i] = b[i]
             for j in range(i):
                 y[i] -= L[i, j] * y[j]
 
-        matrix = np.column_stack([L, b])
+        self.count_substitution(unit_diagonal=True)
+
+        if self.record_steps:
+            matrix = np.column_stack([L, b])
 
-        # add forward substitution step
-        self.steps.append(SubstitutionStep.forward(matrix, y))
+            # add forward substitution step
+            self.add_step(SubstitutionStep.forward(matrix, y))
 
         # back substitution: Ux = y
-        x = np.full(n, +Decimal(0))
+        x = np.full(b.shape, +Decimal(0))
 
         for i in range(n - 1, -1, -1):
             x[i] = y[i]
@@ -143,10 +590,95 @@ class LUDecompositionSolver(Solver):
                 x[i] -= U[i, j] * x[j]
             x[i] /= U[i, i]
 
-        matrix = np.column_stack([U, y])
+        self.count_substitution()
+
+        if self.record_steps:
+            matrix = np.column_stack([U, y])
+
+            # add back substitution step
+            self.add_step(SubstitutionStep.back(matrix, x))
+
+        return x
+
+    def _solve_doolittle_float64(self) -> Result:
+        start_time = time.time()
+
+        A = self.A.copy()
+        b = self.b.copy()
+        n = self.n
+
+        P = np.eye(n)
+        L = np.eye(n)
+        U = A.copy()
+
+        if self.record_steps:
+            U_history = MatrixHistory(U)
+            L_history = MatrixHistory(L)
+            P_history = MatrixHistory(P)
+
+        for k in range(n - 1):
+            max_idx = int(k + np.argmax(np.abs(U[k:, k])))
+            if max_idx != k:
+                L[[k, max_idx], :k] = L[[max_idx, k], :k]
+                U[[k, max_idx]] = U[[max_idx, k]]
+                P[[k, max_idx]] = P[[max_idx, k]]
+                if self.record_steps:
+                    new_matrix = U_history.swap(U, r1=k, r2=max_idx)
+                    new_L = L_history.swap(L, r1=k, r2=max_idx, stop=k)
+                    new_P = P_history.swap(P, r1=k, r2=max_idx)
+                    self.add_step(
+                        RowOperationStep.swap(
+                            new_matrix.previous(), new_matrix, k, max_idx
+                        )
+                    )
+                    self.add_step(ShowMatricesStep({"L": new_L, "P": new_P}))
+
+            if abs(U[k, k]) < 1e-12:
+                return Result(
+                    message="System doesn't have a unique solution.",
+                    execution_time=time.time() - start_time,
+                )
+
+            rows = k + 1 + np.flatnonzero(np.abs(U[k + 1 :, k]) >= 1e-12)
+            if len(rows) == 0:
+                continue
+
+            # eliminate the whole column below the pivot in a single update
+            factors = U[rows, k] / U[k, k]
+            L[rows, k] = factors
+            U[rows, k + 1 :] -= np.outer(factors, U[k, k + 1 :])
+            U[rows, k] = 0.0
+
+            if not self.record_steps:
+                continue
+
+            # add the steps for each row, as if they were eliminated one by one,
+            # only the last one matches the current U and L
+            for index, (i, factor) in enumerate(zip(rows, factors)):
+                last = index == len(rows) - 1
+                new_matrix = U_history.add(
+                    *((U,) if last else ()), target=int(i), source=k, multiplier=factor
+                )
+                new_L = L_history.set(
+                    *((L,) if last else ()), row=int(i), column=k, value=factor
+                )
+                self.add_step(
+                    RowOperationStep.add(
+                        new_matrix.previous(), new_matrix, int(i), k, -factor
+                    )
+                )
+                self.add_step(ShowMatricesStep({"L": new_L}))
 
-        # add back substitution step
-        self.steps.append(SubstitutionStep.back(matrix, x))
+        if abs(U[n - 1, n - 1]) < 1e-12:
+            return Result(
+                message="System doesn't have a unique solution.",
+                execution_time=time.time() - start_time,
+            )
+
+        if self.record_steps:
+            self.add_step(ShowMatricesStep({"L": L, "U": U, "P": P}))
+
+        x = self._substitute_float64(L, U, P @ b)
 
         execution_time = time.time() - start_time
 
@@ -154,9 +686,8 @@ class LUDecompositionSolver(Solver):
             solution=x,
             steps=self.steps,
             execution_time=execution_time,
-            message="Solution found using doolittle LU decomposition.",
+            message=MESSAGES["doolittle"],
         )
-        # Add L and U matrices to result
         result.L = L
         result.U = U
         result.P = P
@@ -178,15 +709,16 @@ class LUDecompositionSolver(Solver):
             dtype=Decimal,
         )
 
+        # the dot products of a whole column of L (and row of U) are added up
+        # together, term by term in the same order as for a single value
         for j in range(n):
             # lower
-            for i in range(j, n):
-                dot_product = +Decimal(0)
-                for k in range(j):
-                    product = L[i, k] * U[k, j]
-                    dot_product = dot_product + product
+            dot_product = np.full(n - j, +Decimal(0))
+            for k in range(j):
+                product = L[j:, k] * U[k, j]
+                dot_product = dot_product + product
 
-                L[i, j] = A[i, j] - dot_product
+            L[j:, j] = A[j:, j] - dot_product
 
             # check singularity
             if abs(L[j, j]) < 1e-12:
@@ -196,23 +728,48 @@ class LUDecompositionSolver(Solver):
                 )
 
             # Upper triangular
-            for i in range(j + 1, n):
-                dot_product = +Decimal(0)
-                for k in range(j):
-                    product = L[j, k] * U[k, i]
-                    dot_product = dot_product + product
+            dot_product = np.full(n - j - 1, +Decimal(0))
+            for k in range(j):
+                product = L[j, k] * U[k, j + 1 :]
+                dot_product = dot_product + product
+
+            numerator = A[j, j + 1 :] - dot_product
+            U[j, j + 1 :] = numerator / L[j, j]
 
-                numerator = A[j, i] - dot_product
-                U[j, i] = numerator / L[j, j]
+            # j products added up for every value of the column of L and the
+            # row of U, the subtractions and the row's divisions
+            self.count_operations((n - j) * (2 * j + 1) + (n - j - 1) * (2 * j + 2))
 
-        self.steps.append(CroutDecompositionStep(A, L, U))
+        if self.record_steps:
+            self.add_step(CroutDecompositionStep(A, L, U))
 
-        # show the final L and U matrices
+            # show the final L and U matrices
 
-        self.steps.append(ShowMatricesStep({"L": L, "U": U}))
+            self.add_step(ShowMatricesStep({"L": L, "U": U}))
+
+        x = self._substitute_crout(L, U, b)
+
+        execution_time = time.time() - start_time
+
+        result = Result(
+            solution=x,
+            steps=self.steps,
+            execution_time=execution_time,
+            message=MESSAGES["crout"],
+        )
+        # Add L and U matrices to result
+        result.L = L
+        result.U = U
+
+        return result
+
+    def _substitute_crout(
+        self, L: np.ndarray, U: np.ndarray, b: np.ndarray
+    ) -> np.ndarray:
+        n = self.n
 
         # forward substitution: Ly = b
-        y = np.full(n, +Decimal(0))
+        y = np.full(b.shape, +Decimal(0))
 
         for i in range(n):
             y[i] = b[i]
@@ -220,23 +777,60 @@ class LUDecompositionSolver(Solver):
                 y[i] -= L[i, j] * y[j]
             y[i] /= L[i, i]
 
-        matrix = np.column_stack([L, b])
+        self.count_substitution()
+
+        if self.record_steps:
+            matrix = np.column_stack([L, b])
 
-        # add forward substitution step
-        self.steps.append(SubstitutionStep.forward(matrix, y))
+            # add forward substitution step
+            self.add_step(SubstitutionStep.forward(matrix, y))
 
         # back substitution: Ux = y
-        x = np.full(n, +Decimal(0))
+        x = np.full(b.shape, +Decimal(0))
 
         for i in range(n - 1, -1, -1):
             x[i] = y[i]
             for j in range(i + 1, n):
                 x[i] -= U[i, j] * x[j]
 
-        matrix = np.column_stack([U, y])
+        self.count_substitution(unit_diagonal=True)
 
-        # add back substitution step
-        self.steps.append(SubstitutionStep.back(matrix, x))
+        if self.record_steps:
+            matrix = np.column_stack([U, y])
+
+            # add back substitution step
+            self.add_step(SubstitutionStep.back(matrix, x))
+
+        return x
+
+    def _solve_crout_float64(self) -> Result:
+        start_time = time.time()
+        A = self.A.copy()
+        b = self.b.copy()
+        n = self.n
+
+        L = np.zeros((n, n))
+        U = np.eye(n)
+
+        for j in range(n):
+            # lower, the whole column at once
+            L[j:, j] = A[j:, j] - L[j:, :j] @ U[:j, j]
+
+            # check singularity
+            if abs(L[j, j]) < 1e-12:
+                return Result(
+                    message="System doesn't have a unique solution.",
+                    execution_time=time.time() - start_time,
+                )
+
+            # upper, the whole row at once
+            U[j, j + 1 :] = (A[j, j + 1 :] - L[j, :j] @ U[:j, j + 1 :]) / L[j, j]
+
+        if self.record_steps:
+            self.add_step(CroutDecompositionStep(A, L, U))
+            self.add_step(ShowMatricesStep({"L": L, "U": U}))
+
+        x = self._substitute_float64(L, U, b)
 
         execution_time = time.time() - start_time
 
@@ -244,28 +838,13 @@ class LUDecompositionSolver(Solver):
             solution=x,
             steps=self.steps,
             execution_time=execution_time,
-            message="Solution found using Crout LU Decomposition.",
+            message=MESSAGES["crout"],
         )
-        # Add L and U matrices to result
         result.L = L
         result.U = U
 
         return result
 
-    @staticmethod
-    def allclose(
-        a: np.ndarray, b: np.ndarray, rtol=Decimal("1e-5"), atol=Decimal("1e-8")
-    ) -> bool:
-        if a.shape != b.shape:
-            return False
-
-        for x, y in zip(a.flat, b.flat):
-            diff = abs(x - y)
-            tol = atol + rtol * abs(y)
-            if diff > tol:
-                return False
-        return True
-
     def _solve_cholesky(self) -> Result:
         start_time = time.time()
         A = self.A.copy()
@@ -273,44 +852,68 @@ class LUDecompositionSolver(Solver):
         n = self.n
 
         # Check matrix symmetric or what
-        if not self.allclose(A, A.T):
+        if not self.is_symmetric(A):
             return Result(
                 message="Coefficients matrix is not symmetric.",
                 execution_time=time.time() - start_time,
             )
 
+        # column by column, the values below the diagonal of a column are
+        # computed together, adding up their terms in the same order as for a
+        # single value
         L = np.full((n, n), +Decimal(0))
-        for i in range(n):
-            for j in range(i + 1):
-                if i == j:
-                    sum_sq = +Decimal(0)
-                    for k in range(j):
-                        product = L[i, k] * L[i, k]
-                        sum_sq = sum_sq + product
-                    val = A[i, i] - sum_sq
-                    if val <= 0:
-                        return Result(
-                            message="Coefficients matrix is not positive definite.",
-                            execution_time=time.time() - start_time,
-                        )
+        for j in range(n):
+            sum_sq = +Decimal(0)
+            for k in range(j):
+                product = L[j, k] * L[j, k]
+                sum_sq = sum_sq + product
+            val = A[j, j] - sum_sq
+            if val <= 0:
+                return Result(
+                    message="Coefficients matrix is not positive definite.",
+                    execution_time=time.time() - start_time,
+                )
+
+            L[j, j] = np.sqrt(val)
+
+            sum_prod = np.full(n - j - 1, +Decimal(0))
+            for k in range(j):
+                product = L[j + 1 :, k] * L[j, k]
+                sum_prod = sum_prod + product
+            numerator = A[j + 1 :, j] - sum_prod
+            L[j + 1 :, j] = numerator / L[j, j]
+
+            # the diagonal value (with its square root), then j products added
+            # up, a subtraction and a division for every value below it
+            self.count_operations(2 * j + 2 + (n - j - 1) * (2 * j + 2))
+
+        if self.record_steps:
+            self.add_step(CholeskyDecompositionStep(A, L))
+
+            # show the final L and U matrices
 
-                    L[i, j] = np.sqrt(val)
-                else:
-                    sum_prod = +Decimal(0)
-                    for k in range(j):
-                        product = L[i, k] * L[j, k]
-                        sum_prod = sum_prod + product
-                    numerator = A[i, j] - sum_prod
-                    L[i, j] = numerator / L[j, j]
+            self.add_step(ShowMatricesStep({"L": L, "U": L.T}))
 
-        self.steps.append(CholeskyDecompositionStep(A, L))
+        x = self._substitute_cholesky(L, b)
 
-        # show the final L and U matrices
+        execution_time = time.time() - start_time
 
-        self.steps.append(ShowMatricesStep({"L": L, "U": L.T}))
+        result = Result(
+            solution=x,
+            steps=self.steps,
+            execution_time=execution_time,
+            message=MESSAGES["cholesky"],
+        )
+        result.L = L
+        result.U = L.T
+
+        return result
+
+    def _substitute_cholesky(self, L: np.ndarray, b: np.ndarray) -> np.ndarray:
+        n = self.n
 
         # forward sub Ly = b
-        y = np.full(n, +Decimal(0))
+        y = np.full(b.shape, +Decimal(0))
         for i in range(n):
             dot_product = +Decimal(0)
             for j in range(i):
@@ -320,12 +923,15 @@ class LUDecompositionSolver(Solver):
             numerator = b[i] - dot_product
             y[i] = numerator / L[i, i]
 
-        matrix = np.column_stack([L, b])
+        self.count_substitution()
+
+        if self.record_steps:
+            matrix = np.column_stack([L, b])
 
-        self.steps.append(SubstitutionStep.forward(matrix, y))
+            self.add_step(SubstitutionStep.forward(matrix, y))
 
         # back substitution
-        x = np.full(n, +Decimal(0))
+        x = np.full(b.shape, +Decimal(0))
         for i in range(n - 1, -1, -1):
             dot_product = +Decimal(0)
             for j in range(i + 1, n):
@@ -335,9 +941,46 @@ class LUDecompositionSolver(Solver):
             numerator = y[i] - dot_product
             x[i] = numerator / L[i, i]
 
-        matrix = np.column_stack([L.T, y])
+        self.count_substitution()
+
+        if self.record_steps:
+            matrix = np.column_stack([L.T, y])
+
+            self.add_step(SubstitutionStep.back(matrix, x))
+
+        return x
+
+    def _solve_cholesky_float64(self) -> Result:
+        start_time = time.time()
+        A = self.A.copy()
+        b = self.b.copy()
+        n = self.n
+
+        if not self.is_symmetric(A):
+            return Result(
+                message="Coefficients matrix is not symmetric.",
+                execution_time=time.time() - start_time,
+            )
+
+        L = np.zeros((n, n))
+        for j in range(n):
+            val = A[j, j] - L[j, :j] @ L[j, :j]
+            if val <= 0:
+                return Result(
+                    message="Coefficients matrix is not positive definite.",
+                    execution_time=time.time() - start_time,
+                )
+
+            L[j, j] = np.sqrt(val)
+
+            # the whole column below the diagonal at once
+            L[j + 1 :, j] = (A[j + 1 :, j] - L[j + 1 :, :j] @ L[j, :j]) / L[j, j]
+
+        if self.record_steps:
+            self.add_step(CholeskyDecompositionStep(A, L))
+            self.add_step(ShowMatricesStep({"L": L, "U": L.T}))
 
-        self.steps.append(SubstitutionStep.back(matrix, x))
+        x = self._substitute_float64(L, L.T, b)
 
         execution_time = time.time() - start_time
 
@@ -345,7 +988,7 @@ class LUDecompositionSolver(Solver):
             solution=x,
             steps=self.steps,
             execution_time=execution_time,
-            message="Solution found using Cholesky LU Decomposition.",
+            message=MESSAGES["cholesky"],
         )
         result.L = L
         result.U = L.T
@@ -0,0 +1,137 @@
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Optional
+
+import numpy as np
+from equations_solver.solvers.gauss_seidel_iteration_solver import (
+    GaussSeidelIterationSolver,
+)
+from equations_solver.step import Step
+from equations_solver.steps.iteration_step import IterationStep
+from exceptions import ValidationError
+
+# power iteration sweeps used to estimate the spectral radius of the Jacobi
+# iteration matrix when omega isn't given
+POWER_ITERATION_SWEEPS = 20
+
+
+# successive over-relaxation: a Gauss-Seidel sweep where every new value is
+# (1 - omega) * x_i + omega * gauss_seidel_value, an omega between 1 and 2
+# speeds up the convergence of systems Gauss-Seidel is slow on
+class SORIterationSolver(GaussSeidelIterationSolver):
+    requested_omega: Optional[Decimal]  # None to estimate it
+
+    def __init__(
+        self,
+        A: np.ndarray,
+        b: np.ndarray,
+        precision,
+        initial_guess,
+        number_of_iterations,
+        absolute_relative_error,
+        omega=None,
+        numeric_backend: str = "decimal",
+        steps_mode: str = "full",
+        step_sink: Optional[Callable[[Step], None]] = None,
+    ):
+        super().__init__(
+            A,
+            b,
+            precision,
+            initial_guess,
+            number_of_iterations,
+            absolute_relative_error,
+            numeric_backend,
+            steps_mode,
+            step_sink,
+        )
+
+        self.requested_omega = None
+        if omega is not None:
+            try:
+                self.requested_omega = Decimal(str(omega))
+            except InvalidOperation:
+                raise ValidationError(f"Omega must be a number. Found: '{omega}'")
+            # NaN can't be compared, so it gets the same error as infinity
+            omega_value = self.requested_omega
+            if not omega_value.is_finite() or not 0 < omega_value < 2:
+                raise ValidationError(
+                    f"Omega must be between 0 and 2 (exclusive). Found: {omega}"
+                )
+
+    @property
+    def method_name(self) -> str:
+        return f"SOR Iteration (omega = {self.omega})"
+
+    def prepare(self, A: np.ndarray, b: np.ndarray):
+        super().prepare(A, b)
+
+        omega = self.requested_omega
+        if omega is None:
+            omega = Decimal(f"{self.estimate_omega():.4f}")
+
+        self.omega = float(omega) if self.numeric_backend == "float64" else +omega
+
+    # the optimal omega 2 / (1 + sqrt(1 - rho^2)) of a consistently ordered
+    # matrix, with rho the spectral radius of the Jacobi iteration matrix
+    # T = -D^-1 (L + U), falls back to Gauss-Seidel (omega = 1) when Jacobi
+    # wouldn't converge and the formula doesn't apply
+    #
+    # rho is estimated in float64 (it only has to be close) from a few power
+    # iteration sweeps v, Tv, T^2v, ..., the sweeps are orthogonalised as they
+    # go (Arnoldi) and the eigenvalues of T restricted to the space they span
+    # get much closer to the extreme ones of T than the growth of the last sweep
+    # when T has many eigenvalues close to them (like discretised PDEs have)
+    #
+    # the eigenvalues of a consistently ordered matrix come in +-mu pairs, so
+    # rho is also its rightmost eigenvalue, which is the one used: when T has a
+    # large negative eigenvalue without a positive partner, Gauss-Seidel already
+    # damps it well and over-relaxing would only slow it down
+    def estimate_omega(self) -> float:
+        diagonal = self.diagonal.astype(np.float64)
+        if self.sparse:
+            remainder = self.off_diagonal.astype(np.float64)
+        else:
+            remainder = (self.lower + self.upper).astype(np.float64)
+
+        sweeps = min(POWER_ITERATION_SWEEPS, self.n)
+        basis = np.zeros((sweeps + 1, self.n))
+        hessenberg = np.zeros((sweeps + 1, sweeps))
+        basis[0] = 1 / np.sqrt(self.n)
+
+        with np.errstate(all="ignore"):
+            for k in range(sweeps):
+                v = (remainder @ basis[k]) / diagonal
+
+                # orthogonalise twice, once isn't enough in floating point
+                for _ in range(2):
+                    projections = basis[: k + 1] @ v
+                    v -= projections @ basis[: k + 1]
+                    hessenberg[: k + 1, k] += projections
+
+                norm = np.linalg.norm(v)
+                if not np.isfinite(norm):
+                    return 1.0
+                hessenberg[k + 1, k] = norm
+                if norm < 1e-12:
+                    # the sweeps span an invariant space, its eigenvalues are exact
+                    sweeps = k + 1
+                    break
+                basis[k + 1] = v / norm
+
+            eigenvalues = -np.linalg.eigvals(hessenberg[:sweeps, :sweeps])
+
+        if not np.all(np.isfinite(eigenvalues)) or np.max(np.abs(eigenvalues)) >= 1:
+            return 1.0
+
+        rho = max(np.max(eigenvalues.real), 0.0)
+
+        return 2 / (1 + np.sqrt(1 - rho**2))
+
+    def iteration_step(
+        self,
+        matrix: np.ndarray,
+        x_old: np.ndarray,
+        x_new: np.ndarray,
+        absolute_relative_error: Decimal,
+    ) -> IterationStep:
+        return IterationStep.sor(matrix, x_old, x_new, absolute_relative_error)
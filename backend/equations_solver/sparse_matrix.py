@@ -0,0 +1,151 @@
+import numpy as np
+
+
+# square matrix in compressed sparse row (CSR) form: the nonzeros of row i are
+# values[row_pointers[i]:row_pointers[i + 1]], in the columns at the same
+# positions of column_indices, so memory and the cost of every operation grow
+# with the number of nonzeros instead of n^2
+#
+# the values can be Decimal (object arrays) or float64, like the dense matrices
+class CSRMatrix:
+    row_pointers: np.ndarray  # (n + 1,) int
+    column_indices: np.ndarray  # (nnz,) int
+    values: np.ndarray  # (nnz,)
+    n: int
+
+    def __init__(
+        self,
+        row_pointers: np.ndarray,
+        column_indices: np.ndarray,
+        values: np.ndarray,
+        n: int,
+    ):
+        self.row_pointers = row_pointers
+        self.column_indices = column_indices
+        self.values = values
+        self.n = n
+
+    # build from coordinate (COO) triplets, entries given more than once for the
+    # same position are added up
+    @classmethod
+    def from_coo(
+        cls, rows: np.ndarray, columns: np.ndarray, values: np.ndarray, n: int
+    ) -> "CSRMatrix":
+        order = np.lexsort((columns, rows))
+        rows, columns, values = rows[order], columns[order], values[order]
+
+        # the first entry of every distinct (row, column) position
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = (rows[1:] != rows[:-1]) | (columns[1:] != columns[:-1])
+        starts = np.flatnonzero(first)
+        if len(starts) < len(values):
+            values = np.add.reduceat(values, starts)
+        rows, columns = rows[starts], columns[starts]
+
+        row_pointers = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=row_pointers[1:])
+        return cls(row_pointers, columns.astype(np.int64), values, n)
+
+    # the nonzeros of a dense matrix
+    @classmethod
+    def from_dense(cls, A: np.ndarray) -> "CSRMatrix":
+        rows, columns = np.nonzero(A != 0)
+        return cls.from_coo(rows, columns, A[rows, columns], len(A))
+
+    @property
+    def shape(self):
+        return self.n, self.n
+
+    @property
+    def nnz(self) -> int:
+        return len(self.values)
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    # the row of every stored value
+    def row_indices(self) -> np.ndarray:
+        return np.repeat(np.arange(self.n), np.diff(self.row_pointers))
+
+    def astype(self, dtype) -> "CSRMatrix":
+        return CSRMatrix(
+            self.row_pointers, self.column_indices, self.values.astype(dtype), self.n
+        )
+
+    def copy(self) -> "CSRMatrix":
+        return CSRMatrix(
+            self.row_pointers.copy(),
+            self.column_indices.copy(),
+            self.values.copy(),
+            self.n,
+        )
+
+    def transpose(self) -> "CSRMatrix":
+        return CSRMatrix.from_coo(
+            self.column_indices, self.row_indices(), self.values, self.n
+        )
+
+    def __abs__(self) -> "CSRMatrix":
+        return CSRMatrix(
+            self.row_pointers, self.column_indices, np.abs(self.values), self.n
+        )
+
+    # the diagonal, with zeros where it isn't stored
+    def diagonal(self) -> np.ndarray:
+        zero = 0 if self.dtype == object else 0.0
+        diagonal = np.full(self.n, zero, dtype=self.dtype)
+        rows = self.row_indices()
+        on_diagonal = rows == self.column_indices
+        diagonal[rows[on_diagonal]] = self.values[on_diagonal]
+        return diagonal
+
+    # the matrix with only the values outside of the diagonal
+    def off_diagonal(self) -> "CSRMatrix":
+        rows = self.row_indices()
+        keep = rows != self.column_indices
+        row_pointers = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows[keep], minlength=self.n), out=row_pointers[1:])
+        return CSRMatrix(
+            row_pointers, self.column_indices[keep], self.values[keep], self.n
+        )
+
+    # sum of every row (axis=1), for sum(abs(A), axis=1) like with dense matrices
+    def sum(self, axis: int = 1) -> np.ndarray:
+        if axis != 1:
+            raise ValueError("only the row sums of a sparse matrix are supported")
+        return self.row_sums(self.values)
+
+    def __matmul__(self, x: np.ndarray) -> np.ndarray:
+        return self.row_sums(self.values * x[self.column_indices])
+
+    # add up the given per value terms row by row
+    def row_sums(self, terms: np.ndarray) -> np.ndarray:
+        zero = 0 if terms.dtype == object else 0.0
+        sums = np.full(self.n, zero, dtype=terms.dtype)
+
+        # reduceat can't handle empty rows, they are left at zero
+        starts = self.row_pointers[:-1]
+        nonempty = starts < self.row_pointers[1:]
+        if np.any(nonempty):
+            sums[nonempty] = np.add.reduceat(terms, starts[nonempty])
+        return sums
+
+    # solve a triangular system, where this matrix holds the values outside of
+    # the diagonal, going down the rows (lower triangular) or up (upper)
+    def solve_triangular(
+        self, diagonal: np.ndarray, b: np.ndarray, lower: bool = True
+    ) -> np.ndarray:
+        x = b.copy()
+        for i in range(self.n) if lower else range(self.n - 1, -1, -1):
+            start, stop = self.row_pointers[i], self.row_pointers[i + 1]
+            x[i] = (
+                b[i] - self.values[start:stop] @ x[self.column_indices[start:stop]]
+            ) / diagonal[i]
+        return x
+
+    def to_dense(self) -> np.ndarray:
+        zero = 0 if self.dtype == object else 0.0
+        dense = np.full((self.n, self.n), zero, dtype=self.dtype)
+        dense[self.row_indices(), self.column_indices] = self.values
+        return dense
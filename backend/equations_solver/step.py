@@ -12,3 +12,7 @@ class Step(ABC):
     @abstractmethod
     def to_dict(self) -> Dict[str, Any]:
         pass
+
+    # like to_dict, but without any of the (possibly large) matrices and vectors
+    def to_summary_dict(self) -> Dict[str, Any]:
+        return {"step_type": self.step_type}
@@ -1,5 +1,5 @@
 from decimal import Decimal
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import numpy as np
 from equations_solver.step import Step
@@ -8,18 +8,21 @@ from utils import remove_trailing_zeros
 
 class IterationStep(Step):
     iteration_type: str
-    matrix: np.ndarray
+    matrix: Optional[np.ndarray]
     old_solution: np.ndarray
     new_solution: np.ndarray
     absolute_relative_error: Decimal
+    # ||b - Ax||, for conjugate gradient and iterative refinement
+    residual_norm: Optional[Decimal]
 
     def __init__(
         self,
         iteration_type: str,
-        matrix: np.ndarray,
+        matrix: Optional[np.ndarray],
         old_solution: np.ndarray,
         new_solution: np.ndarray,
         absolute_relative_error: Decimal,
+        residual_norm: Optional[Decimal] = None,
     ):
         super().__init__("iteration")
 
@@ -28,11 +31,12 @@ class IterationStep(Step):
         self.old_solution = old_solution
         self.new_solution = new_solution
         self.absolute_relative_error = absolute_relative_error
+        self.residual_norm = residual_norm
 
     @classmethod
     def jacobi(
         cls,
-        matrix: np.ndarray,
+        matrix: Optional[np.ndarray],
         old_solution: np.ndarray,
         new_solution: np.ndarray,
         absolute_relative_error: Decimal,
@@ -48,7 +52,7 @@ class IterationStep(Step):
     @classmethod
     def gauss_seidel(
         cls,
-        matrix: np.ndarray,
+        matrix: Optional[np.ndarray],
         old_solution: np.ndarray,
         new_solution: np.ndarray,
         absolute_relative_error: Decimal,
@@ -61,11 +65,62 @@ class IterationStep(Step):
             absolute_relative_error=absolute_relative_error,
         )
 
+    @classmethod
+    def sor(
+        cls,
+        matrix: Optional[np.ndarray],
+        old_solution: np.ndarray,
+        new_solution: np.ndarray,
+        absolute_relative_error: Decimal,
+    ) -> "IterationStep":
+        return cls(
+            iteration_type="sor",
+            matrix=matrix,
+            old_solution=old_solution,
+            new_solution=new_solution,
+            absolute_relative_error=absolute_relative_error,
+        )
+
+    @classmethod
+    def conjugate_gradient(
+        cls,
+        matrix: Optional[np.ndarray],
+        old_solution: np.ndarray,
+        new_solution: np.ndarray,
+        absolute_relative_error: Decimal,
+        residual_norm: Decimal,
+    ) -> "IterationStep":
+        return cls(
+            iteration_type="conjugate-gradient",
+            matrix=matrix,
+            old_solution=old_solution,
+            new_solution=new_solution,
+            absolute_relative_error=absolute_relative_error,
+            residual_norm=residual_norm,
+        )
+
+    @classmethod
+    def iterative_refinement(
+        cls,
+        matrix: Optional[np.ndarray],
+        old_solution: np.ndarray,
+        new_solution: np.ndarray,
+        absolute_relative_error: Decimal,
+        residual_norm: Decimal,
+    ) -> "IterationStep":
+        return cls(
+            iteration_type="iterative-refinement",
+            matrix=matrix,
+            old_solution=old_solution,
+            new_solution=new_solution,
+            absolute_relative_error=absolute_relative_error,
+            residual_norm=residual_norm,
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         solution = {
             "step_type": self.step_type,
             "iteration_type": self.iteration_type,
-            "matrix": np.vectorize(remove_trailing_zeros)(self.matrix).tolist(),
             "old_solution": np.vectorize(remove_trailing_zeros)(
                 self.old_solution
             ).tolist(),
@@ -77,4 +132,27 @@ class IterationStep(Step):
             ),
         }
 
+        # sparse systems don't keep the (possibly huge) matrix in their steps
+        if self.matrix is not None:
+            solution["matrix"] = np.vectorize(remove_trailing_zeros)(
+                self.matrix
+            ).tolist()
+
+        if self.residual_norm is not None:
+            solution["residual_norm"] = remove_trailing_zeros(self.residual_norm)
+
         return solution
+
+    def to_summary_dict(self) -> Dict[str, Any]:
+        summary = {
+            "step_type": self.step_type,
+            "iteration_type": self.iteration_type,
+            "absolute_relative_error": remove_trailing_zeros(
+                self.absolute_relative_error
+            ),
+        }
+
+        if self.residual_norm is not None:
+            summary["residual_norm"] = remove_trailing_zeros(self.residual_norm)
+
+        return summary
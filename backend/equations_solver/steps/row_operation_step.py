@@ -1,15 +1,18 @@
 from decimal import Decimal
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
 
 import numpy as np
+from equations_solver.matrix_history import MatrixSnapshot
 from equations_solver.step import Step
 from utils import remove_trailing_zeros
 
 
+# the matrices can be lazy snapshots from a MatrixHistory, they are only built
+# when the step is converted to a dictionary
 class RowOperationStep(Step):
     operation_type: str
-    old_matrix: np.ndarray
-    new_matrix: np.ndarray
+    old_matrix: Union[np.ndarray, MatrixSnapshot]
+    new_matrix: Union[np.ndarray, MatrixSnapshot]
     target_row: int
     source_row: Optional[int]
     factor: Optional[Decimal]
@@ -17,8 +20,8 @@ class RowOperationStep(Step):
     def __init__(
         self,
         operation_type: str,
-        old_matrix: np.ndarray,
-        new_matrix: np.ndarray,
+        old_matrix: Union[np.ndarray, MatrixSnapshot],
+        new_matrix: Union[np.ndarray, MatrixSnapshot],
         target_row: int,
         source_row: Optional[int] = None,
         factor: Optional[Decimal] = None,
@@ -35,8 +38,8 @@ class RowOperationStep(Step):
     @classmethod
     def swap(
         cls,
-        old_matrix: np.ndarray,
-        new_matrix: np.ndarray,
+        old_matrix: Union[np.ndarray, MatrixSnapshot],
+        new_matrix: Union[np.ndarray, MatrixSnapshot],
         target_row: int,
         source_row: int,
     ) -> "RowOperationStep":
@@ -50,7 +53,11 @@ class RowOperationStep(Step):
 
     @classmethod
     def scale(
-        cls, old_matrix: np.ndarray, new_matrix: np.ndarray, row: int, factor: Decimal
+        cls,
+        old_matrix: Union[np.ndarray, MatrixSnapshot],
+        new_matrix: Union[np.ndarray, MatrixSnapshot],
+        row: int,
+        factor: Decimal,
     ) -> "RowOperationStep":
         return cls(
             operation_type="scale",
@@ -63,8 +70,8 @@ class RowOperationStep(Step):
     @classmethod
     def add(
         cls,
-        old_matrix: np.ndarray,
-        new_matrix: np.ndarray,
+        old_matrix: Union[np.ndarray, MatrixSnapshot],
+        new_matrix: Union[np.ndarray, MatrixSnapshot],
         target_row: int,
         source_row: int,
         factor: Decimal,
@@ -94,3 +101,18 @@ class RowOperationStep(Step):
             result["factor"] = remove_trailing_zeros(self.factor)
 
         return result
+
+    def to_summary_dict(self) -> Dict[str, Any]:
+        result = {
+            "step_type": self.step_type,
+            "operation_type": self.operation_type,
+            "target_row": self.target_row,
+        }
+
+        if self.source_row is not None:
+            result["source_row"] = self.source_row
+
+        if self.factor is not None:
+            result["factor"] = remove_trailing_zeros(self.factor)
+
+        return result
@@ -1,14 +1,15 @@
-from typing import Any, Dict
+from typing import Any, Dict, Union
 
 import numpy as np
+from equations_solver.matrix_history import MatrixSnapshot
 from equations_solver.step import Step
 from utils import remove_trailing_zeros
 
 
 class ShowMatricesStep(Step):
-    matrices: Dict[str, np.ndarray]
+    matrices: Dict[str, Union[np.ndarray, MatrixSnapshot]]
 
-    def __init__(self, matrices: Dict[str, np.ndarray]):
+    def __init__(self, matrices: Dict[str, Union[np.ndarray, MatrixSnapshot]]):
         super().__init__("show-matrices")
 
         self.matrices = matrices
@@ -42,3 +42,9 @@ class SubstitutionStep(Step):
         }
 
         return result
+
+    def to_summary_dict(self) -> Dict[str, Any]:
+        return {
+            "step_type": self.step_type,
+            "substitution_type": self.substitution_type,
+        }
@@ -1,2 +1,26 @@
 class ValidationError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+
+# raised when a request runs longer than its deadline, the worker running it is
+# stopped so it can't keep a core busy
+class ComputationTimeout(Exception):
+    timeout: float
+
+    def __init__(self, timeout: float):
+        super().__init__(f"Computation timed out after {timeout:g} seconds.")
+        self.timeout = timeout
+
+
+# raised when the worker process running a request dies (like when it runs out
+# of memory), the worker is replaced with a fresh one
+class WorkerCrashed(Exception):
+    def __init__(self):
+        super().__init__("The worker process running the computation crashed.")
+
+
+# raised when a request is run after the worker pool was shut down (the server
+# is stopping)
+class PoolClosed(Exception):
+    def __init__(self):
+        super().__init__("The server is shutting down.")
@@ -0,0 +1,76 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+
+# where the time of a request goes, kept when the request asks for it with
+# "profile": true and added to its result (see Result.to_dict):
+#   phases: nanoseconds spent in every phase of the request (like parse,
+#   derivative, compile, iterate, solve and serialize), added up when a phase
+#   runs more than once
+#   counters: how many times something was done (like function_evaluations,
+#   derivative_evaluations and decimal_operations)
+#   iterations: the nanoseconds every iteration took, from perf_counter_ns
+class Profile:
+    phases: Dict[str, int]
+    counters: Dict[str, int]
+    iterations: List[int]
+
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+        self.iterations = []
+        self._lap: Optional[int] = None
+
+    # time the code in the with block as the phase
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter_ns()
+        try:
+            yield self
+        finally:
+            self.add_phase(name, time.perf_counter_ns() - start)
+
+    def add_phase(self, name: str, nanoseconds: int):
+        self.phases[name] = self.phases.get(name, 0) + nanoseconds
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    # start timing the iterations, every call to lap ends one
+    def start_iterations(self):
+        self._lap = time.perf_counter_ns()
+
+    def lap(self):
+        now = time.perf_counter_ns()
+        if self._lap is not None:
+            self.iterations.append(now - self._lap)
+        self._lap = now
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "phases_ns": dict(self.phases),
+            "counters": dict(self.counters),
+        }
+
+        if self.iterations:
+            result["iterations"] = {
+                "count": len(self.iterations),
+                "total_ns": sum(self.iterations),
+                "min_ns": min(self.iterations),
+                "mean_ns": sum(self.iterations) // len(self.iterations),
+                "max_ns": max(self.iterations),
+                "ns": list(self.iterations),
+            }
+
+        return result
+
+
+# a with block that times the phase, or does nothing without a profile
+@contextmanager
+def profile_phase(profile: Optional[Profile], name: str):
+    if profile is None:
+        yield None
+        return
+    with profile.phase(name):
+        yield profile
@@ -0,0 +1,289 @@
+import threading
+from decimal import Decimal, InvalidOperation, Overflow, localcontext
+from typing import Callable, List, Optional, Tuple, Union
+
+import mpmath
+import numpy as np
+from sympy import Expr, N, lambdify, symbols
+
+# extra digits the mpmath evaluator works with, so the value is still correct
+# to the requested precision after it is rounded to a Decimal
+GUARD_DIGITS = 10
+
+
+# evaluates a parsed function at Decimal points, the expression is compiled once
+# with lambdify instead of going through subs/evalf on every call
+class FunctionEvaluator:
+    expr: Expr
+    precision: int
+    numeric_backend: str
+
+    def __init__(self, expr: Expr, precision: int, numeric_backend: str = "decimal"):
+        self.expr = expr
+        self.precision = precision
+        self.numeric_backend = numeric_backend
+        self.x_symbol = symbols("x", real=True)
+
+        # a private mpmath context, so the working precision isn't shared with
+        # other evaluators (the global mpmath context isn't thread safe)
+        self.context = mpmath.MPContext()
+        self.context.dps = precision + GUARD_DIGITS
+
+        self._mpmath_function = self._compile_mpmath()
+        self._float64_function = (
+            self._compile_float64() if numeric_backend == "float64" else None
+        )
+
+    def _compile_mpmath(self) -> Optional[Callable]:
+        namespace = {
+            name: getattr(self.context, name)
+            for name in dir(self.context)
+            if not name.startswith("_")
+        }
+        try:
+            return lambdify(self.x_symbol, self.expr, modules=[namespace, "mpmath"])
+        except Exception:
+            return None
+
+    def _compile_float64(self) -> Optional[Callable]:
+        try:
+            return lambdify(self.x_symbol, self.expr, modules="numpy")
+        except Exception:
+            return None
+
+    def __call__(self, x: Decimal) -> Decimal:
+        if self._float64_function is not None:
+            y = self._evaluate_float64(x)
+            if y is not None:
+                return y
+
+        return self._evaluate_exact(x)
+
+    # evaluate at many points at once (the float64 function is called once on a
+    # vector of all of them), the ValueError is returned instead of raised for
+    # the points where the function can't be evaluated
+    def evaluate_many(self, points: List[Decimal]) -> List[Union[Decimal, ValueError]]:
+        values: List[Union[Decimal, ValueError, None]] = [None] * len(points)
+
+        if self._float64_function is not None and len(points) > 1:
+            for i, y in self._evaluate_float64_many(points):
+                values[i] = y
+
+        for i, x in enumerate(points):
+            if values[i] is not None:
+                continue
+            try:
+                values[i] = self(x) if len(points) == 1 else self._evaluate_exact(x)
+            except ValueError as e:
+                values[i] = e
+
+        return values
+
+    def _evaluate_exact(self, x: Decimal) -> Decimal:
+        if self._mpmath_function is not None:
+            try:
+                return self._evaluate_mpmath(x)
+            except (NameError, TypeError, AttributeError):
+                # the expression uses something mpmath can't evaluate
+                self._mpmath_function = None
+                self._float64_function = None
+
+        return self._evaluate_symbolic(x)
+
+    # returns None when the value isn't a finite real float, the mpmath evaluator
+    # then decides whether it's an error (like log(0)) or just out of range
+    def _evaluate_float64(self, x: Decimal) -> Optional[Decimal]:
+        try:
+            with np.errstate(all="ignore"):
+                y = self._float64_function(np.float64(x))
+        except (ArithmeticError, ValueError, TypeError, NameError, AttributeError):
+            return None
+
+        if not np.isrealobj(y) or not np.isfinite(y):
+            return None
+
+        return +Decimal(float(self._chop_float64(y)))
+
+    # the values below the last digit of the precision are zero, like
+    # evalf(chop=True) makes them
+    def _chop_float64(self, y):
+        return np.where(np.abs(y) < 10.0**-self.precision, 0.0, y)
+
+    # the (index, value) of the points with a finite real float value
+    def _evaluate_float64_many(self, points: List[Decimal]):
+        x = np.array([float(point) for point in points])
+        try:
+            with np.errstate(all="ignore"):
+                # constant functions give a single value for all the points
+                y = np.broadcast_to(self._float64_function(x), x.shape)
+        except (ArithmeticError, ValueError, TypeError, NameError, AttributeError):
+            return []
+
+        if not np.isrealobj(y):
+            return []
+
+        y = self._chop_float64(y)
+        return [(int(i), +Decimal(float(y[i]))) for i in np.flatnonzero(np.isfinite(y))]
+
+    def _evaluate_mpmath(self, x: Decimal) -> Decimal:
+        try:
+            y = self.context.convert(self._mpmath_function(self.context.mpf(str(x))))
+        except (ZeroDivisionError, ValueError):
+            raise ValueError("calculation resulted in undefined or complex value")
+
+        if isinstance(y, self.context.mpc):
+            if y.imag != 0:
+                raise ValueError("calculation resulted in undefined or complex value")
+            y = y.real
+
+        if not self.context.isfinite(y):
+            raise ValueError("calculation resulted in undefined or complex value")
+
+        # chopped like the float64 values
+        if abs(y) < self.context.mpf(10) ** -self.precision:
+            return Decimal(0)
+
+        try:
+            return +Decimal(str(y))
+        except InvalidOperation:
+            raise ValueError("calculation resulted in undefined or complex value")
+        except Overflow:
+            raise ValueError("calculation resulted in overflow")
+
+    def _evaluate_symbolic(self, x: Decimal) -> Decimal:
+        val_sympy = self.expr.subs(self.x_symbol, x).evalf(n=self.precision, chop=True)
+
+        try:
+            if not val_sympy.is_real:
+                raise ValueError("calculation resulted in undefined or complex value")
+            y = +Decimal(str(val_sympy))
+        except (InvalidOperation, ValueError):
+            raise ValueError("calculation resulted in undefined or complex value")
+        except Overflow:
+            raise ValueError("calculation resulted in overflow")
+
+        return y
+
+
+# a polynomial evaluated with Horner's rule in Decimal, every pass computes the
+# value and the derivative together, and the ones at the points of the last
+# call are kept (per thread), so f' at the points f was just evaluated at (or
+# the other way around, like Newton-Raphson asks for them) takes no second pass
+class HornerPolynomial:
+    coefficients: List[Decimal]  # highest degree first
+    precision: int
+    numeric_backend: str
+
+    def __init__(
+        self, coefficients: List[Expr], precision: int, numeric_backend: str = "decimal"
+    ):
+        self.precision = precision
+        self.numeric_backend = numeric_backend
+
+        # the coefficients may be irrational (like pi), they are rounded with
+        # the same guard digits as the mpmath evaluator
+        digits = precision + GUARD_DIGITS
+        with localcontext() as context:
+            context.prec = digits
+            self.coefficients = [
+                (
+                    Decimal(int(coefficient.p)) / Decimal(int(coefficient.q))
+                    if coefficient.is_Rational
+                    else +Decimal(str(N(coefficient, digits)))
+                )
+                for coefficient in coefficients
+            ]
+        self.float64_coefficients = np.array(
+            [float(coefficient) for coefficient in self.coefficients]
+        )
+
+        self._last = threading.local()
+
+    # the (value, derivative) at every point, the ValueError in place of the
+    # ones that can't be computed
+    def values(
+        self, points: List[Decimal]
+    ) -> List[Union[Tuple[Decimal, Decimal], ValueError]]:
+        last = getattr(self._last, "values", {})
+        values = [last.get(x) for x in points]
+
+        missing = [i for i, value in enumerate(values) if value is None]
+        if self.numeric_backend == "float64" and missing:
+            for i, value in self._horner_float64([points[i] for i in missing]):
+                values[missing[i]] = value
+
+        for i, x in enumerate(points):
+            if values[i] is None:
+                try:
+                    values[i] = self._horner(x)
+                except ValueError as e:
+                    values[i] = e
+
+        self._last.values = dict(zip(points, values))
+        return values
+
+    def _horner(self, x: Decimal) -> Tuple[Decimal, Decimal]:
+        try:
+            with localcontext() as context:
+                context.prec = self.precision + GUARD_DIGITS
+                value = self.coefficients[0]
+                derivative = Decimal(0)
+                for coefficient in self.coefficients[1:]:
+                    derivative = derivative * x + value
+                    value = value * x + coefficient
+            return self._chop(+value), self._chop(+derivative)
+        except Overflow:
+            raise ValueError("calculation resulted in overflow")
+
+    # the values below the last digit of the precision are zero, like the ones
+    # of FunctionEvaluator
+    def _chop(self, y: Decimal) -> Decimal:
+        return Decimal(0) if abs(y) < Decimal(1).scaleb(-self.precision) else y
+
+    # the (index, (value, derivative)) of the points where both are finite
+    # floats, all the points are evaluated together
+    def _horner_float64(self, points: List[Decimal]):
+        x = np.array([float(point) for point in points])
+        value = np.full(x.shape, self.float64_coefficients[0])
+        derivative = np.zeros(x.shape)
+        with np.errstate(all="ignore"):
+            for coefficient in self.float64_coefficients[1:]:
+                derivative = derivative * x + value
+                value = value * x + coefficient
+
+        finite = np.isfinite(value) & np.isfinite(derivative)
+        return [
+            (
+                int(i),
+                (
+                    self._chop(+Decimal(float(value[i]))),
+                    self._chop(+Decimal(float(derivative[i]))),
+                ),
+            )
+            for i in np.flatnonzero(finite)
+        ]
+
+
+# FunctionEvaluator for polynomials, the function (order 0) and the derivative
+# (order 1) evaluators of the same polynomial share its HornerPolynomial
+class PolynomialEvaluator:
+    polynomial: HornerPolynomial
+    order: int
+
+    def __init__(self, polynomial: HornerPolynomial, order: int = 0):
+        self.polynomial = polynomial
+        self.order = order
+        self.precision = polynomial.precision
+        self.numeric_backend = polynomial.numeric_backend
+
+    def __call__(self, x: Decimal) -> Decimal:
+        value = self.polynomial.values([x])[0]
+        if isinstance(value, ValueError):
+            raise value
+        return value[self.order]
+
+    def evaluate_many(self, points: List[Decimal]) -> List[Union[Decimal, ValueError]]:
+        return [
+            value if isinstance(value, ValueError) else value[self.order]
+            for value in self.polynomial.values(points)
+        ]
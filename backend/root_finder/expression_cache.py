@@ -0,0 +1,212 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sympy import Expr, Poly, PolynomialError, expand, symbols
+
+from root_finder.evaluator import (
+    FunctionEvaluator,
+    HornerPolynomial,
+    PolynomialEvaluator,
+)
+from validator import FunctionValidator
+
+# compiled evaluators kept per expression, one for each (derivative order,
+# precision, numeric backend) combination that was asked for recently
+MAX_EVALUATORS_PER_EXPRESSION = 8
+
+
+# the evaluators the cache compiles
+Evaluator = Union[FunctionEvaluator, PolynomialEvaluator]
+
+
+# a parsed expression with its derivatives and compiled evaluators, which are
+# all built lazily the first time they are needed, polynomials given in expanded
+# form (and their first derivatives) are evaluated with Horner's rule instead of
+# being compiled, factored ones like (x - 3)^7 keep their compiled evaluators,
+# Horner's rule on their expanded coefficients loses all the digits near the
+# multiple roots to cancellation
+class CachedExpression:
+    expr: Expr
+
+    def __init__(self, expr: Expr):
+        self.expr = expr
+        self._lock = threading.Lock()
+        self._derivatives: Dict[int, Expr] = {0: expr}
+        self._evaluators: OrderedDict[Tuple[int, int, str], Evaluator] = OrderedDict()
+        self._coefficients: Optional[List[Expr]] = None
+        self._expanded = False
+        self._detected = False
+
+    # the coefficients (highest degree first) when the expression is a
+    # polynomial in x with real constant coefficients, None otherwise
+    def polynomial(self) -> Optional[List[Expr]]:
+        with self._lock:
+            if not self._detected:
+                self._coefficients = self._detect_polynomial()
+                self._expanded = self._coefficients is not None and (
+                    self.expr == expand(self.expr)
+                )
+                self._detected = True
+            return self._coefficients
+
+    # the coefficients of the polynomial rounded to Decimal at the precision, for
+    # the methods that work with the coefficients themselves
+    def decimal_coefficients(
+        self, precision: int, numeric_backend: str = "decimal"
+    ) -> List[Decimal]:
+        coefficients = self.polynomial()
+        if coefficients is None:
+            raise ValueError("The expression isn't a polynomial")
+        return self._horner_polynomial(
+            coefficients, precision, numeric_backend
+        ).coefficients
+
+    def _detect_polynomial(self) -> Optional[List[Expr]]:
+        x_symbol = symbols("x", real=True)
+        if not self.expr.is_polynomial(x_symbol):
+            return None
+
+        try:
+            coefficients = Poly(self.expr, x_symbol).all_coeffs()
+        except PolynomialError:
+            return None
+
+        if not all(
+            coefficient.is_number and coefficient.is_real
+            for coefficient in coefficients
+        ):
+            return None
+        return coefficients
+
+    def derivative(self, order: int = 1) -> Expr:
+        with self._lock:
+            if order not in self._derivatives:
+                x_symbol = symbols("x", real=True)
+                self._derivatives[order] = self.expr.diff(x_symbol, order)
+            return self._derivatives[order]
+
+    def evaluator(
+        self, precision: int, numeric_backend: str = "decimal", order: int = 0
+    ) -> Evaluator:
+        key = (order, precision, numeric_backend)
+
+        with self._lock:
+            evaluator = self._evaluators.get(key)
+            if evaluator is not None:
+                self._evaluators.move_to_end(key)
+                return evaluator
+
+        # compiling takes a few milliseconds, so it's done outside the lock
+        coefficients = self.polynomial() if order <= 1 else None
+        if coefficients is not None and self._expanded:
+            evaluator = PolynomialEvaluator(
+                self._horner_polynomial(coefficients, precision, numeric_backend),
+                order,
+            )
+        else:
+            evaluator = FunctionEvaluator(
+                self.derivative(order), precision, numeric_backend
+            )
+
+        with self._lock:
+            self._evaluators[key] = evaluator
+            if len(self._evaluators) > MAX_EVALUATORS_PER_EXPRESSION:
+                self._evaluators.popitem(last=False)
+
+        return evaluator
+
+    # the function and derivative evaluators of a polynomial share the same
+    # HornerPolynomial, so f and f' at a point take a single pass
+    def _horner_polynomial(
+        self, coefficients: List[Expr], precision: int, numeric_backend: str
+    ) -> HornerPolynomial:
+        with self._lock:
+            for order in (0, 1):
+                evaluator = self._evaluators.get((order, precision, numeric_backend))
+                if isinstance(evaluator, PolynomialEvaluator):
+                    return evaluator.polynomial
+
+        return HornerPolynomial(coefficients, precision, numeric_backend)
+
+
+# bounded, thread safe LRU cache of parsed expressions keyed by the equation
+# string, entries older than `ttl` seconds are parsed again (no expiry if None)
+class ExpressionCache:
+    maxsize: int
+    ttl: Optional[float]
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, Tuple[CachedExpression, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # the cached expression for the equation, parsing (and validating) it on a
+    # miss, invalid equations raise ValidationError and are never cached
+    def get(self, equation_str: str) -> CachedExpression:
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(equation_str)
+            if entry is not None:
+                cached, created_at = entry
+                if self.ttl is None or now - created_at < self.ttl:
+                    self._entries.move_to_end(equation_str)
+                    self.hits += 1
+                    return cached
+
+                del self._entries[equation_str]
+                self.expirations += 1
+
+            self.misses += 1
+
+        cached = CachedExpression(FunctionValidator.validate_and_parse(equation_str))
+
+        with self._lock:
+            if self.maxsize > 0:
+                self._entries[equation_str] = (cached, now)
+                self._entries.move_to_end(equation_str)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+        return cached
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# shared by all requests, configured with the EXPRESSION_CACHE_SIZE and
+# EXPRESSION_CACHE_TTL (seconds, 0 for no expiry) environment variables, every
+# worker process has a cache of its own, so they are only set at startup
+expression_cache = ExpressionCache(
+    maxsize=int(os.environ.get("EXPRESSION_CACHE_SIZE", 256)),
+    ttl=float(os.environ.get("EXPRESSION_CACHE_TTL", 3600)) or None,
+)
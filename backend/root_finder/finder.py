@@ -1,7 +1,24 @@
+import time
 from decimal import Decimal
-from typing import Callable
+from typing import Callable, Dict, Generator, List, Optional, Tuple, Union
 from abc import ABC, abstractmethod
+from profiling import Profile
 from root_finder.result import Result
+from utils import calculate_absolute_relative_error
+
+# a root search is a generator that yields (function, x) whenever it needs a
+# function value, gets the value sent back (or the ValueError thrown in at the
+# yield) and returns its Result, so the same search code can run on its own or
+# in lock-step with many other searches
+#
+# a search that needs the values at many points at once yields a list of them
+# instead of x, and gets a list of the values back, with the ValueError in
+# place of the values that can't be computed
+Search = Generator[
+    Tuple[Callable[[Decimal], Decimal], Union[Decimal, List[Decimal]]],
+    Union[Decimal, List[Union[Decimal, ValueError]]],
+    Result,
+]
 
 
 # base class for all root finding methods
@@ -10,6 +27,8 @@ class Finder(ABC):
     absolute_relative_error: Decimal
     number_of_iterations: int
     precision: int
+    setup_evaluations: int  # evaluations made before the search (like a bracket check)
+    profile: Optional[Profile]  # kept when the search is profiled
 
     def __init__(
         self,
@@ -22,8 +41,139 @@ class Finder(ABC):
         self.absolute_relative_error = absolute_relative_error
         self.number_of_iterations = number_of_iterations
         self.precision = precision
+        self.setup_evaluations = 0
+        self.profile = None
 
-    # find the root of the function
+    # the root search, to be implemented by subclasses
     @abstractmethod
-    def find(self) -> Result:
+    def search(self) -> Search:
         pass
+
+    # mark the start of an iteration of the search when it is profiled
+    def lap(self):
+        if self.profile is not None:
+            self.profile.lap()
+
+    # the profile counter of the evaluations of a function the search asks for,
+    # the finders that use the derivative keep it in their derivative attribute
+    def evaluation_counter(self, function: Callable[[Decimal], Decimal]) -> str:
+        if function is getattr(self, "derivative", None):
+            return "derivative_evaluations"
+        return "function_evaluations"
+
+    # the sorted roots without the ones closer than the tolerance to the one
+    # before, for the finders that find many roots
+    def unique(self, roots: List[Decimal]) -> List[Decimal]:
+        kept: List[Decimal] = []
+        for root in roots:
+            if (
+                kept
+                and calculate_absolute_relative_error(root, kept[-1])
+                < self.absolute_relative_error
+            ):
+                continue
+            kept.append(root)
+        return kept
+
+    # find the root of the function
+    def find(self) -> Result:
+        result = Finder.find_batch([self])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    # run many searches in lock-step, in every round the pending points of all
+    # the searches are evaluated together (in a single vectorized call when the
+    # function supports it) and each search is retired as soon as it returns,
+    # errors raised by a search (like ValidationError) are returned in its place,
+    # every result gets the number of function evaluations its search made, and
+    # the profile of the search when it is profiled (the searches of a batch
+    # share the time of the iterate phase)
+    @staticmethod
+    def find_batch(finders: List["Finder"]) -> List[Union[Result, Exception]]:
+        start = time.perf_counter_ns()
+
+        searches = [finder.search() for finder in finders]
+        results: List[Union[Result, Exception, None]] = [None] * len(finders)
+        evaluations = [finder.setup_evaluations for finder in finders]
+
+        for finder in finders:
+            if finder.profile is not None:
+                finder.profile.count("function_evaluations", finder.setup_evaluations)
+
+        # what to send to (or throw into) each search that is still running
+        replies: Dict[int, Union[Decimal, ValueError, List, None]] = {
+            lane: None for lane in range(len(searches))
+        }
+
+        while replies:
+            requests = {}
+            for lane, reply in replies.items():
+                try:
+                    if isinstance(reply, ValueError):
+                        requests[lane] = searches[lane].throw(reply)
+                    else:
+                        requests[lane] = searches[lane].send(reply)
+                except StopIteration as stop:
+                    results[lane] = stop.value
+                    stop.value.number_of_function_evaluations = evaluations[lane]
+                    # the last iteration ends with the search
+                    finders[lane].lap()
+                    stop.value.profile = finders[lane].profile
+                except Exception as e:
+                    results[lane] = e
+
+            # group the points by the function they need
+            groups: Dict[int, Tuple[Callable, List[int]]] = {}
+            for lane, (function, _) in requests.items():
+                groups.setdefault(id(function), (function, []))[1].append(lane)
+
+            replies = {}
+            for function, lanes in groups.values():
+                points = []
+                for lane in lanes:
+                    x = requests[lane][1]
+                    points.extend(x if isinstance(x, list) else [x])
+
+                values = Finder.evaluate_many(function, points)
+
+                position = 0
+                for lane in lanes:
+                    x = requests[lane][1]
+                    if isinstance(x, list):
+                        replies[lane] = values[position : position + len(x)]
+                        count = len(x)
+                    else:
+                        replies[lane] = values[position]
+                        count = 1
+                    position += count
+
+                    evaluations[lane] += count
+                    if finders[lane].profile is not None:
+                        finders[lane].profile.count(
+                            finders[lane].evaluation_counter(function), count
+                        )
+
+        elapsed = time.perf_counter_ns() - start
+        for finder in finders:
+            if finder.profile is not None:
+                finder.profile.add_phase("iterate", elapsed)
+
+        return results
+
+    # evaluate the function at all the points, the ValueError is returned instead
+    # of raised for the points where the function can't be evaluated
+    @staticmethod
+    def evaluate_many(
+        function: Callable[[Decimal], Decimal], points: List[Decimal]
+    ) -> List[Union[Decimal, ValueError]]:
+        if hasattr(function, "evaluate_many"):
+            return function.evaluate_many(points)
+
+        values = []
+        for x in points:
+            try:
+                values.append(function(x))
+            except ValueError as e:
+                values.append(e)
+        return values
@@ -1,18 +1,48 @@
-from typing import Dict, Any
-from decimal import Decimal, InvalidOperation, Overflow
-from validator import FunctionValidator
+import time
+from typing import Dict, Any, List, Optional, Tuple, Union
+from decimal import Decimal
 from exceptions import ValidationError
+from profiling import Profile, profile_phase
+from root_finder.expression_cache import expression_cache
+from root_finder.finder import Finder
 
 # Import all finder classes here
+from root_finder.finders.all_roots_finder import AllRootsFinder
 from root_finder.finders.bisection_finder import BisectionFinder
+from root_finder.finders.brent_finder import BrentFinder
 from root_finder.finders.false_position_finder import FalsePositionFinder
 from root_finder.finders.fixed_point_finder import FixedPointFinder
 from root_finder.finders.newton_raphson_finder import NewtonRaphsonFinder
+from root_finder.finders.polynomial_roots_finder import PolynomialRootsFinder
 from root_finder.finders.secant_finder import SecantFinder
-from sympy import Expr, symbols
 
 
 class FinderFactory:
+    # the lower_bound and upper_bound parameters of the methods that search a
+    # bracket (or an interval) for the root
+    @staticmethod
+    def parse_bracket(
+        parameters: Dict[str, Any], method_name: str
+    ) -> Tuple[Decimal, Decimal]:
+        lower_bound = parameters.get("lower_bound")
+        upper_bound = parameters.get("upper_bound")
+
+        if lower_bound is None or upper_bound is None:
+            raise ValidationError(
+                f"{method_name} method requires lower bound and upper bound parameters"
+            )
+
+        # through str, so a JSON number like 0.01 is the decimal it was written
+        # as, not the binary float it was parsed to
+        try:
+            return Decimal(str(lower_bound)), Decimal(str(upper_bound))
+        except (ValueError, TypeError, ArithmeticError) as e:
+            raise ValidationError(
+                f"Error converting parameters: lower bound={lower_bound}, upper bound={upper_bound}. Error: {str(e)}"
+            )
+
+    # the parse, derivative and compile phases are added to the profile when
+    # given, the finder is profiled by setting its profile
     @staticmethod
     def create_finder(
         function: str,
@@ -21,43 +51,20 @@ class FinderFactory:
         number_of_iterations: int,
         precision: int,
         parameters: Dict[str, Any],
+        numeric_backend: str = "decimal",
+        profile: Optional[Profile] = None,
     ):
-        f_expr: Expr = FunctionValidator.validate_and_parse(function)
-
-        x_symbol = symbols("x", real=True)
+        # parsing, differentiating and compiling are cached across requests
+        with profile_phase(profile, "parse"):
+            cached_expression = expression_cache.get(function)
 
-        def f(x):
-            val_sympy = f_expr.subs(x_symbol, x).evalf(n=precision, chop=True)
-
-            try:
-                if not val_sympy.is_real:
-                    raise ValueError(
-                        "calculation resulted in undefined or complex value"
-                    )
-                y = +Decimal(str(val_sympy))
-            except (InvalidOperation, ValueError):
-                raise ValueError("calculation resulted in undefined or complex value")
-            except Overflow:
-                raise ValueError("calculation resulted in overflow")
-
-            return y
+        with profile_phase(profile, "compile"):
+            f = cached_expression.evaluator(precision, numeric_backend)
 
         if method == "bisection":
-            lower_bound = parameters.get("lower_bound")
-            second_guess = parameters.get("upper_bound")
-
-            if lower_bound is None or second_guess is None:
-                raise ValidationError(
-                    "Bisection method requires function lower bound and upper bound parameters"
-                )
-
-            try:
-                lower_bound = Decimal(lower_bound)
-                second_guess = Decimal(second_guess)
-            except (ValueError, TypeError) as e:
-                raise ValidationError(
-                    f"Error converting parameters: lower bound={lower_bound}, upper bound={second_guess}, absolute_relative_error={absolute_relative_error}. Error: {str(e)}"
-                )
+            lower_bound, upper_bound = FinderFactory.parse_bracket(
+                parameters, "Bisection"
+            )
 
             return BisectionFinder(
                 function=f,
@@ -65,33 +72,49 @@ class FinderFactory:
                 number_of_iterations=number_of_iterations,
                 precision=precision,
                 lower_bound=lower_bound,
-                upper_bound=second_guess,
+                upper_bound=upper_bound,
             )
 
         elif method == "false-position":
-            lower_bound = parameters.get("lower_bound")
-            second_guess = parameters.get("upper_bound")
+            lower_bound, upper_bound = FinderFactory.parse_bracket(
+                parameters, "False-Position"
+            )
 
-            if lower_bound is None or second_guess is None:
-                raise ValidationError(
-                    "False-Position method requires lower bound and upper bound parameters"
-                )
+            return FalsePositionFinder(
+                function=f,
+                absolute_relative_error=absolute_relative_error,
+                number_of_iterations=number_of_iterations,
+                precision=precision,
+                lower_bound=lower_bound,
+                upper_bound=upper_bound,
+                variant=parameters.get("variant"),
+            )
 
-            try:
-                lower_bound = Decimal(lower_bound)
-                second_guess = Decimal(second_guess)
-            except (ValueError, TypeError) as e:
-                raise ValidationError(
-                    f"Error converting parameters: lower bound={lower_bound}, upper bound={second_guess}. Error: {str(e)}"
-                )
+        elif method == "brent":
+            lower_bound, upper_bound = FinderFactory.parse_bracket(parameters, "Brent")
 
-            return FalsePositionFinder(
+            return BrentFinder(
                 function=f,
                 absolute_relative_error=absolute_relative_error,
                 number_of_iterations=number_of_iterations,
                 precision=precision,
                 lower_bound=lower_bound,
-                upper_bound=second_guess,
+                upper_bound=upper_bound,
+            )
+        elif method == "all-roots":
+            lower_bound, upper_bound = FinderFactory.parse_bracket(
+                parameters, "All-roots"
+            )
+
+            return AllRootsFinder(
+                function=f,
+                absolute_relative_error=absolute_relative_error,
+                number_of_iterations=number_of_iterations,
+                precision=precision,
+                lower_bound=lower_bound,
+                upper_bound=upper_bound,
+                samples=parameters.get("samples"),
+                bracket_method=parameters.get("bracket_method"),
             )
         elif method == "secant":
             first_guess = parameters.get("first_guess")
@@ -137,6 +160,7 @@ class FinderFactory:
                 number_of_iterations=number_of_iterations,
                 precision=precision,
                 guess=guess,
+                acceleration=parameters.get("acceleration"),
             )
         elif method == "newton-raphson" or method == "modified-newton-raphson":
             guess = parameters.get("guess")
@@ -152,25 +176,10 @@ class FinderFactory:
                     f"Error converting parameters: guess={guess}. Error: {str(e)}"
                 )
 
-            df_expr = f_expr.diff(x_symbol)
-
-            def df(x):
-                val_sympy = df_expr.subs(x_symbol, x).evalf(n=precision, chop=True)
-
-                try:
-                    if not val_sympy.is_real:
-                        raise ValueError(
-                            "calculation resulted in undefined or complex value"
-                        )
-                    y = +Decimal(str(val_sympy))
-                except (InvalidOperation, ValueError):
-                    raise ValueError(
-                        "calculation resulted in undefined or complex value"
-                    )
-                except Overflow:
-                    raise ValueError("calculation resulted in overflow")
-
-                return y
+            with profile_phase(profile, "derivative"):
+                cached_expression.derivative(1)
+            with profile_phase(profile, "compile"):
+                df = cached_expression.evaluator(precision, numeric_backend, order=1)
 
             return NewtonRaphsonFinder(
                 function=f,
@@ -181,6 +190,67 @@ class FinderFactory:
                 guess=guess,
                 multiplicity=multiplicity,
             )
+        elif method == "polynomial-roots":
+            if cached_expression.polynomial() is None:
+                raise ValidationError(
+                    f"Polynomial-roots method requires a polynomial function. Found: '{function}'"
+                )
+
+            with profile_phase(profile, "compile"):
+                df = cached_expression.evaluator(precision, numeric_backend, order=1)
+
+            return PolynomialRootsFinder(
+                function=f,
+                absolute_relative_error=absolute_relative_error,
+                number_of_iterations=number_of_iterations,
+                precision=precision,
+                derivative=df,
+                coefficients=cached_expression.decimal_coefficients(
+                    precision, numeric_backend
+                ),
+            )
 
         else:
             raise ValidationError(f"Unknown method: {method}")
+
+    # one finder per parameters (starting point) for the same function, to be run
+    # in lock-step with Finder.find_batch, a starting point that is invalid gets
+    # its error in place of the finder, every finder has its own profile when
+    # they are profiled
+    @staticmethod
+    def create_finders(
+        function: str,
+        method: str,
+        absolute_relative_error: Decimal,
+        number_of_iterations: int,
+        precision: int,
+        parameters_list: List[Dict[str, Any]],
+        numeric_backend: str = "decimal",
+        profile: bool = False,
+    ) -> List[Union[Finder, Exception]]:
+        # the function itself is validated once, for all the starting points
+        start = time.perf_counter_ns()
+        expression_cache.get(function)
+        parse_time = time.perf_counter_ns() - start
+
+        finders = []
+        for parameters in parameters_list:
+            finder_profile = Profile() if profile else None
+            if finder_profile is not None:
+                finder_profile.add_phase("parse", parse_time)
+            try:
+                finder = FinderFactory.create_finder(
+                    function,
+                    method,
+                    absolute_relative_error,
+                    number_of_iterations,
+                    precision,
+                    parameters if isinstance(parameters, dict) else {},
+                    numeric_backend,
+                    finder_profile,
+                )
+                finder.profile = finder_profile
+                finders.append(finder)
+            except Exception as e:
+                finders.append(e)
+        return finders
@@ -0,0 +1,373 @@
+import time
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from exceptions import ValidationError
+from root_finder.finder import Finder, Search
+from root_finder.finders.bisection_finder import BisectionFinder
+from root_finder.finders.brent_finder import BrentFinder
+from root_finder.finders.false_position_finder import FalsePositionFinder
+from root_finder.result import Result
+
+# the methods the brackets can be solved with
+BRACKET_METHODS = {
+    "brent": BrentFinder,
+    "bisection": BisectionFinder,
+    "false-position": FalsePositionFinder,
+}
+
+# how many times the grid is refined around the minima of |f| that may hide
+# roots between two samples
+REFINEMENTS = 8
+
+# a sample of the function, the value is None where it can't be computed
+Sample = Tuple[Decimal, Optional[Decimal]]
+
+
+# finds all the roots of the function in [lower_bound, upper_bound]:
+#   1. the function is sampled on a grid of `samples` intervals (evaluated
+#   together, in a single vectorized call when the function supports it), the
+#   grid is refined around the local minima of |f| that curve towards zero,
+#   where two roots may hide between two samples
+#   2. every sign change between two samples is a bracket, solved with the
+#   bracket method starting from the values at the samples, all the brackets
+#   in lock-step (their points are evaluated together in every round)
+#   3. the local minima of |f| that curve towards zero without a sign change
+#   (roots of even multiplicity, like the one of (x - 1)**2) are located by a
+#   golden section search, and are roots when |f| there is within the
+#   tolerance of |f| at the samples around them, a minimum that is small only
+#   next to the largest values of f (like the one of x**2 + 1 on a wide
+#   interval) isn't a root
+#
+# a run of consecutive samples where f is zero (to the precision, like around
+# the flat root of (x - 1)**4, or everywhere for a function smaller than the
+# precision) is a single root, at the middle of the run
+#
+# the roots are sorted, roots closer than the tolerance are only kept once, and
+# sign changes where |f| grows instead of vanishing (poles, like the one of 1/x)
+# aren't roots
+class AllRootsFinder(Finder):
+    lower_bound: Decimal
+    upper_bound: Decimal
+    samples: int  # the number of intervals of the first grid
+    bracket_method: str
+
+    def __init__(
+        self,
+        function: Callable[[Decimal], Decimal],
+        absolute_relative_error: Decimal,
+        number_of_iterations: int,
+        precision: int,
+        lower_bound: Decimal,
+        upper_bound: Decimal,
+        samples: Optional[int] = None,
+        bracket_method: Optional[str] = None,
+    ):
+        super().__init__(
+            function, absolute_relative_error, number_of_iterations, precision
+        )
+
+        if lower_bound >= upper_bound:
+            raise ValidationError("lower bound must be less than upper bound")
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+
+        try:
+            self.samples = int(samples if samples is not None else 100)
+        except (ValueError, TypeError):
+            raise ValidationError(f"Samples must be an integer. Found: '{samples}'")
+        if not 2 <= self.samples <= 100000:
+            raise ValidationError(
+                f"Samples must be between 2 and 100000. Found: {self.samples}"
+            )
+
+        self.bracket_method = str(bracket_method or "brent").lower()
+        if self.bracket_method not in BRACKET_METHODS:
+            raise ValidationError(
+                f"Bracket method must be one of {', '.join(BRACKET_METHODS)}. Found: '{bracket_method}'"
+            )
+
+    # the value of a sample, None if it couldn't be computed
+    @staticmethod
+    def defined(value: Union[Decimal, ValueError]) -> Optional[Decimal]:
+        return None if isinstance(value, ValueError) else value
+
+    @staticmethod
+    def sign_change(y0: Optional[Decimal], y1: Optional[Decimal]) -> bool:
+        return y0 is not None and y1 is not None and y0 * y1 < 0
+
+    # the lowest value of the parabola through the three points (x, |f(x)|),
+    # where x0 < x1 < x2 and |f(x1)| is the smallest
+    @staticmethod
+    def parabola_minimum(s0: Sample, s1: Sample, s2: Sample) -> Decimal:
+        (x0, y0), (x1, y1), (x2, y2) = s0, s1, s2
+        d1 = (abs(y1) - abs(y0)) / (x1 - x0)
+        d2 = (abs(y2) - abs(y1)) / (x2 - x1)
+        curvature = (d2 - d1) / (x2 - x0)
+        if curvature <= 0:
+            return abs(y1)
+
+        # the slope at x1
+        slope = d1 + curvature * (x1 - x0)
+        return abs(y1) - slope * slope / (4 * curvature)
+
+    # the indices of the samples where |f| has a local minimum without a sign
+    # change on either side
+    @staticmethod
+    def minima(grid: List[Sample]) -> List[int]:
+        indices = []
+        for i in range(1, len(grid) - 1):
+            y0, y1, y2 = grid[i - 1][1], grid[i][1], grid[i + 1][1]
+            if y0 is None or y1 is None or y2 is None or y1 == 0:
+                continue
+            if (y0 > 0) != (y1 > 0) or (y2 > 0) != (y1 > 0):
+                continue
+            if abs(y1) <= abs(y0) and abs(y1) <= abs(y2):
+                indices.append(i)
+        return indices
+
+    # the minima of |f| where the parabola through the samples around them
+    # gets below half of |f|, so f may reach zero between the samples
+    def suspect_minima(self, grid: List[Sample]) -> List[int]:
+        return [
+            i
+            for i in self.minima(grid)
+            if self.parabola_minimum(grid[i - 1], grid[i], grid[i + 1])
+            <= abs(grid[i][1]) / 2
+        ]
+
+    # the middle of every run of consecutive samples where f is zero, there is
+    # no sign change between them, so they are a single root whose value is
+    # below the precision all along the run
+    @staticmethod
+    def zero_runs(grid: List[Sample]) -> List[Decimal]:
+        roots = []
+        start = None
+        for i, (x, y) in enumerate(grid):
+            if y == 0:
+                if start is None:
+                    start = x
+                if i + 1 == len(grid) or grid[i + 1][1] != 0:
+                    roots.append((start + x) / 2)
+                    start = None
+        return roots
+
+    # whether the interval is already narrower than the tolerance around x
+    def resolved(self, a: Decimal, b: Decimal) -> bool:
+        return abs(b - a) <= self.absolute_relative_error * max(abs(a), abs(b), 1)
+
+    def search(self) -> Search:
+        start_time = time.time()
+        rounds = 0
+
+        # 1. sample the function, and refine the grid where roots may hide
+        width = self.upper_bound - self.lower_bound
+        points = [
+            self.lower_bound + width * i / self.samples for i in range(self.samples)
+        ] + [self.upper_bound]
+
+        grid: List[Sample] = []
+        for _ in range(REFINEMENTS + 1):
+            self.lap()
+            values = yield self.function, points
+            rounds += 1
+
+            grid = sorted(
+                grid + [(x, self.defined(y)) for x, y in zip(points, values)],
+                key=lambda sample: sample[0],
+            )
+
+            points = []
+            for i in self.suspect_minima(grid):
+                s0, s1, s2 = grid[i - 1], grid[i], grid[i + 1]
+                for a, b in ((s0[0], s1[0]), (s1[0], s2[0])):
+                    if not self.resolved(a, b):
+                        points.append((a + b) / 2)
+            points = sorted(set(points))
+            if not points:
+                break
+
+        if all(y is None for _, y in grid):
+            return Result(
+                execution_time=time.time() - start_time,
+                number_of_iterations=rounds,
+                message=f"All-roots method can't continue: the function can't be evaluated anywhere in [{self.lower_bound}, {self.upper_bound}]",
+            )
+
+        roots = self.zero_runs(grid)
+        brackets = [
+            (grid[i][0], grid[i + 1][0], grid[i][1], grid[i + 1][1])
+            for i in range(len(grid) - 1)
+            if self.sign_change(grid[i][1], grid[i + 1][1])
+        ]
+
+        # 2. the minima that may be roots without a sign change, by golden
+        # section search on |f| in lock-step, a minimum that turns out to
+        # change sign becomes two brackets
+        candidates = self.suspect_minima(grid)
+        minima = [(grid[i - 1][0], grid[i + 1][0], grid[i][1] > 0) for i in candidates]
+        located = yield from self.golden_section(minima)
+        rounds += located["rounds"]
+        for i, (a, b, _), (x, y) in zip(candidates, minima, located["minima"]):
+            if y is None:
+                continue
+            f_a, f_b = grid[i - 1][1], grid[i + 1][1]
+            if y == 0:
+                roots.append(x)
+            elif (y > 0) != (f_a > 0):
+                brackets += [(a, x, f_a, y), (x, b, y, f_b)]
+            elif abs(y) <= self.absolute_relative_error * max(abs(f_a), abs(f_b)):
+                roots.append(x)
+
+        # 3. solve the brackets in lock-step
+        finder_class = BRACKET_METHODS[self.bracket_method]
+        finders = [
+            finder_class(
+                function=self.function,
+                absolute_relative_error=self.absolute_relative_error,
+                number_of_iterations=self.number_of_iterations,
+                precision=self.precision,
+                lower_bound=xl,
+                upper_bound=xu,
+                f_lower_bound=f_xl,
+                f_upper_bound=f_xu,
+            )
+            for xl, xu, f_xl, f_xu in brackets
+        ]
+        searches = [finder.search() for finder in finders]
+        results: List[Optional[Result]] = [None] * len(searches)
+
+        replies: Dict[int, Union[Decimal, ValueError, None]] = {
+            lane: None for lane in range(len(searches))
+        }
+        while replies:
+            requests = {}
+            for lane, reply in replies.items():
+                try:
+                    if isinstance(reply, ValueError):
+                        requests[lane] = searches[lane].throw(reply)[1]
+                    else:
+                        requests[lane] = searches[lane].send(reply)[1]
+                except StopIteration as stop:
+                    results[lane] = stop.value
+
+            if not requests:
+                break
+
+            self.lap()
+            lanes = list(requests)
+            values = yield self.function, [requests[lane] for lane in lanes]
+            rounds += 1
+            replies = dict(zip(lanes, values))
+
+        # a sign change at a pole converges to the pole, where |f| is larger
+        # than at the ends of the bracket instead of smaller
+        solved = [
+            (result, min(abs(f_xl), abs(f_xu)))
+            for result, (_, _, f_xl, f_xu) in zip(results, brackets)
+            if result.root is not None
+        ]
+        # the error is the largest of the brackets whose root was kept, the
+        # ones that converged to a pole don't count
+        errors = []
+        if solved:
+            self.lap()
+            values = yield self.function, [result.root for result, _ in solved]
+            rounds += 1
+            for (result, bound), value in zip(solved, values):
+                value = self.defined(value)
+                if value is not None and abs(value) <= bound:
+                    roots.append(result.root)
+                    if result.absolute_relative_error is not None:
+                        errors.append(result.absolute_relative_error)
+
+        roots = self.unique(sorted(roots))
+
+        return Result(
+            roots=roots,
+            absolute_relative_error=max(errors) if errors else None,
+            number_of_iterations=rounds,
+            execution_time=time.time() - start_time,
+            message=f"All-roots method found {len(roots)} root{'' if len(roots) == 1 else 's'} in [{self.lower_bound}, {self.upper_bound}] (Absolute Relative Error: {self.absolute_relative_error})",
+        )
+
+    # golden section searches for the minima of |f| in the intervals (a, b),
+    # all of them in lock-step, each stops at the tolerance, at a zero, or as
+    # soon as f changes sign (positive is the sign of f at a and b), returns
+    # the (x, f(x)) found for every interval and the rounds it took
+    def golden_section(self, intervals: List[Tuple[Decimal, Decimal, bool]]):
+        ratio = (Decimal(5).sqrt() - 1) / 2
+
+        # [a, b, x1, f(x1), x2, f(x2)] with a < x1 < x2 < b
+        states = []
+        for a, b, _ in intervals:
+            states.append([a, b, b - ratio * (b - a), None, a + ratio * (b - a), None])
+        found: List[Optional[Sample]] = [None] * len(intervals)
+        rounds = 0
+
+        if not intervals:
+            return {"minima": found, "rounds": rounds}
+
+        self.lap()
+        values = yield (
+            self.function,
+            [x for state in states for x in (state[2], state[4])],
+        )
+        rounds += 1
+        for index, state in enumerate(states):
+            state[3] = self.defined(values[2 * index])
+            state[5] = self.defined(values[2 * index + 1])
+
+        pending = list(range(len(states)))
+        while pending and rounds < self.number_of_iterations:
+            points = []
+            still_pending = []
+            for index in pending:
+                a, b, x1, y1, x2, y2 = states[index]
+                positive = intervals[index][2]
+
+                # stop at an undefined value, a zero or a sign change
+                stopped = None
+                for x, y in ((x1, y1), (x2, y2)):
+                    if y is None or y == 0 or (y > 0) != positive:
+                        stopped = (x, y)
+                        break
+                if stopped is not None:
+                    found[index] = stopped
+                    continue
+
+                if self.resolved(a, b):
+                    found[index] = (x1, y1) if abs(y1) <= abs(y2) else (x2, y2)
+                    continue
+
+                if abs(y1) < abs(y2):
+                    b, x2, y2 = x2, x1, y1
+                    x1, y1 = b - ratio * (b - a), None
+                    points.append(x1)
+                else:
+                    a, x1, y1 = x1, x2, y2
+                    x2, y2 = a + ratio * (b - a), None
+                    points.append(x2)
+                states[index] = [a, b, x1, y1, x2, y2]
+                still_pending.append(index)
+
+            pending = still_pending
+            if not pending:
+                break
+
+            self.lap()
+            values = yield self.function, points
+            rounds += 1
+            for index, value in zip(pending, values):
+                state = states[index]
+                if state[3] is None:
+                    state[3] = self.defined(value)
+                else:
+                    state[5] = self.defined(value)
+
+        # the searches that ran out of rounds keep their best point
+        for index in pending:
+            a, b, x1, y1, x2, y2 = states[index]
+            found[index] = (x1, y1) if abs(y1) <= abs(y2) else (x2, y2)
+
+        return {"minima": found, "rounds": rounds}
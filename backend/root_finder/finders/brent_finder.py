@@ -0,0 +1,161 @@
+import time
+from decimal import Decimal
+from typing import Optional
+
+from root_finder.finder import Search
+from root_finder.finders.interval_finder import IntervalFinder
+from root_finder.result import Result
+from utils import calculate_number_of_correct_significant_figures
+
+
+# Brent's method: the root stays bracketed between b (the best estimate so far)
+# and c, every iteration tries inverse quadratic interpolation through the last
+# three points (or the secant through the last two) and falls back to bisecting
+# [b, c] when the interpolated point is out of the bracket or the steps aren't
+# shrinking fast enough, so it converges superlinearly at simple roots and
+# stays within a few times the iterations of bisection at multiple roots
+#
+# the values at the ends of the bracket come from checking it, every iteration
+# evaluates the function once, and the search stops when the bracket is
+# narrower than the tolerance relative to b
+class BrentFinder(IntervalFinder):
+    @property
+    def method_name(self) -> str:
+        return "Brent"
+
+    # the bisection step Brent's method falls back to
+    def iterate(
+        self, xl: Decimal, xu: Decimal, f_xl: Decimal, f_xu: Decimal
+    ) -> Decimal:
+        return (xl + xu) / Decimal("2")
+
+    # the width of the bracket [b, c] relative to b
+    @staticmethod
+    def relative_width(b: Decimal, c: Decimal) -> Decimal:
+        return abs(c - b) / abs(b) if b != 0 else abs(c - b)
+
+    def result(
+        self,
+        start_time: float,
+        root: Decimal,
+        absolute_relative_error: Optional[Decimal],
+        iteration: int,
+        message: str,
+    ) -> Result:
+        number_of_correct_significant_figures = None
+        if absolute_relative_error is not None:
+            number_of_correct_significant_figures = (
+                calculate_number_of_correct_significant_figures(
+                    absolute_relative_error, self.precision
+                )
+            )
+        return Result(
+            root=root,
+            absolute_relative_error=absolute_relative_error,
+            number_of_correct_significant_figures=number_of_correct_significant_figures,
+            number_of_iterations=iteration,
+            execution_time=time.time() - start_time,
+            message=message,
+        )
+
+    def search(self) -> Search:
+        start_time = time.time()
+
+        a, fa = self.lower_bound, self.f_lower_bound
+        b, fb = self.upper_bound, self.f_upper_bound
+        c, fc = b, fb
+
+        # the last two steps, an interpolation step has to be smaller than half
+        # of the one before the last for the bracket to keep shrinking
+        d = e = b - a
+
+        # iteration is the number of points evaluated so far
+        for iteration in range(self.number_of_iterations + 1):
+            self.lap()
+
+            # the root is between b and c
+            if (fb > 0) == (fc > 0):
+                c, fc = a, fa
+                d = e = b - a
+
+            # b is the end with the smallest function value
+            if abs(fc) < abs(fb):
+                a, b, c = b, c, b
+                fa, fb, fc = fb, fc, fb
+
+            absolute_relative_error = self.relative_width(b, c)
+            # the root is exact, the bracket around it tells nothing
+            if fb == 0:
+                return self.result(
+                    start_time,
+                    b,
+                    None,
+                    iteration,
+                    f"{self.method_name} method converged after {iteration} iterations, the function at the root is zero (Absolute Relative Error: {self.absolute_relative_error})",
+                )
+            if absolute_relative_error < self.absolute_relative_error:
+                return self.result(
+                    start_time,
+                    b,
+                    absolute_relative_error,
+                    iteration,
+                    f"{self.method_name} method converged after {iteration} iterations (Absolute Relative Error: {self.absolute_relative_error})",
+                )
+            if iteration == self.number_of_iterations:
+                break
+
+            # half the tolerance, as an absolute step, the bracket is wider
+            # than twice this (or the search would have converged)
+            tolerance = self.absolute_relative_error * (abs(b) if b != 0 else 1) / 2
+            half_width = (c - b) / 2
+
+            bisect = True
+            if abs(e) >= tolerance and abs(fa) > abs(fb):
+                s = fb / fa
+                if a == c:
+                    # secant
+                    p = 2 * half_width * s
+                    q = 1 - s
+                else:
+                    # inverse quadratic interpolation
+                    q = fa / fc
+                    r = fb / fc
+                    p = s * (2 * half_width * q * (q - r) - (b - a) * (r - 1))
+                    q = (q - 1) * (r - 1) * (s - 1)
+                if p > 0:
+                    q = -q
+                p = abs(p)
+
+                if 2 * p < min(3 * half_width * q - abs(tolerance * q), abs(e * q)):
+                    e, d = d, p / q
+                    bisect = False
+
+            a, fa = b, fb
+            if bisect:
+                d = e = half_width
+                b = self.iterate(b, c, fb, fc)
+            elif abs(d) > tolerance:
+                b = b + d
+            else:
+                b = b + (tolerance if half_width > 0 else -tolerance)
+
+            try:
+                fb = yield self.function, b
+            except ValueError as error:
+                # the last point the function was evaluated at (now a) is the
+                # estimate, b may be the pole the search stopped at
+                return self.result(
+                    start_time,
+                    a,
+                    absolute_relative_error,
+                    iteration + 1,
+                    f"{self.method_name} method can't continue: {error.args[0]}",
+                )
+
+        return self.result(
+            start_time,
+            b,
+            absolute_relative_error,
+            self.number_of_iterations,
+            f"{self.method_name} method did not converge within {self.number_of_iterations} iterations (Absolute Relative Error: {self.absolute_relative_error})",
+        )
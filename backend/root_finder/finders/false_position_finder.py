@@ -1,13 +1,68 @@
 from decimal import Decimal
+from typing import Callable, Optional
 
+from exceptions import ValidationError
 from root_finder.finders.interval_finder import IntervalFinder
 
+VARIANTS = ("classic", "illinois", "anderson-bjorck")
 
+
+# the classic method keeps one end of the bracket fixed when the function is
+# convex (or concave) over it, and the other end crawls towards the root, the
+# variants scale down the function value at an end that was kept twice in a row
+# so the next point lands on its side of the root:
+#   illinois: by 1/2
+#   anderson-bjorck: by 1 - f(new) / f(replaced), or 1/2 when that isn't positive
 class FalsePositionFinder(IntervalFinder):
+    variant: str
+
+    def __init__(
+        self,
+        function: Callable[[Decimal], Decimal],
+        absolute_relative_error: Decimal,
+        number_of_iterations: int,
+        precision: int,
+        lower_bound: Decimal,
+        upper_bound: Decimal,
+        variant: Optional[str] = None,
+        f_lower_bound: Optional[Decimal] = None,
+        f_upper_bound: Optional[Decimal] = None,
+    ):
+        self.variant = str(variant or "classic").lower()
+        if self.variant not in VARIANTS:
+            raise ValidationError(
+                f"False-Position variant must be one of {', '.join(VARIANTS)}. Found: '{variant}'"
+            )
+
+        super().__init__(
+            function,
+            absolute_relative_error,
+            number_of_iterations,
+            precision,
+            lower_bound,
+            upper_bound,
+            f_lower_bound,
+            f_upper_bound,
+        )
+
     @property
     def method_name(self) -> str:
+        if self.variant == "illinois":
+            return "Illinois False-Position"
+        if self.variant == "anderson-bjorck":
+            return "Anderson-Bjorck False-Position"
         return "False-Position"
 
+    def retained_value(
+        self, f_retained: Decimal, f_replaced: Decimal, f_new: Decimal
+    ) -> Decimal:
+        if self.variant == "illinois":
+            return f_retained / 2
+        if self.variant == "anderson-bjorck":
+            m = 1 - f_new / f_replaced
+            return f_retained * m if m > 0 else f_retained / 2
+        return f_retained
+
     def iterate(
         self, xl: Decimal, xu: Decimal, f_xl: Decimal, f_xu: Decimal
     ) -> Decimal:
@@ -2,7 +2,8 @@ import time
 from decimal import Decimal
 from typing import Callable, Optional
 
-from root_finder.finder import Finder
+from exceptions import ValidationError
+from root_finder.finder import Finder, Search
 from root_finder.result import Result
 from utils import (
     calculate_absolute_relative_error,
@@ -10,8 +11,20 @@ from utils import (
 )
 
 
+ACCELERATIONS = ("none", "aitken", "steffensen")
+
+
+# x = g(x) iterations, with an optional acceleration of their (usually linear)
+# convergence, both based on Aitken's delta-squared extrapolation of three
+# successive iterates:
+#   aitken: the plain iterations go on, the estimates are the extrapolations of
+#   their last three iterates (one evaluation per iteration, faster but still
+#   linear convergence)
+#   steffensen: every iteration restarts from the extrapolation of x, g(x) and
+#   g(g(x)) (two evaluations per iteration, quadratic convergence)
 class FixedPointFinder(Finder):
     guess: Decimal
+    acceleration: str
 
     def __init__(
         self,
@@ -20,24 +33,61 @@ class FixedPointFinder(Finder):
         number_of_iterations: int,
         precision: int,
         guess: Decimal,
+        acceleration: Optional[str] = None,
     ):
         super().__init__(
             function, absolute_relative_error, number_of_iterations, precision
         )
         self.guess = guess
 
-    def find(self) -> Result:
+        self.acceleration = str(acceleration or "none").lower()
+        if self.acceleration not in ACCELERATIONS:
+            raise ValidationError(
+                f"Acceleration must be one of {', '.join(ACCELERATIONS)}. Found: '{acceleration}'"
+            )
+
+    @property
+    def method_name(self) -> str:
+        if self.acceleration == "none":
+            return "Fixed-Point method"
+        return f"Fixed-Point method ({self.acceleration.capitalize()} acceleration)"
+
+    # Aitken's delta-squared extrapolation of x0, x1 = g(x0) and x2 = g(x1),
+    # x2 itself when the differences don't shrink geometrically (they are
+    # already 0, or the same)
+    @staticmethod
+    def extrapolate(x0: Decimal, x1: Decimal, x2: Decimal) -> Decimal:
+        denominator = x2 - 2 * x1 + x0
+        if denominator == 0:
+            return x2
+        return x2 - (x2 - x1) ** 2 / denominator
+
+    def search(self) -> Search:
         start_time = time.time()
 
         x = self.guess
         new_x = x
+        # the last plain iterates, aitken extrapolates from three of them
+        points = [x]
 
         absolute_relative_error: Optional[Decimal] = None
         number_of_correct_significant_figures: Optional[int] = None
 
         for iteration in range(1, self.number_of_iterations + 1):
+            self.lap()
+
             try:
-                new_x = self.function(x)
+                if self.acceleration == "steffensen":
+                    x1 = yield self.function, x
+                    x2 = yield self.function, x1
+                    new_x = self.extrapolate(x, x1, x2)
+                else:
+                    point = yield self.function, points[-1]
+                    points = (points + [point])[-3:]
+                    if self.acceleration == "aitken" and len(points) == 3:
+                        new_x = self.extrapolate(*points)
+                    else:
+                        new_x = point
 
                 if iteration > 1:
                     # Calculate relative error
@@ -59,7 +109,7 @@ class FixedPointFinder(Finder):
                             number_of_correct_significant_figures=number_of_correct_significant_figures,
                             number_of_iterations=iteration,
                             execution_time=execution_time,
-                            message=f"Fixed-Point method converged after {iteration} iterations (Absolute Relative Error: {self.absolute_relative_error})",
+                            message=f"{self.method_name} converged after {iteration} iterations (Absolute Relative Error: {self.absolute_relative_error})",
                         )
 
                 x = new_x
@@ -77,7 +127,7 @@ class FixedPointFinder(Finder):
                     number_of_correct_significant_figures=number_of_correct_significant_figures,
                     number_of_iterations=iteration,
                     execution_time=execution_time,
-                    message=f"Fixed-Point method can't continue: {e.args[0]}",
+                    message=f"{self.method_name} can't continue: {e.args[0]}",
                 )
         if absolute_relative_error is not None:
             number_of_correct_significant_figures = (
@@ -92,5 +142,5 @@ class FixedPointFinder(Finder):
             number_of_correct_significant_figures=number_of_correct_significant_figures,
             number_of_iterations=self.number_of_iterations,
             execution_time=execution_time,
-            message=f"Fixed-Point method did not converge within {self.number_of_iterations} iterations (Absolute Relative Error: {self.absolute_relative_error})",
+            message=f"{self.method_name} did not converge within {self.number_of_iterations} iterations (Absolute Relative Error: {self.absolute_relative_error})",
         )
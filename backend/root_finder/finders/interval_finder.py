@@ -4,7 +4,7 @@ from decimal import Decimal
 from typing import Callable, Optional
 
 from exceptions import ValidationError
-from root_finder.finder import Finder
+from root_finder.finder import Finder, Search
 from root_finder.result import Result
 from utils import (
     calculate_absolute_relative_error,
@@ -12,9 +12,14 @@ from utils import (
 )
 
 
+# base class for the methods that keep the root bracketed between xl and xu,
+# the function values at the ends of the bracket are kept with them, so every
+# iteration evaluates the function only at its new point
 class IntervalFinder(Finder):
     lower_bound: Decimal
     upper_bound: Decimal
+    f_lower_bound: Decimal
+    f_upper_bound: Decimal
 
     def __init__(
         self,
@@ -24,6 +29,8 @@ class IntervalFinder(Finder):
         precision: int,
         lower_bound: Decimal,
         upper_bound: Decimal,
+        f_lower_bound: Optional[Decimal] = None,
+        f_upper_bound: Optional[Decimal] = None,
     ):
         super().__init__(
             function, absolute_relative_error, number_of_iterations, precision
@@ -31,24 +38,43 @@ class IntervalFinder(Finder):
         self.lower_bound = lower_bound
         self.upper_bound = upper_bound
 
-        self._validate_interval()
+        self._validate_interval(f_lower_bound, f_upper_bound)
 
-    def _validate_interval(self):
+    # the values at the ends of the bracket are only computed when they aren't
+    # given (like for the brackets found by scanning an interval)
+    def _validate_interval(
+        self, f_xl: Optional[Decimal] = None, f_xu: Optional[Decimal] = None
+    ):
         if self.lower_bound > self.upper_bound:
             raise ValidationError("lower bound must be less than upper bound")
 
-        f_xl = self.function(self.lower_bound)
-        f_xu = self.function(self.upper_bound)
+        if f_xl is None or f_xu is None:
+            f_xl = self.function(self.lower_bound)
+            f_xu = self.function(self.upper_bound)
+            self.setup_evaluations = 2
 
         if f_xl * f_xu > 0:
             raise ValidationError("f(xl) and f(xu) must have different signs")
 
+        # the search starts from these instead of evaluating the ends again
+        self.f_lower_bound = f_xl
+        self.f_upper_bound = f_xu
+
     # the user facing name of the method, to be implemented by subclasses
     @property
     @abstractmethod
     def method_name(self) -> str:
         pass
 
+    # the function value to keep for the end of the bracket that was kept, when
+    # the other end was replaced twice in a row (f_replaced is the value at the
+    # end that was just replaced, f_new the one at the new point), the methods
+    # that speed up one-sided convergence scale it down
+    def retained_value(
+        self, f_retained: Decimal, f_replaced: Decimal, f_new: Decimal
+    ) -> Decimal:
+        return f_retained
+
     # perform a single iteration, to be implemented by subclasses
     @abstractmethod
     def iterate(
@@ -56,23 +82,25 @@ class IntervalFinder(Finder):
     ) -> Decimal:
         pass
 
-    def find(self) -> Result:
+    def search(self) -> Search:
         start_time = time.time()
 
         xl: Decimal = self.lower_bound
         xu: Decimal = self.upper_bound
+        f_xl: Decimal = self.f_lower_bound
+        f_xu: Decimal = self.f_upper_bound
         xr = Decimal(0)
+        replaced = None  # the end of the bracket the last iteration replaced
 
         absolute_relative_error: Optional[Decimal] = None
         number_of_correct_significant_figures: Optional[int] = None
 
         for iteration in range(1, self.number_of_iterations + 1):
+            self.lap()
+
             try:
                 old_xr = xr
 
-                f_xl = self.function(xl)
-                f_xu = self.function(xu)
-
                 try:
                     xr = self.iterate(xl, xu, f_xl, f_xu)
                 except ValueError as e:
@@ -92,7 +120,7 @@ class IntervalFinder(Finder):
                         message=e.args[0],
                     )
 
-                f_xr = self.function(xr)
+                f_xr = yield self.function, xr
 
                 if iteration > 1:
                     absolute_relative_error = calculate_absolute_relative_error(
@@ -115,9 +143,15 @@ class IntervalFinder(Finder):
                         )
 
                 if f_xl * f_xr < 0:
-                    xu = xr
+                    if replaced == "upper":
+                        f_xl = self.retained_value(f_xl, f_xu, f_xr)
+                    xu, f_xu = xr, f_xr
+                    replaced = "upper"
                 elif f_xr * f_xu < 0:
-                    xl = xr
+                    if replaced == "lower":
+                        f_xu = self.retained_value(f_xu, f_xl, f_xr)
+                    xl, f_xl = xr, f_xr
+                    replaced = "lower"
                 else:
                     execution_time = time.time() - start_time
                     if absolute_relative_error is not None:
@@ -2,7 +2,7 @@ import time
 from decimal import Decimal
 from typing import Callable, Optional
 
-from root_finder.finder import Finder
+from root_finder.finder import Finder, Search
 from root_finder.result import Result
 from utils import (
     calculate_absolute_relative_error,
@@ -32,18 +32,22 @@ class NewtonRaphsonFinder(Finder):
         self.guess = guess
         self.multiplicity = multiplicity
 
-    def find(self) -> Result:
+    def search(self) -> Search:
         start_time = time.time()
 
         x = self.guess
         new_x = x
+        # f at x, carried over from the previous iteration's f(new_x)
+        f_x: Optional[Decimal] = None
 
         absolute_relative_error: Optional[Decimal] = None
         number_of_correct_significant_figures: Optional[int] = None
 
         for iteration in range(1, self.number_of_iterations + 1):
+            self.lap()
+
             try:
-                derivative_value = self.derivative(x)
+                derivative_value = yield self.derivative, x
 
                 if derivative_value == 0:
                     if absolute_relative_error is not None:
@@ -62,7 +66,9 @@ class NewtonRaphsonFinder(Finder):
                         message="Newton-Raphson method can't continue: Derivative is too close to zero",
                     )
 
-                new_x = x - (self.function(x) / derivative_value) * self.multiplicity
+                if f_x is None:
+                    f_x = yield self.function, x
+                new_x = x - (f_x / derivative_value) * self.multiplicity
 
                 if iteration > 1:
                     # Calculate relative error
@@ -88,7 +94,7 @@ class NewtonRaphsonFinder(Finder):
                             message=f"Newton-Raphson method converged after {iteration} iterations (Absolute Relative Error: {self.absolute_relative_error})",
                         )
 
-                f_new_x = self.function(new_x)
+                f_new_x = yield self.function, new_x
 
                 if f_new_x == 0:
                     if absolute_relative_error is not None:
@@ -107,7 +113,7 @@ class NewtonRaphsonFinder(Finder):
                         message=f"Newton-Raphson method converged after {iteration} iterations, the function at the root is zero (Absolute Relative Error: {self.absolute_relative_error})",
                     )
 
-                x = new_x
+                x, f_x = new_x, f_new_x
             except ValueError as e:
                 execution_time = time.time() - start_time
                 if absolute_relative_error is not None:
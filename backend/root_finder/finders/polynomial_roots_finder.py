@@ -0,0 +1,436 @@
+import time
+from decimal import Decimal
+from typing import Callable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from exceptions import ValidationError
+from root_finder.finder import Finder, Search
+from root_finder.result import Result
+from utils import calculate_absolute_relative_error
+
+# the eigenvalues of a root of multiplicity m are spread around it by about
+# (epsilon * the size of the terms of the polynomial there) ** (1 / m), the
+# eigenvalues within that radius, with epsilon this many times the float64 one,
+# are a cluster, a cluster whose mean is real (within the same radius) is a
+# real root of multiplicity the size of the cluster
+CLUSTER_SLACK = 100
+
+# roots closer than this (relative to their size) may be the same multiple root
+CLUSTER_TOLERANCE = 1e-4
+
+# where f(x) is checked between two points that may be the same root, at this
+# fraction of the way (the golden section) rather than at the midpoint, evenly
+# spaced roots (like integers) would put a root at the midpoint
+SEGMENT_POINT = 0.3819660112501051
+
+
+# finds all the real roots of a polynomial at once: the eigenvalues of its
+# companion matrix (in float64) are the roots, every nearly real one is polished
+# on its own with Newton-Raphson at the requested precision, all of them in
+# lock-step, the eigenvalues a multiple root is spread into are grouped in
+# clusters, the real mean of a cluster of m eigenvalues is polished with the
+# modified Newton-Raphson step x - m f(x) / f'(x) alongside
+#
+# the modified step only converges next to a root of about that multiplicity,
+# a cluster that is really distinct close roots makes it grow |f(x)| and its
+# eigenvalues are the roots they were polished to, estimates that stall before
+# the tolerance are roots when |f(x)| is within the tolerance of the size of the
+# terms of the polynomial, the others (like the real parts of complex roots with
+# a small imaginary part) aren't, the roots are sorted and only kept once
+class PolynomialRootsFinder(Finder):
+    derivative: Callable[[Decimal], Decimal]
+    coefficients: List[Decimal]  # highest degree first
+    magnitudes: np.ndarray  # |coefficients| / |leading coefficient| in float64
+
+    def __init__(
+        self,
+        function: Callable[[Decimal], Decimal],
+        absolute_relative_error: Decimal,
+        number_of_iterations: int,
+        precision: int,
+        derivative: Callable[[Decimal], Decimal],
+        coefficients: List[Decimal],
+    ):
+        super().__init__(
+            function, absolute_relative_error, number_of_iterations, precision
+        )
+        self.derivative = derivative
+
+        # leading zeros don't change the polynomial
+        while coefficients and coefficients[0] == 0:
+            coefficients = coefficients[1:]
+        if len(coefficients) < 2:
+            raise ValidationError(
+                "Polynomial-roots method requires a polynomial of degree 1 or more"
+            )
+        self.coefficients = coefficients
+
+    @property
+    def degree(self) -> int:
+        return len(self.coefficients) - 1
+
+    # the eigenvalues of the companion matrix of the polynomial, the matrix has
+    # the coefficients of the monic polynomial (negated) in its first row and
+    # ones below the diagonal
+    @staticmethod
+    def companion_eigenvalues(coefficients: List[Decimal]) -> np.ndarray:
+        degree = len(coefficients) - 1
+        if degree == 0:
+            return np.array([])
+
+        leading = float(coefficients[0])
+        monic = np.array([float(c) for c in coefficients[1:]]) / leading
+        companion = np.zeros((degree, degree))
+        companion[0] = -monic
+        companion[np.arange(1, degree), np.arange(degree - 1)] = 1
+        return np.linalg.eigvals(companion)
+
+    # how far the eigenvalues of a root of multiplicity `size` at z can be
+    # spread by the rounding of the companion matrix (size can be an array)
+    def radius(self, z: complex, size):
+        terms = np.polyval(self.magnitudes, abs(z))
+        return (CLUSTER_SLACK * np.finfo(float).eps * terms) ** (1 / size)
+
+    # the eigenvalues grouped by the roots they stand for, the largest cluster
+    # of eigenvalues nearest to one of them that fits within its radius is
+    # taken first, until every eigenvalue is in one
+    def clusters(self, eigenvalues: np.ndarray) -> List[List[complex]]:
+        remaining = np.asarray(eigenvalues, dtype=complex)
+
+        # the eigenvalues too far from all the others for any cluster (the
+        # largest radius is the one of all of them) are simple roots
+        distances = np.abs(remaining[:, None] - remaining[None, :])
+        np.fill_diagonal(distances, np.inf)
+        isolated = np.array(
+            [
+                np.min(distances[i], initial=np.inf)
+                > 2 * self.radius(z, len(remaining))
+                for i, z in enumerate(remaining)
+            ],
+            dtype=bool,
+        )
+        clusters = [[complex(z)] for z in remaining[isolated]]
+        remaining = remaining[~isolated]
+
+        while len(remaining):
+            sizes = np.arange(1, len(remaining) + 1)
+
+            # the largest cluster around every eigenvalue, (size, spread, indices)
+            candidates = []
+            for seed in remaining:
+                order = np.argsort(np.abs(remaining - seed))
+                distances = np.abs(remaining[order] - seed)
+
+                # the members are within the radius of the center, so within
+                # twice of it from the seed
+                fits = np.flatnonzero(distances <= 2 * self.radius(seed, sizes))
+                for size in sizes[fits][::-1]:
+                    members = remaining[order[:size]]
+                    center = members.mean()
+                    spread = np.max(np.abs(members - center))
+                    if spread <= self.radius(center, size):
+                        candidates.append((size, spread, order[:size]))
+                        break
+
+            # the disjoint ones of the largest size are taken, the eigenvalues
+            # left are clustered again
+            largest = max(size for size, _, _ in candidates)
+            taken = np.zeros(len(remaining), dtype=bool)
+            for size, _, indices in sorted(candidates, key=lambda c: c[:2]):
+                if size == largest and not taken[indices].any():
+                    clusters.append([complex(z) for z in remaining[indices]])
+                    taken[indices] = True
+            remaining = remaining[~taken]
+        return clusters
+
+    # the size of the terms of the polynomial at x, the value of f(x) that is
+    # only rounding error is small compared to it
+    def scale(self, x: Decimal) -> Decimal:
+        total = abs(self.coefficients[0])
+        for coefficient in self.coefficients[1:]:
+            total = total * abs(x) + abs(coefficient)
+        return total
+
+    # whether two roots are close enough to be the same multiple root
+    @staticmethod
+    def close(a: Decimal, b: Decimal) -> bool:
+        return abs(a - b) <= Decimal(CLUSTER_TOLERANCE) * max(abs(a), abs(b), 1)
+
+    # the root with the number of significant digits of the precision, so the
+    # roots known exactly (like an integer eigenvalue) read like the others
+    def significant(self, root: Decimal) -> Decimal:
+        root = +root
+        if root == 0:
+            return Decimal(0)
+        return root.quantize(Decimal(1).scaleb(root.adjusted() - self.precision + 1))
+
+    def negligible(self, f: Decimal, x: Decimal) -> bool:
+        return abs(f) <= self.absolute_relative_error * self.scale(x)
+
+    # whether f(x) is only the rounding error of evaluating the polynomial at
+    # the requested precision (or in float64), then nothing is known about the
+    # root beyond x, near a multiple root Newton-Raphson would only wander
+    def rounding_level(self, f: Decimal, x: Decimal) -> bool:
+        if getattr(self.function, "numeric_backend", "decimal") == "float64":
+            epsilon = Decimal(float(np.finfo(float).eps))
+        else:
+            epsilon = Decimal(10) ** -self.precision
+        return abs(f) <= epsilon * self.scale(x)
+
+    # Newton-Raphson from all the starting points in lock-step, the step of a
+    # point of multiplicity m is x - m f(x) / f'(x), the (root, error) every
+    # point converged to is returned in its place, or None, with the number of
+    # iterations made
+    #
+    # a point with multiplicity above 1 whose step grows |f(x)| isn't next to a
+    # root of that multiplicity, the error of a root is the relative size of the
+    # last step, a root where f(x) is only rounding error still takes its step
+    def polish(self, starts: List[Tuple[Decimal, int]]):
+        # [x, multiplicity, last point, |f| there] of every starting point
+        lanes = [[x, multiplicity, None, None] for x, multiplicity in starts]
+        outcomes: List[Optional[Tuple[Decimal, Decimal]]] = [None] * len(lanes)
+        pending = list(range(len(lanes)))
+        iterations = 0
+
+        while pending and iterations < self.number_of_iterations:
+            iterations += 1
+            self.lap()
+
+            points = [lanes[lane][0] for lane in pending]
+            derivative_values = yield self.derivative, points
+            # the Horner pass of the derivative already computed these
+            function_values = yield self.function, points
+
+            still_pending = []
+            for lane, df, f in zip(pending, derivative_values, function_values):
+                x, multiplicity, last_x, last_f = lanes[lane]
+                if isinstance(df, ValueError) or isinstance(f, ValueError):
+                    continue
+
+                if multiplicity > 1 and last_f is not None and abs(f) >= last_f:
+                    continue
+
+                # f'(x) vanishes at a multiple root, x is one only when f(x) is
+                # rounding error there too, after a step that tells its error
+                if df == 0:
+                    if self.rounding_level(f, x) and (f == 0 or last_x is not None):
+                        error = (
+                            calculate_absolute_relative_error(x, last_x)
+                            if last_x is not None
+                            else Decimal(0)
+                        )
+                        outcomes[lane] = (+x, error)
+                    continue
+
+                new_x = x - multiplicity * f / df
+                error = calculate_absolute_relative_error(new_x, x)
+                if error < self.absolute_relative_error or self.rounding_level(f, x):
+                    outcomes[lane] = (+new_x, error)
+                    continue
+
+                lanes[lane] = [new_x, multiplicity, x, abs(f)]
+                still_pending.append(lane)
+            pending = still_pending
+
+        # the points that stalled before the tolerance are roots when f(x) is
+        # within the tolerance of the size of the terms of the polynomial
+        pending = [lane for lane in pending if lanes[lane][2] is not None]
+        if pending:
+            points = [lanes[lane][0] for lane in pending]
+            values = yield self.function, points
+            for lane, x, f in zip(pending, points, values):
+                if not isinstance(f, ValueError) and self.negligible(f, x):
+                    error = calculate_absolute_relative_error(x, lanes[lane][2])
+                    outcomes[lane] = (+x, error)
+
+        return outcomes, iterations
+
+    def search(self) -> Search:
+        start_time = time.time()
+
+        # the roots at zero are known exactly, the companion matrix is of the
+        # polynomial without them
+        coefficients = self.coefficients
+        # (root, error, indices of the eigenvalues it stands for)
+        roots: List[Tuple[Decimal, Decimal, Set[int]]] = []
+        if coefficients[-1] == 0:
+            roots.append((+Decimal(0), Decimal(0), set()))
+            while coefficients[-1] == 0:
+                coefficients = coefficients[:-1]
+
+        # the sizes of the terms of the monic polynomial, for the radius of the
+        # clusters of eigenvalues
+        self.magnitudes = np.array([abs(float(c)) for c in coefficients]) / abs(
+            float(coefficients[0])
+        )
+
+        try:
+            with np.errstate(all="ignore"):
+                eigenvalues = self.companion_eigenvalues(coefficients)
+            if not np.all(np.isfinite(eigenvalues)):
+                raise np.linalg.LinAlgError
+        except np.linalg.LinAlgError:
+            return Result(
+                execution_time=time.time() - start_time,
+                message="Polynomial-roots method can't continue: the eigenvalues of the companion matrix can't be computed in float64",
+            )
+
+        # every nearly real eigenvalue is polished on its own, the real mean of
+        # every cluster with the modified step, a cluster that isn't a multiple
+        # root (like close simple roots) makes it fail
+        starts: List[Tuple[Decimal, int]] = []
+        owners: List[Set[int]] = []
+        clusters: List[Tuple[int, Set[int]]] = []  # (lane, eigenvalues) of the means
+        index = 0
+        for cluster in self.clusters(eigenvalues):
+            center = sum(cluster) / len(cluster)
+            radius = self.radius(center, len(cluster))
+            members = set(range(index, index + len(cluster)))
+            index += len(cluster)
+
+            for i, z in zip(sorted(members), cluster):
+                if abs(z.imag) <= radius:
+                    starts.append((+Decimal(z.real), 1))
+                    owners.append({i})
+            if len(cluster) > 1 and abs(center.imag) <= radius:
+                clusters.append((len(starts), members))
+                starts.append((+Decimal(center.real), len(cluster)))
+                owners.append(members)
+
+        outcomes, iterations = yield from self.polish(starts)
+
+        # the eigenvalues of a multiple root the modified step converged to are
+        # that root when their own points failed, or stalled where f(x) is only
+        # rounding error around it: going out from the root on each side, as
+        # long as f(x) is rounding error inside the segment to the point before,
+        # or the point is within m times the tolerance of the root, the plain
+        # step only shrinks by (m - 1) / m next to a root of multiplicity m, so
+        # it stops within the tolerance that far from it
+        #
+        # the modified step can also land on a simple root by chance from the
+        # mean of a cluster of them, it found a multiple root only when it
+        # stands for 2 eigenvalues or more
+        chains = []  # (cluster lane, failed member lanes, member lanes outward)
+        for lane, members in clusters:
+            if outcomes[lane] is None:
+                continue
+            root = outcomes[lane][0]
+            others = [
+                other
+                for other in range(len(outcomes))
+                if other != lane and owners[other] <= members
+            ]
+            failed = [other for other in others if outcomes[other] is None]
+            found = [other for other in others if outcomes[other] is not None]
+            left = sorted(
+                (other for other in found if outcomes[other][0] < root),
+                key=lambda other: -outcomes[other][0],
+            )
+            right = sorted(
+                (other for other in found if outcomes[other][0] >= root),
+                key=lambda other: outcomes[other][0],
+            )
+            reach = len(members) * self.absolute_relative_error
+            near = {
+                other
+                for other in found
+                if calculate_absolute_relative_error(outcomes[other][0], root) < reach
+            }
+            chains.append((lane, failed, near, [left, right]))
+
+        # the segments between the points of every side, from the root
+        segments = [
+            (outcomes[previous][0], outcomes[other][0])
+            for lane, _, _, sides in chains
+            for side in sides
+            for previous, other in zip([lane] + side, side)
+        ]
+        inner = [a + (b - a) * Decimal(SEGMENT_POINT) for a, b in segments]
+        values = (yield self.function, inner) if inner else []
+        connected = iter(
+            calculate_absolute_relative_error(b, a) < self.absolute_relative_error
+            or (not isinstance(f, ValueError) and self.rounding_level(f, x))
+            for (a, b), x, f in zip(segments, inner, values)
+        )
+
+        claimed: Set[int] = set()
+        dropped: Set[int] = set()
+        for lane, failed, near, sides in chains:
+            stands_for = list(failed)
+            for side in sides:
+                # the segments of the side are all consumed, even after a gap
+                links = [next(connected) for _ in side]
+                for other, linked in zip(side, links):
+                    if not linked and other not in near:
+                        break
+                    stands_for.append(other)
+            if len(stands_for) >= 2:
+                claimed.update(stands_for)
+            else:
+                dropped.add(lane)
+        roots.extend(
+            (outcome[0], outcome[1], owners[lane])
+            for lane, outcome in enumerate(outcomes)
+            if outcome is not None and lane not in claimed | dropped
+        )
+
+        # roots closer than the tolerance are the same one
+        merged: List[Tuple[Decimal, Decimal, Set[int]]] = []
+        for root, error, members in sorted(roots, key=lambda r: r[0]):
+            if merged and (
+                calculate_absolute_relative_error(root, merged[-1][0])
+                < self.absolute_relative_error
+            ):
+                last_root, last_error, last_members = merged[-1]
+                merged[-1] = (last_root, max(last_error, error), last_members | members)
+            else:
+                merged.append((root, error, members))
+
+        # close roots left (the points a multiple root stalled at when its
+        # eigenvalues weren't a cluster) are the same one only when f(x) is
+        # rounding error between them and the modified step with the number of
+        # their eigenvalues converges from their mean, which it can't do from
+        # between close simple roots unless it lands on one of them
+        pairs = [
+            (a, b)
+            for (a, _, _), (b, _, _) in zip(merged, merged[1:])
+            if self.close(a, b)
+        ]
+        inner = [a + (b - a) * Decimal(SEGMENT_POINT) for a, b in pairs]
+        values = (yield self.function, inner) if inner else []
+        connected = {
+            b
+            for (_, b), x, f in zip(pairs, inner, values)
+            if not isinstance(f, ValueError) and self.rounding_level(f, x)
+        }
+
+        runs = [[root] for root in merged[:1]]
+        for root in merged[1:]:
+            if root[0] in connected:
+                runs[-1].append(root)
+            else:
+                runs.append([root])
+        close_runs = [run for run in runs if len(run) > 1]
+        if close_runs:
+            starts = [
+                (
+                    sum(root for root, _, _ in run) / len(run),
+                    max(len(set().union(*(members for _, _, members in run))), 2),
+                )
+                for run in close_runs
+            ]
+            outcomes, more_iterations = yield from self.polish(starts)
+            iterations += more_iterations
+            for run, outcome in zip(close_runs, outcomes):
+                if outcome is not None:
+                    run[:] = [(outcome[0], outcome[1], set())]
+        roots = [root for run in runs for root in run]
+
+        return Result(
+            roots=[self.significant(root) for root, _, _ in roots],
+            absolute_relative_error=max((error for _, error, _ in roots), default=None),
+            number_of_iterations=iterations,
+            execution_time=time.time() - start_time,
+            message=f"Polynomial-roots method found {len(roots)} real root{'' if len(roots) == 1 else 's'} of the degree {self.degree} polynomial (Absolute Relative Error: {self.absolute_relative_error})",
+        )
@@ -3,7 +3,7 @@ from decimal import Decimal
 from typing import Callable, Optional
 
 from exceptions import ValidationError
-from root_finder.finder import Finder
+from root_finder.finder import Finder, Search
 from root_finder.result import Result
 from utils import (
     calculate_absolute_relative_error,
@@ -30,7 +30,7 @@ class SecantFinder(Finder):
         self.first_guess = first_guess
         self.second_guess = second_guess
 
-    def find(self) -> Result:
+    def search(self) -> Search:
         start_time = time.time()
 
         x_prev = self.first_guess
@@ -38,8 +38,8 @@ class SecantFinder(Finder):
         x_new = x_curr
 
         try:
-            f_prev = self.function(x_prev)
-            f_curr = self.function(x_curr)
+            f_prev = yield self.function, x_prev
+            f_curr = yield self.function, x_curr
         except Exception as e:
             raise ValidationError(f"Error evaluating function at initial guesses: {e}")
 
@@ -48,6 +48,8 @@ class SecantFinder(Finder):
 
         # Start Iterations
         for iteration in range(1, self.number_of_iterations + 1):
+            self.lap()
+
             try:
                 # Check for division by zero
                 denominator = f_curr - f_prev
@@ -68,7 +70,7 @@ class SecantFinder(Finder):
                 )
 
                 # 1. Check if function value is close to zero
-                f_new = self.function(x_new)
+                f_new = yield self.function, x_new
 
                 if f_new == 0:
                     if absolute_relative_error is not None:
@@ -1,12 +1,18 @@
 from decimal import Decimal
-from typing import Dict, Optional, Any
+import time
+from typing import Dict, List, Optional, Any
+
+from profiling import Profile
 
 
 class Result:
     root: Optional[Decimal]
+    roots: Optional[List[Decimal]]  # all the roots, for the methods finding many
     absolute_relative_error: Optional[Decimal]
     number_of_correct_significant_figures: Optional[int]
     number_of_iterations: Optional[int]
+    number_of_function_evaluations: Optional[int]  # set by Finder.find_batch
+    profile: Optional[Profile]  # set by Finder.find_batch when profiled
     execution_time: float
     message: str
 
@@ -18,17 +24,23 @@ class Result:
         number_of_iterations: Optional[int] = None,
         execution_time: float = 0.0,
         message: str = "Solution found",
+        roots: Optional[List[Decimal]] = None,
     ):
         self.root = root
+        self.roots = roots
         self.absolute_relative_error = absolute_relative_error
         self.number_of_correct_significant_figures = (
             number_of_correct_significant_figures
         )
         self.number_of_iterations = number_of_iterations
+        self.number_of_function_evaluations = None
+        self.profile = None
         self.execution_time = execution_time
         self.message = message
 
     def to_dict(self) -> Dict[str, Any]:
+        start = time.perf_counter_ns()
+
         result = {
             "message": self.message,
             "execution_time": round(self.execution_time, 12),
@@ -37,6 +49,9 @@ class Result:
         if self.root is not None:
             result["root"] = self.root
 
+        if self.roots is not None:
+            result["roots"] = self.roots
+
         if self.absolute_relative_error is not None:
             result["absolute_relative_error"] = self.absolute_relative_error
 
@@ -48,4 +63,13 @@ class Result:
         if self.number_of_iterations is not None:
             result["number_of_iterations"] = self.number_of_iterations
 
+        if self.number_of_function_evaluations is not None:
+            result["number_of_function_evaluations"] = (
+                self.number_of_function_evaluations
+            )
+
+        if self.profile is not None:
+            self.profile.add_phase("serialize", time.perf_counter_ns() - start)
+            result["profile"] = self.profile.to_dict()
+
         return result
@@ -0,0 +1,52 @@
+# run from the backend directory:
+#   python -m pytest tests
+from decimal import Decimal
+
+import pytest
+from root_finder.finder_factory import FinderFactory
+
+
+def find_all_roots(function: str, precision: int, lower_bound=0, upper_bound=1):
+    finder = FinderFactory.create_finder(
+        function,
+        "all-roots",
+        Decimal("0.00001"),
+        50,
+        precision,
+        {"lower_bound": lower_bound, "upper_bound": upper_bound},
+    )
+    return finder.find()
+
+
+def all_roots(function: str, precision: int):
+    return find_all_roots(function, precision).roots
+
+
+# the samples where f is zero to the precision are a single root, not one root
+# per sample
+@pytest.mark.parametrize(
+    "function, root",
+    [("(x - 0.3)**4", Decimal("0.3")), ("1e-7*(x - 0.5)", Decimal("0.5"))],
+)
+@pytest.mark.parametrize("precision", [6, 10, 20])
+def test_zero_samples_are_one_root(function, root, precision):
+    roots = all_roots(function, precision)
+    assert len(roots) == 1
+    assert abs(roots[0] - root) < Decimal("0.001")
+
+
+def test_separate_zero_samples_stay_separate_roots():
+    roots = all_roots("(x - 0.25)*(x - 0.75)", 6)
+    assert roots == [Decimal("0.25"), Decimal("0.75")]
+
+
+# the brackets that converge to a pole aren't roots, and their error isn't the
+# error of the roots
+def test_poles_dont_count_in_the_error():
+    result = find_all_roots("1/x", 10, -1, 2)
+    assert result.roots == []
+    assert result.absolute_relative_error is None
+
+    result = find_all_roots("x**2 - 0.3", 10)
+    assert len(result.roots) == 1
+    assert result.absolute_relative_error < Decimal("0.00001")
@@ -1,9 +1,19 @@
-from decimal import Decimal
+from decimal import MAX_EMAX, MIN_EMIN, ROUND_HALF_UP, Context, Decimal
+
+
+# the full Decimal context a request runs in, every request gets its own one
+# (through localcontext) so concurrent requests can't change each other's
+# precision, and it doesn't depend on the context of the thread serving it
+def decimal_context(precision: int) -> Context:
+    return Context(prec=precision, rounding=ROUND_HALF_UP, Emax=MAX_EMAX, Emin=MIN_EMIN)
 
 
 # remove trailing zeros and unnecessary exponent from a Decimal value
 # for better readability in the output
 def remove_trailing_zeros(value: Decimal) -> Decimal:
+    # values coming from the float64 backend are rounded to the current precision
+    if not isinstance(value, Decimal):
+        value = +Decimal(float(value))
     if value == 0:
         value = Decimal(0)
     return (
@@ -29,6 +39,7 @@ def calculate_number_of_correct_significant_figures(
 ) -> int:
     if absolute_relative_error > 0:
         m = Decimal("2") - (Decimal("200") * absolute_relative_error).log10()
-        return max(0, int(m))
+        # no more than the digits of the precision
+        return min(precision, max(0, int(m)))
     else:
         return precision
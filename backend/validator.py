@@ -1,6 +1,7 @@
 from decimal import Decimal
 import numpy as np
-from typing import List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
+from equations_solver.sparse_matrix import CSRMatrix
 from exceptions import ValidationError
 from sympy import parse_expr, real_root, symbols, E, pi
 from sympy.parsing.sympy_parser import (
@@ -28,8 +29,7 @@ class LinearSystemValidator:
         if A_matrix.ndim != 2:
             raise ValidationError("Coefficient matrix must be 2-dimensional.")
 
-        if b_vector.ndim != 1:
-            raise ValidationError("Constants vector must be 1-dimensional.")
+        LinearSystemValidator.validate_constants_shape(b_vector)
 
         n_equations, n_variables = A_matrix.shape
 
@@ -38,8 +38,109 @@ class LinearSystemValidator:
                 f"Number of equations ({n_equations}) must equal number of variables ({n_variables})."
             )
 
+        if len(b_vector) != n_equations:
+            raise ValidationError(
+                f"Constants must have a row for each of the {n_equations} equations. Found: {len(b_vector)}"
+            )
+
         return A_matrix, b_vector
 
+    # A given by its nonzeros, either as COO triplets ("rows" and "cols" are the
+    # row and column of every value) or in CSR form ("rows" are the n + 1 row
+    # pointers), n is the length of b
+    @staticmethod
+    def validate_sparse_system(
+        A: Dict[str, Any], b: List[Decimal]
+    ) -> Tuple[CSRMatrix, np.ndarray]:
+        matrix_format = str(A.get("format", "coo")).lower()
+        if matrix_format not in ("coo", "csr"):
+            raise ValidationError(
+                f"Sparse matrix format must be 'coo' or 'csr'. Found: '{matrix_format}'"
+            )
+
+        rows, cols, values = A.get("rows"), A.get("cols"), A.get("values")
+        if not all(isinstance(field, list) for field in (rows, cols, values)):
+            raise ValidationError(
+                "Sparse coefficient matrix must have rows, cols and values lists."
+            )
+
+        if not isinstance(b, list):
+            raise ValidationError("Constants vector must be 1-dimensional.")
+
+        try:
+            values = np.array([+Decimal(x) for x in values], dtype=Decimal)
+            b_vector = np.array([+Decimal(x) for x in b], dtype=Decimal)
+        except (ValueError, TypeError, ArithmeticError) as e:
+            raise ValidationError(f"Coefficients must be numbers:{str(e)}")
+
+        if not all(type(i) is int for i in rows + cols):
+            raise ValidationError("Sparse matrix rows and cols must be integers.")
+
+        n = len(b_vector)
+        rows = np.array(rows, dtype=np.int64)
+        cols = np.array(cols, dtype=np.int64)
+
+        if len(cols) != len(values):
+            raise ValidationError(
+                f"Sparse matrix must have as many cols ({len(cols)}) as values ({len(values)})."
+            )
+
+        if matrix_format == "csr":
+            if (
+                len(rows) != n + 1
+                or rows[0] != 0
+                or rows[-1] != len(values)
+                or np.any(np.diff(rows) < 0)
+            ):
+                raise ValidationError(
+                    f"CSR rows must be {n + 1} non-decreasing pointers from 0 to the number of values ({len(values)})."
+                )
+            rows = np.repeat(np.arange(n), np.diff(rows))
+        elif len(rows) != len(values):
+            raise ValidationError(
+                f"Sparse matrix must have as many rows ({len(rows)}) as values ({len(values)})."
+            )
+
+        if np.any((rows < 0) | (rows >= n) | (cols < 0) | (cols >= n)):
+            raise ValidationError(
+                f"Sparse matrix indices must be between 0 and {n - 1}, the number of equations is the length of b."
+            )
+
+        return CSRMatrix.from_coo(rows, cols, values, n), b_vector
+
+    # b (or B) alone, for a system whose n x n coefficient matrix is already known
+    @staticmethod
+    def validate_constants(b: List[Any], n: int) -> np.ndarray:
+        if not isinstance(b, list) or len(b) != n:
+            raise ValidationError(f"Constants must have {n} rows.")
+
+        try:
+            b_vector = np.array(LinearSystemValidator.parse_constants(b), dtype=Decimal)
+        except (ValueError, TypeError, ArithmeticError) as e:
+            raise ValidationError(f"Coefficients must be numbers:{str(e)}")
+
+        LinearSystemValidator.validate_constants_shape(b_vector)
+        return b_vector
+
+    # b can also be an n x k matrix B, to solve for k right-hand sides at once
+    @staticmethod
+    def validate_constants_shape(b_vector: np.ndarray):
+        # rows of different lengths end up as lists in a 1-dimensional array
+        if b_vector.ndim not in (1, 2) or any(
+            isinstance(value, list) for value in b_vector.flat
+        ):
+            raise ValidationError(
+                "Constants must be a vector, or a matrix with a column for each right-hand side."
+            )
+
+    # the Decimal values of a vector b, or of a matrix B given as a list of rows
+    @staticmethod
+    def parse_constants(b: List[Any]) -> List[Any]:
+        return [
+            [+Decimal(x) for x in row] if isinstance(row, list) else +Decimal(row)
+            for row in b
+        ]
+
     @staticmethod
     def validate_precision(precision: Optional[int]) -> int:
         if precision is None:
@@ -53,6 +154,57 @@ class LinearSystemValidator:
         except (ValueError, TypeError):
             raise ValidationError("Precision  must be an integer")
 
+    @staticmethod
+    def validate_numeric_backend(numeric_backend: Optional[str], precision: int) -> str:
+        # float64 carries about 15 significant digits, so it is picked
+        # automatically whenever the requested precision fits in it, and can't
+        # be asked for when it doesn't (the digits past them are only noise)
+        if numeric_backend is None:
+            return "float64" if precision <= 15 else "decimal"
+
+        numeric_backend = str(numeric_backend).lower()
+        if numeric_backend not in ("decimal", "float64"):
+            raise ValidationError(
+                f"Numeric backend must be 'decimal' or 'float64'. Found: '{numeric_backend}'"
+            )
+        if numeric_backend == "float64" and precision > 15:
+            raise ValidationError(
+                f"The float64 backend only carries 15 significant digits, use the decimal backend for precision {precision}"
+            )
+        return numeric_backend
+
+    @staticmethod
+    def validate_steps_mode(steps_mode: Optional[str]) -> str:
+        if steps_mode is None:
+            return "full"
+
+        steps_mode = str(steps_mode).lower()
+        if steps_mode not in ("none", "summary", "full"):
+            raise ValidationError(
+                f"Steps must be 'none', 'summary' or 'full'. Found: '{steps_mode}'"
+            )
+        return steps_mode
+
+    @staticmethod
+    def validate_diagnostics(diagnostics: Optional[bool]) -> bool:
+        if diagnostics is None:
+            return False
+
+        if not isinstance(diagnostics, bool):
+            raise ValidationError(
+                f"Diagnostics must be true or false. Found: '{diagnostics}'"
+            )
+        return diagnostics
+
+    @staticmethod
+    def validate_profile(profile: Optional[bool]) -> bool:
+        if profile is None:
+            return False
+
+        if not isinstance(profile, bool):
+            raise ValidationError(f"Profile must be true or false. Found: '{profile}'")
+        return profile
+
 
 class FunctionValidator:
     @staticmethod
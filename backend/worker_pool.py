@@ -0,0 +1,280 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Set
+
+from exceptions import ComputationTimeout, PoolClosed, WorkerCrashed
+
+
+# run in every worker when it starts, so the first request it gets doesn't pay
+# for importing sympy/numpy/mpmath and compiling a function with lambdify
+def warm_up():
+    from root_finder.evaluator import FunctionEvaluator
+    from validator import FunctionValidator
+
+    FunctionEvaluator(FunctionValidator.validate_and_parse("x^2 - 2"), 6)(2)
+
+
+# the number of workers of the pool this process is a worker of, None in the
+# server's process
+pool_workers: Optional[int] = None
+
+
+# run first in every worker, before the pool's own initializer
+def _initialize_worker(workers: int, initializer: Callable, initargs: tuple):
+    global pool_workers
+
+    pool_workers = workers
+    initializer(*initargs)
+
+
+# a fixed number of worker processes that run requests in parallel, each request
+# gets a wall clock deadline and the worker running it is killed (and replaced
+# with a fresh one) when the deadline passes, a worker that dies while running a
+# request is replaced too, and the request fails with WorkerCrashed
+#
+# every worker is a single process executor of its own, so a worker can be
+# stopped without cancelling the requests running on the other ones, once the
+# pool is shut down the requests fail with PoolClosed
+class WorkerPool:
+    workers: int
+    timeout: Optional[float]
+
+    def __init__(
+        self,
+        workers: int,
+        timeout: Optional[float] = None,
+        initializer: Callable = warm_up,
+        initargs: tuple = (),
+    ):
+        self.workers = workers
+        self.timeout = timeout
+        self.initializer = initializer
+        self.initargs = initargs
+        self._lock = threading.Lock()
+        # only one run_everywhere takes the workers at a time, two taking some
+        # each would wait for each other
+        self._everywhere_lock = threading.Lock()
+        # the workers, and once the pool is shut down a None that wakes up the
+        # requests waiting for one
+        self._idle: queue.Queue = queue.Queue()
+        # every live worker, idle or running a request, so shutdown stops all
+        self._workers: Set[ProcessPoolExecutor] = set()
+        self._workers_lock = threading.Lock()
+        self._closed = False
+        # serves the queues the workers send streamed steps through
+        self._manager = None
+        for _ in range(workers):
+            self._idle.put(self._start_worker())
+
+    def _start_worker(self) -> ProcessPoolExecutor:
+        # spawn instead of fork, forking a process with running threads (the
+        # server's) can deadlock the child
+        worker = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+            initargs=(self.workers, self.initializer, self.initargs),
+        )
+        # start the process now instead of on the first request
+        worker.submit(int)
+        with self._workers_lock:
+            self._workers.add(worker)
+        return worker
+
+    def _stop_worker(self, worker: ProcessPoolExecutor):
+        with self._workers_lock:
+            self._workers.discard(worker)
+        for process in list((worker._processes or {}).values()):
+            process.terminate()
+        worker.shutdown(wait=False, cancel_futures=True)
+
+    # a fresh worker in place of one that was stopped, None once the pool is
+    # shut down (the request it was running was stopped by the shutdown)
+    def _replace_worker(
+        self, worker: ProcessPoolExecutor
+    ) -> Optional[ProcessPoolExecutor]:
+        self._stop_worker(worker)
+        if self._closed:
+            return None
+        return self._start_worker()
+
+    # a free worker, waiting for one until the deadline
+    def _take_worker(
+        self, timeout: Optional[float], deadline: Optional[float]
+    ) -> ProcessPoolExecutor:
+        if self._closed:
+            raise PoolClosed()
+
+        remaining = None if deadline is None else deadline - time.monotonic()
+        try:
+            if remaining is not None and remaining <= 0:
+                raise queue.Empty
+            worker = self._idle.get(timeout=remaining)
+        except queue.Empty:
+            raise ComputationTimeout(timeout)
+
+        if worker is None or self._closed:
+            # leave the None for the other requests waiting
+            self._idle.put(None)
+            raise PoolClosed()
+        return worker
+
+    # give a worker back to the pool, unless the pool was shut down
+    def _release_worker(self, worker: Optional[ProcessPoolExecutor]):
+        if worker is not None and not self._closed:
+            self._idle.put(worker)
+
+    # the deadline of a call, the pool's timeout or the given one if it's shorter
+    def _deadline(self, timeout: Optional[float]):
+        if self.timeout is not None:
+            timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        return timeout, deadline
+
+    # run function(*args) on a free worker and return its result, the deadline
+    # (the pool's, or the given timeout if it's shorter) includes the time spent
+    # waiting for a free worker
+    def run(self, function: Callable, *args, timeout: Optional[float] = None) -> Any:
+        timeout, deadline = self._deadline(timeout)
+        worker = self._take_worker(timeout, deadline)
+
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            self._release_worker(worker)
+            raise ComputationTimeout(timeout)
+
+        try:
+            future = worker.submit(function, *args)
+            return future.result(timeout=remaining)
+        except FutureTimeoutError:
+            worker = self._replace_worker(worker)
+            raise ComputationTimeout(timeout)
+        except BrokenProcessPool:
+            worker = self._replace_worker(worker)
+            if worker is None:
+                raise PoolClosed()
+            raise WorkerCrashed()
+        except RuntimeError:
+            # the worker was shut down with the pool while it was taken
+            if self._closed:
+                worker = None
+                raise PoolClosed()
+            raise
+        finally:
+            self._release_worker(worker)
+
+    # run function() once on every worker (like clearing a cache), waits until
+    # no request is running on any of them, under the pool's deadline
+    def run_everywhere(self, function: Callable) -> List[Any]:
+        timeout, deadline = self._deadline(None)
+        if not self._everywhere_lock.acquire(
+            timeout=-1 if timeout is None else timeout
+        ):
+            raise ComputationTimeout(timeout)
+
+        workers = []
+        try:
+            for _ in range(self.workers):
+                workers.append(self._take_worker(timeout, deadline))
+
+            results = []
+            for i, worker in enumerate(workers):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                try:
+                    results.append(worker.submit(function).result(timeout=remaining))
+                except FutureTimeoutError:
+                    workers[i] = self._replace_worker(worker)
+                    raise ComputationTimeout(timeout)
+                except BrokenProcessPool:
+                    workers[i] = self._replace_worker(worker)
+                    raise WorkerCrashed()
+            return results
+        finally:
+            for worker in workers:
+                self._release_worker(worker)
+            self._everywhere_lock.release()
+
+    # a queue (bounded by maxsize) and an event that can be given to a function
+    # run on a worker, for it to send its results back while it runs, and to be
+    # told when nobody is reading them anymore
+    def channel(self, maxsize: int = 0):
+        with self._lock:
+            if self._manager is None:
+                self._manager = multiprocessing.get_context("spawn").Manager()
+            return self._manager.Queue(maxsize), self._manager.Event()
+
+    # stop every worker, the idle ones and the ones running a request
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            if self._manager is not None:
+                self._manager.shutdown()
+                self._manager = None
+            with self._workers_lock:
+                workers = list(self._workers)
+            for worker in workers:
+                self._stop_worker(worker)
+            while True:
+                try:
+                    self._idle.get_nowait()
+                except queue.Empty:
+                    break
+            # wakes up the requests waiting for a worker
+            self._idle.put(None)
+
+
+_pool: Optional[WorkerPool] = None
+_pool_lock = threading.Lock()
+# set by shutdown_pool, the server is stopping and no pool is started again
+_shut_down = False
+
+
+# the number of workers of the pool, WORKER_PROCESSES (see get_pool)
+def pool_size() -> int:
+    return int(os.environ.get("WORKER_PROCESSES", os.cpu_count() or 1))
+
+
+# the pool shared by all requests, started on first use and configured with the
+# WORKER_PROCESSES (defaults to the number of cores, 0 runs requests in the
+# server's threads) and REQUEST_TIMEOUT (seconds, 0 for no limit) environment
+# variables, None when requests aren't run in worker processes, once the pool
+# was shut down the requests fail with PoolClosed
+def get_pool(
+    initializer: Callable = warm_up, initargs: tuple = ()
+) -> Optional[WorkerPool]:
+    global _pool
+
+    if _shut_down:
+        raise PoolClosed()
+
+    workers = pool_size()
+    if workers <= 0:
+        return None
+
+    with _pool_lock:
+        if _shut_down:
+            raise PoolClosed()
+        if _pool is None:
+            _pool = WorkerPool(
+                workers,
+                timeout=float(os.environ.get("REQUEST_TIMEOUT", 60)) or None,
+                initializer=initializer,
+                initargs=initargs,
+            )
+        return _pool
+
+
+def shutdown_pool():
+    global _pool, _shut_down
+
+    with _pool_lock:
+        _shut_down = True
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None